@@ -0,0 +1,262 @@
+"""
+Stand-in Neuro server for load testing the app on one machine.
+
+It waits for the app to connect and register its actions, then sends actions at a fixed rate with a limit on how
+many may wait for their result at once. Actions come from a script (one JSON object per line with "name" and
+optionally "data") or are generated at random from the registered schemas. At the end it reports throughput,
+latency from when an action was due to be sent to receiving its result, the round trip from actually sending it,
+and which actions failed or never got a result. The two only differ when the concurrency limit holds actions back.
+
+Start the app pointed at it yourself, or pass --launch to have it start one without a window:
+
+    python load_test_server.py --count 500 --rate 50 --concurrency 4 --launch
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Optional
+
+import trio
+from trio_websocket import ConnectionClosed, WebSocketConnection, WebSocketRequest, serve_websocket
+
+# Actions left out of random streams, since they write files
+RANDOM_EXCLUDED = {"export"}
+# Strings without an enum are most often layer names
+RANDOM_STRINGS = ["base", "background", "layer"]
+
+
+def random_value(schema: dict[str, Any], rng: random.Random) -> Any:
+    """
+    Generates a value matching the subset of JSON schema the actions use.
+    """
+    if "enum" in schema:
+        return rng.choice(schema["enum"])
+
+    kind = schema.get("type")
+    if kind == "object":
+        properties = schema.get("properties", {})
+        required = set(schema.get("required", []))
+        return {
+            key: random_value(value, rng)
+            for key, value in properties.items()
+            if key in required or rng.random() < 0.5
+        }
+    if kind == "array":
+        low = schema.get("minItems", 0)
+        high = schema.get("maxItems", max(low, 8))
+        return [random_value(schema.get("items", {}), rng) for _ in range(rng.randint(low, high))]
+    if kind in ("integer", "number"):
+        low = schema.get("minimum", schema.get("exclusiveMinimum", -100))
+        high = schema.get("maximum", schema.get("exclusiveMaximum", 100))
+        value: float
+        if kind == "integer":
+            value = rng.randint(low + ("exclusiveMinimum" in schema), high - ("exclusiveMaximum" in schema))
+        else:
+            value = rng.uniform(low, high)
+            if "exclusiveMinimum" in schema and value <= low:
+                value = high
+        return value
+    if kind == "boolean":
+        return rng.random() < 0.5
+    if kind == "string":
+        return rng.choice(RANDOM_STRINGS)
+    return None
+
+
+class LoadTest:
+    def __init__(self, args: argparse.Namespace):
+        self.args = args
+        self.rng = random.Random(args.seed)
+        self.schemas: dict[str, Optional[dict]] = {}
+        self.registered = trio.Event()
+        self.pending: dict[str, trio.Event] = {}
+        self.results: dict[str, tuple[bool, str]] = {}
+        # Per action name: latencies and round trips in seconds, failures and actions that never got a result
+        self.latencies: defaultdict[str, list[float]] = defaultdict(list)
+        self.round_trips: defaultdict[str, list[float]] = defaultdict(list)
+        self.failures: defaultdict[str, list[str]] = defaultdict(list)
+        self.dropped: defaultdict[str, int] = defaultdict(int)
+        self.sent = 0
+        self.elapsed = 0.0
+        self.done = trio.Event()
+
+    def stream(self) -> list[tuple[str, Optional[dict]]]:
+        """
+        Returns the actions to send, from the script or generated at random.
+        """
+        if self.args.script:
+            lines = Path(self.args.script).read_text().splitlines()
+            actions = [json.loads(line) for line in lines if line.strip()]
+            stream = [(action["name"], action.get("data")) for action in actions]
+            return (stream * self.args.repeat)[:self.args.count] if self.args.count else stream * self.args.repeat
+
+        names = sorted(name for name in self.schemas if name not in RANDOM_EXCLUDED)
+        if self.args.actions:
+            names = [name for name in names if name in self.args.actions]
+        if not names:
+            raise RuntimeError("No registered actions to send")
+        stream = []
+        for _ in range(self.args.count or 100):
+            name = self.rng.choice(names)
+            schema = self.schemas[name]
+            stream.append((name, random_value(schema, self.rng) if schema else None))
+        return stream
+
+    async def receive(self, ws: WebSocketConnection) -> None:
+        while True:
+            try:
+                message = json.loads(await ws.get_message())
+            except ConnectionClosed:
+                return
+            command = message.get("command")
+            data = message.get("data") or {}
+            if command == "actions/register":
+                for action in data.get("actions", []):
+                    self.schemas[action["name"]] = action.get("schema")
+                self.registered.set()
+            elif command == "actions/unregister":
+                for name in data.get("action_names", []):
+                    self.schemas.pop(name, None)
+            elif command == "action/result":
+                event = self.pending.get(data.get("id"))
+                if event is not None:
+                    self.results[data["id"]] = (data["success"], data.get("message", ""))
+                    event.set()
+
+    async def send_action(
+        self, ws: WebSocketConnection, limiter: trio.CapacityLimiter, id_: str, name: str, data: Optional[dict]
+    ) -> None:
+        # Waiting for the limiter is part of the latency, as it would be for actions queued up on Neuro's side
+        submitted = trio.current_time()
+        async with limiter:
+            event = self.pending[id_] = trio.Event()
+            payload: dict[str, Any] = {"id": id_, "name": name}
+            if data is not None:
+                payload["data"] = json.dumps(data)
+            sent = trio.current_time()
+            await ws.send_message(json.dumps({"command": "action", "data": payload}))
+
+            with trio.move_on_after(self.args.timeout):
+                await event.wait()
+            del self.pending[id_]
+
+            if id_ not in self.results:
+                self.dropped[name] += 1
+                return
+            received = trio.current_time()
+            self.latencies[name].append(received - submitted)
+            self.round_trips[name].append(received - sent)
+            success, message = self.results.pop(id_)
+            if not success:
+                self.failures[name].append(message)
+
+    async def handle(self, request: WebSocketRequest) -> None:
+        ws = await request.accept()
+        async with trio.open_nursery() as nursery:
+            nursery.start_soon(self.receive, ws)
+            await self.registered.wait()
+            # Registration may come in several messages
+            await trio.sleep(self.args.settle)
+
+            limiter = trio.CapacityLimiter(self.args.concurrency)
+            start = trio.current_time()
+            async with trio.open_nursery() as senders:
+                for i, (name, data) in enumerate(self.stream()):
+                    senders.start_soon(self.send_action, ws, limiter, str(i), name, data)
+                    self.sent += 1
+                    if self.args.rate:
+                        await trio.sleep_until(start + (i + 1) / self.args.rate)
+                    else:
+                        await trio.lowlevel.checkpoint()
+            self.elapsed = trio.current_time() - start
+
+            self.done.set()
+            nursery.cancel_scope.cancel()
+
+    def report(self) -> str:
+        latencies = [latency for values in self.latencies.values() for latency in values]
+        failed = sum(len(messages) for messages in self.failures.values())
+        dropped = sum(self.dropped.values())
+        lines = [
+            f"Sent {self.sent} actions in {self.elapsed:.2f} s: {len(latencies) - failed} succeeded, "
+            f"{failed} failed, {dropped} got no result within {self.args.timeout} s",
+        ]
+        if self.elapsed:
+            lines.append(f"Throughput: {len(latencies) / self.elapsed:.1f} results per second")
+        if latencies:
+            round_trips = [round_trip for values in self.round_trips.values() for round_trip in values]
+            lines.append(f"Latency: {describe_latencies(latencies)}")
+            lines.append(f"Round trip from sending: {describe_latencies(round_trips)}")
+        lines.append("Per action:")
+        for name in sorted(set(self.latencies) | set(self.dropped)):
+            values = self.latencies[name]
+            line = f"  {name}: {len(values)} results"
+            if values:
+                round_trip = statistics.median(self.round_trips[name])
+                line += f", {describe_latencies(values)}, round trip p50 {round_trip * 1000:.1f} ms"
+            if self.failures[name]:
+                line += f", {len(self.failures[name])} failed (e.g. {self.failures[name][0]!r})"
+            if self.dropped[name]:
+                line += f", {self.dropped[name]} without result"
+            lines.append(line)
+        return "\n".join(lines)
+
+
+def describe_latencies(latencies: list[float]) -> str:
+    ordered = sorted(latencies)
+    if len(ordered) > 1:
+        p50, p90, p99 = (statistics.quantiles(ordered, n=100, method="inclusive")[i] for i in (49, 89, 98))
+    else:
+        p50 = p90 = p99 = ordered[0]
+    return f"p50 {p50 * 1000:.1f} ms, p90 {p90 * 1000:.1f} ms, p99 {p99 * 1000:.1f} ms, max {ordered[-1] * 1000:.1f} ms"
+
+
+async def main(args: argparse.Namespace) -> None:
+    test = LoadTest(args)
+    async with trio.open_nursery() as nursery:
+        await nursery.start(serve_websocket, test.handle, args.host, args.port, None)
+        print(f"Waiting for the app on ws://{args.host}:{args.port}", file=sys.stderr)
+
+        app = None
+        if args.launch:
+            env = dict(os.environ, NEURO_SDK_WS_URL=f"ws://{args.host}:{args.port}", SDL_VIDEODRIVER="dummy")
+            app = subprocess.Popen([sys.executable, "-m", "neuro_canvas"], env=env, stdout=subprocess.DEVNULL)
+
+        try:
+            await test.done.wait()
+        finally:
+            if app is not None:
+                app.terminate()
+                # Let it finish logging before the report
+                await trio.to_thread.run_sync(app.wait)
+        nursery.cancel_scope.cancel()
+
+    print(test.report())
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Load test Neuro's Canvas with a stand-in Neuro server.")
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--script", help="JSONL file of actions to send instead of random ones")
+    parser.add_argument("--repeat", type=int, default=1, help="how many times to send the script")
+    parser.add_argument("--count", type=int, help="how many actions to send (default 100 random ones)")
+    parser.add_argument("--actions", nargs="*", help="only send these actions when sending random ones")
+    parser.add_argument("--rate", type=float, default=20, help="actions sent per second, 0 for as fast as possible")
+    parser.add_argument("--concurrency", type=int, default=1, help="actions that may wait for a result at once")
+    parser.add_argument("--timeout", type=float, default=10, help="seconds to wait for a result before dropping")
+    parser.add_argument("--settle", type=float, default=0.5, help="seconds to wait after the first registration")
+    parser.add_argument("--seed", type=int, help="seed for random streams")
+    parser.add_argument("--launch", action="store_true", help="start the app without a window")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    trio.run(main, parse_args())
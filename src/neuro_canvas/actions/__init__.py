@@ -1,25 +1,19 @@
 """Actions - Actions to let Neuro interact with the canvas."""
 
-import importlib
-import pkgutil
-from pathlib import Path
 from ..config.permissions import check_permission
 
 from ._abc import AbstractAction
+from ._queue import ActionQueue  # noqa: F401
+from ._registrar import ActionRegistrar  # noqa: F401
+from ._registry import ACTION_REGISTRY, load_action
 
-all_actions = []
 
-for module in pkgutil.iter_modules([Path(__file__).parent]):
-    if not module.name.startswith("_"):
-        importlib.import_module(f".{module.name}", package=__name__)
-
-for action_class in AbstractAction.__subclasses__():
-    try:
-        # Instantiate the action class
-        action_instance = action_class()
-
-        # Check permission using the property method
-        if check_permission(action_instance.permission):
-            all_actions.append(action_instance)
-    except AttributeError as e:
-        raise RuntimeError(f"An error happened during runtime: {e}")
+def load_actions() -> list[AbstractAction]:
+    """
+    Returns the actions the config allows and that can do something right now. A module is only imported once
+    one of its actions is returned.
+    """
+    return [
+        load_action(name) for name, entry in ACTION_REGISTRY.items()
+        if check_permission(entry.permission) and (entry.available is None or entry.available())
+    ]
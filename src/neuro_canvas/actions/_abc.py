@@ -6,8 +6,8 @@ else:
     # For compatibility with Python versions below 3.12, use the backported override
     from typing_extensions import override  # noqa: F401
 
-from typing import Optional, Any, Final
-from collections.abc import Callable, Coroutine
+from typing import Optional, Any
+from collections.abc import Callable, Coroutine, Hashable, Sequence
 from abc import ABC, abstractmethod
 
 from neuro_api.command import Action
@@ -18,22 +18,35 @@ from jsonschema import validate, ValidationError
 
 import logging
 
-BEZIER_STEPS: Final = 4
+from ..canvas import Canvas
+from ..trace import TraceWriter
+from ._queue import ActionQueue
+from ._results import QUERY_RESULT_MAX_BYTES, cap_result, result_max_bytes
 
 logger = logging.getLogger(__name__)
 
 
 def handle_json(
     action_function: Callable[[Optional[dict]], Coroutine[Any, Any, tuple[bool, Optional[str]]]],
-    schema: dict[str, object]
+    schema: dict[str, object],
+    queue: ActionQueue,
+    coalesce_key: Callable[[Optional[dict]], Optional[Hashable]] = lambda data: None,
+    trace: Optional[TraceWriter] = None,
+    max_bytes: Optional[int] = None
 ) -> Callable[[NeuroAction], Coroutine[Any, Any, tuple[bool, Optional[str]]]]:
     """
     Decorator that parses JSON data from the NeuroAction, validates it against the action's schema,
-    and calls the specified action function.
+    and queues the specified action function to run on the canvas.
 
     It handles JSON decoding errors and unexpected exceptions, returning appropriate error messages.
+    Every result message is cut to max_bytes, or the configured size if it isn't given.
+    Given a trace, every action that runs is recorded in it.
     """
     async def wrapper(action: NeuroAction) -> tuple[bool, Optional[str]]:
+        success, message = await run(action)
+        return success, None if message is None else cap_result(message, max_bytes)
+
+    async def run(action: NeuroAction) -> tuple[bool, Optional[str]]:
         try:
             if action.data is None:
                 data = None
@@ -42,16 +55,32 @@ def handle_json(
 
             validate(data, schema)
 
-            logger.info(f"Executing action {action.name} with args {data}")
-            return await action_function(data)
-        except (json.JSONDecodeError, ValidationError) as e:
+            # Formatted lazily, since the arguments can be long lists of points
+            logger.info("Executing action %s", action.name)
+            logger.debug("Arguments of %s: %s", action.name, data)
+            function = action_function
+            if trace is not None:
+                function = trace.traced(action.name, len(action.data or ""), action_function)
+            return await queue.submit(function, data, coalesce_key(data))
+        except json.JSONDecodeError as e:
             logger.warning(f"Received invalid JSON: {str(e)}")
             return False, f"Invalid JSON: {str(e)}"
+        except ValidationError as e:
+            # The full error repeats the schema and the arguments, which can be huge
+            logger.warning(f"Received invalid JSON: {e.message}")
+            return False, f"Invalid JSON: {e.message}"
         except Exception as e:
             logger.warning(f"Unexpected error: {str(e)}")
             return False, f"Unexpected error: {str(e)}"
     return wrapper
 
+
+def layer_name_schema(exclude: Sequence[str] = ()) -> dict[str, object]:
+    """
+    Returns the schema of a string naming one of the current layers, leaving out the excluded ones.
+    """
+    return {"type": "string", "enum": [name for name in Canvas().get_layer_order() if name not in exclude]}
+
 class AbstractAction(ABC):
     @property
     @abstractmethod
@@ -79,8 +108,31 @@ class AbstractAction(ABC):
         """
         return Action(self.name, self.desc, self.schema)
 
-    def get_handler(self) -> Callable[[NeuroAction], Coroutine[Any, Any, tuple[bool, Optional[str]]]]:
-        return handle_json(self.perform_action, self.schema)
+    def get_handler(
+        self, queue: ActionQueue, trace: Optional[TraceWriter] = None
+    ) -> Callable[[NeuroAction], Coroutine[Any, Any, tuple[bool, Optional[str]]]]:
+        return handle_json(self.perform_action, self.schema, queue, self.coalesce_key, trace, self.result_max_bytes())
+
+    def available(self) -> bool:
+        """
+        Returns whether the action can do anything in the current state of the canvas. Actions that can't are
+        unregistered until they can, so Neuro doesn't spend a call on them.
+        """
+        return True
+
+    def result_max_bytes(self) -> Optional[int]:
+        """
+        Returns the most bytes the action's results can take up, or None for the "result_max_bytes" setting.
+        Queries get a larger budget, so listing many layers or shapes isn't cut short.
+        """
+        return max(QUERY_RESULT_MAX_BYTES, result_max_bytes()) if self.permission == "query" else None
+
+    def coalesce_key(self, data: Optional[dict]) -> Optional[Hashable]:
+        """
+        Returns a key shared by actions that completely override each other, such as two brush color changes.
+        Consecutive queued actions with the same key are merged so only the last one runs. None never merges.
+        """
+        return None
 
     @abstractmethod
     async def perform_action(self, data: Optional[dict]) -> tuple[bool, Optional[str]]:
@@ -0,0 +1,32 @@
+from ..canvas import Canvas
+
+
+def has_custom_layers() -> bool:
+    # With only the background and base layers there is nothing to remove, switch to or rearrange
+    return len(Canvas().get_layer_order()) > 2
+
+
+def mergeable_layers() -> list[str]:
+    # Every layer other than base with a layer other than the background below it
+    order = Canvas().get_layer_order()
+    return [name for below, name in zip(order, order[1:]) if below != "background" and name != "base"]
+
+
+def has_mergeable_layers() -> bool:
+    return bool(mergeable_layers())
+
+
+def can_undo() -> bool:
+    return Canvas().can_undo()
+
+
+def has_shapes() -> bool:
+    return Canvas().has_shapes()
+
+
+def has_selection() -> bool:
+    return Canvas().get_selection() is not None
+
+
+def has_clipboard() -> bool:
+    return Canvas().has_clipboard()
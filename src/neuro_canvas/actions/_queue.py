@@ -0,0 +1,90 @@
+from typing import Optional, Any, Final, NoReturn
+from collections import deque
+from collections.abc import Callable, Coroutine, Hashable
+
+import trio
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+# How many actions may wait at once before handlers have to wait for room
+ACTION_QUEUE_SIZE: Final = 64
+
+ActionFunction = Callable[[Optional[dict]], Coroutine[Any, Any, tuple[bool, Optional[str]]]]
+
+
+class _Job:
+    def __init__(self, function: ActionFunction, data: Optional[dict], key: Optional[Hashable]):
+        self.function = function
+        self.data = data
+        self.key = key
+        self.done = trio.Event()
+        self.result: tuple[bool, Optional[str]] = (False, None)
+        self.error: Optional[Exception] = None
+
+
+class ActionQueue:
+    """
+    Bounded queue of actions between the websocket handlers and the canvas.
+
+    A single consumer task runs the actions in the order they arrived, so drawing never happens on the task that
+    reads from the websocket. Once the queue is full, submitting waits for room, which pushes back on bursts.
+
+    Consecutive actions with the same coalescing key are merged while they wait: only the newest one runs, and
+    everyone who submitted one of them gets its result.
+
+    after_action is called after every action that ran, whether it succeeded or not.
+    """
+
+    def __init__(self, max_size: int = ACTION_QUEUE_SIZE, after_action: Optional[Callable[[], None]] = None):
+        self._after_action = after_action
+        self._jobs: deque[_Job] = deque()
+        self._space = trio.Semaphore(max_size)
+        self._waiting = trio.Semaphore(0)
+
+    def __len__(self) -> int:
+        return len(self._jobs)
+
+    async def submit(
+        self, function: ActionFunction, data: Optional[dict], key: Optional[Hashable] = None
+    ) -> tuple[bool, Optional[str]]:
+        """
+        Queues an action and waits for its result.
+
+        Raises:
+            Exception: Whatever the action raised.
+        """
+        last = self._jobs[-1] if self._jobs else None
+        if key is not None and last is not None and last.key == key:
+            # The newer action makes the waiting one pointless, so run the newer one in its place
+            logger.debug(f"Merged queued action with key {key}")
+            last.function = function
+            last.data = data
+            job = last
+        else:
+            await self._space.acquire()
+            job = _Job(function, data, key)
+            self._jobs.append(job)
+            self._waiting.release()
+
+        await job.done.wait()
+        if job.error is not None:
+            raise job.error
+        return job.result
+
+    async def run(self) -> NoReturn:
+        """
+        Runs queued actions one at a time, forever.
+        """
+        while True:
+            await self._waiting.acquire()
+            job = self._jobs.popleft()
+            self._space.release()
+            try:
+                job.result = await job.function(job.data)
+            except Exception as e:
+                job.error = e
+            job.done.set()
+            if self._after_action is not None:
+                self._after_action()
@@ -0,0 +1,131 @@
+import pytest
+import trio
+import trio.testing
+
+from ..canvas import Canvas
+from ._queue import ActionQueue
+from .brush import SetStrokeStyleAction
+
+
+async def test_actions_run_in_order():
+    queue = ActionQueue()
+    ran = []
+
+    async def record(data):
+        ran.append(data["n"])
+        return True, str(data["n"])
+
+    async with trio.open_nursery() as nursery:
+        nursery.start_soon(queue.run)
+        async with trio.open_nursery() as senders:
+            for n in range(10):
+                senders.start_soon(queue.submit, record, {"n": n})
+                await trio.testing.wait_all_tasks_blocked()
+        nursery.cancel_scope.cancel()
+
+    assert ran == list(range(10))
+
+
+async def test_consecutive_actions_are_merged():
+    queue = ActionQueue()
+    ran = []
+    results = {}
+    gate = trio.Event()
+
+    async def slow(data):
+        await gate.wait()
+        return True, "slow"
+
+    async def record(data):
+        ran.append(data["color"])
+        return True, data["color"]
+
+    async def submit(name, function, data, key):
+        results[name] = await queue.submit(function, data, key)
+
+    async with trio.open_nursery() as nursery:
+        nursery.start_soon(queue.run)
+        nursery.start_soon(submit, "slow", slow, None, None)
+        await trio.testing.wait_all_tasks_blocked()
+
+        # These all wait behind the slow action, so the same-key ones in a row can be merged
+        for name, color, key in [("a", "red", "color"), ("b", "blue", "color"), ("c", "other", None),
+                                 ("d", "green", "color")]:
+            nursery.start_soon(submit, name, record, {"color": color}, key)
+            await trio.testing.wait_all_tasks_blocked()
+        assert len(queue) == 3
+
+        gate.set()
+        await trio.testing.wait_all_tasks_blocked()
+        nursery.cancel_scope.cancel()
+
+    assert ran == ["blue", "other", "green"]
+    assert results["a"] == results["b"] == (True, "blue")
+
+
+async def test_full_queue_applies_backpressure():
+    queue = ActionQueue(max_size=2)
+
+    async def noop(data):
+        return True, None
+
+    async with trio.open_nursery() as nursery:
+        for _ in range(3):
+            nursery.start_soon(queue.submit, noop, None)
+        await trio.testing.wait_all_tasks_blocked()
+        # The third submission waits for room instead of growing the queue
+        assert len(queue) == 2
+
+        nursery.start_soon(queue.run)
+        await trio.testing.wait_all_tasks_blocked()
+        assert len(queue) == 0
+        nursery.cancel_scope.cancel()
+
+
+async def test_errors_reach_the_submitter():
+    queue = ActionQueue()
+
+    async def fail(data):
+        raise ValueError("broken")
+
+    async with trio.open_nursery() as nursery:
+        nursery.start_soon(queue.run)
+        with pytest.raises(ValueError):
+            await queue.submit(fail, None)
+        nursery.cancel_scope.cancel()
+
+
+async def test_partial_changes_are_not_merged_away():
+    if hasattr(Canvas, "instance"):
+        del Canvas.instance
+    canvas = Canvas()
+    queue = ActionQueue()
+    action = SetStrokeStyleAction()
+    gate = trio.Event()
+    results = []
+
+    async def slow(data):
+        await gate.wait()
+        return True, "slow"
+
+    async def submit(data):
+        results.append(await queue.submit(action.perform_action, data, action.coalesce_key(data)))
+
+    async with trio.open_nursery() as nursery:
+        nursery.start_soon(queue.run)
+        nursery.start_soon(queue.submit, slow, None)
+        await trio.testing.wait_all_tasks_blocked()
+
+        # The cap and join changes set different fields, so neither replaces the other while they wait; the two
+        # join changes set the same one, so the newer replaces the older
+        for data in ({"cap": "square"}, {"join": "miter"}, {"join": "bevel"}):
+            nursery.start_soon(submit, data)
+            await trio.testing.wait_all_tasks_blocked()
+        assert len(queue) == 2
+
+        gate.set()
+        await trio.testing.wait_all_tasks_blocked()
+        nursery.cancel_scope.cancel()
+
+    assert canvas.get_stroke_style()[:2] == ("square", "bevel")
+    assert results[0] == (True, "Set stroke style to square caps, round joins")
@@ -0,0 +1,112 @@
+from typing import Final, NoReturn, Optional
+from collections.abc import Callable, Iterable
+
+import trio
+from neuro_api.command import Action
+from neuro_api.trio_ws import TrioNeuroAPIComponent
+
+import logging
+
+from ..connection import CONNECTION_ERRORS
+from ..trace import TraceWriter
+from ..workers import canvas_lock
+from ._abc import AbstractAction
+from ._queue import ActionQueue
+
+logger = logging.getLogger(__name__)
+
+# Seconds to wait after a change before updating the registered actions, so a burst of actions causes one update
+REGISTRATION_DEBOUNCE: Final = 0.5
+
+
+class ActionRegistrar:
+    """
+    Keeps the actions registered with Neuro in line with the state of the canvas.
+
+    Actions that can't do anything right now, such as undo with nothing to undo, are unregistered until they can,
+    and actions whose schema changed, such as one listing the layer names, are registered again with the new one.
+    Only actions that changed are sent, and changes are gathered for a moment before sending them.
+
+    The actions to consider are fetched on every update, so permissions can change while the app runs.
+    """
+
+    def __init__(
+        self,
+        component: TrioNeuroAPIComponent,
+        actions: Callable[[], Iterable[AbstractAction]],
+        queue: ActionQueue,
+        trace: Optional[TraceWriter] = None,
+        debounce: float = REGISTRATION_DEBOUNCE,
+    ):
+        self._component = component
+        self._actions = actions
+        self._queue = queue
+        self._trace = trace
+        self._debounce = debounce
+        self._registered: dict[str, Action] = {}
+        self._changed = trio.Event()
+        self._lock = trio.Lock()
+
+    def notify(self) -> None:
+        """
+        Tells the registrar the canvas may have changed. Cheap enough to call after every action.
+        """
+        self._changed.set()
+
+    async def update(self) -> None:
+        """
+        Registers and unregisters actions right away to match the current state of the canvas.
+        """
+        async with self._lock:
+            await self._update()
+
+    async def register_all(self) -> None:
+        """
+        Registers every available action from scratch, for a new connection where Neuro knows none of them.
+        """
+        async with self._lock:
+            for name in self._registered:
+                self._component.unregister_handler_type(f"neuro_{name}")
+            self._registered.clear()
+            await self._update()
+
+    async def _update(self) -> None:
+        # Availability and schemas read the canvas, which an operation in the worker may be halfway through changing
+        async with canvas_lock:
+            wanted = {action.name: action for action in self._actions() if action.available()}
+            descriptions = {name: action.get_action() for name, action in wanted.items()}
+
+        # Neuro ignores registering an action again, so a changed action has to be unregistered first
+        stale = [name for name, registered in self._registered.items() if descriptions.get(name) != registered]
+        if stale:
+            logger.debug(f"Unregistering actions {stale}")
+            await self._component.unregister_actions(stale)
+            for name in stale:
+                # Otherwise the old handler would run alongside the new one
+                self._component.unregister_handler_type(f"neuro_{name}")
+                del self._registered[name]
+
+        new = [name for name in descriptions if name not in self._registered]
+        if new:
+            logger.debug(f"Registering actions {new}")
+            await self._component.register_neuro_actions([
+                (descriptions[name], wanted[name].get_handler(self._queue, self._trace)) for name in new
+            ])
+            self._registered.update((name, descriptions[name]) for name in new)
+
+    async def run(self) -> NoReturn:
+        """
+        Updates the registered actions after changes, at most once per debounce interval, forever.
+
+        While disconnected, changes are left for register_all to pick up on the next connection.
+        """
+        while True:
+            await self._changed.wait()
+            await trio.sleep(self._debounce)
+            self._changed = trio.Event()
+            if self._component.not_connected:
+                continue
+            try:
+                await self.update()
+            except (RuntimeError, *CONNECTION_ERRORS) as e:
+                logger.warning(f"Could not update the registered actions: {str(e)}")
@@ -0,0 +1,205 @@
+import json
+import threading
+from typing import Any
+
+import trio
+from neuro_api.api import NeuroAction
+
+from ..canvas import Canvas
+from ..config import load
+from ..workers import run_off_loop
+from . import load_actions
+from ._queue import ActionQueue
+from ._registrar import ActionRegistrar
+from .layers import SwitchActiveLayerAction
+from .misc import UndoAction
+from .query import GetPixelColorAction
+from .selection import PasteAction
+
+
+def setup_canvas() -> Canvas:
+    if hasattr(Canvas, "instance"):
+        del Canvas.instance
+    return Canvas()
+
+
+class FakeComponent:
+    def __init__(self):
+        self.registered: dict[str, Any] = {}
+        self.handlers: set[str] = set()
+        self.callbacks: dict[str, Any] = {}
+        self.calls: list[tuple[str, list[str]]] = []
+        self.not_connected = False
+
+    async def register_neuro_actions(self, action_handlers: list) -> None:
+        names = [action.name for action, _ in action_handlers]
+        self.calls.append(("register", names))
+        for action, callback in action_handlers:
+            self.registered[action.name] = action.schema
+            self.callbacks[action.name] = callback
+            self.handlers.add(f"neuro_{action.name}")
+
+    async def unregister_actions(self, names: list[str]) -> None:
+        self.calls.append(("unregister", names))
+        for name in names:
+            del self.registered[name]
+
+    def unregister_handler_type(self, event_name: str) -> None:
+        self.handlers.discard(event_name)
+
+
+async def test_registered_actions_follow_canvas():
+    canvas = setup_canvas()
+    component = FakeComponent()
+    actions = [UndoAction(), SwitchActiveLayerAction(), GetPixelColorAction(), PasteAction()]
+    registrar = ActionRegistrar(component, lambda: actions, ActionQueue())  # type: ignore[arg-type]
+
+    await registrar.update()
+    assert set(component.registered) == {"get_pixel_color"}
+
+    canvas.draw_line((10, 10), (20, 20))
+    canvas.add_layer("sky")
+    await registrar.update()
+    assert set(component.registered) == {"get_pixel_color", "undo", "switch_active_layer"}
+    # The layer names changed, so the query was registered again with the new ones
+    assert component.calls[-2] == ("unregister", ["get_pixel_color"])
+    layer_enum = component.registered["get_pixel_color"]["properties"]["layer"]["enum"]
+    assert layer_enum == ["background", "base", "sky"]
+    assert component.handlers == {"neuro_get_pixel_color", "neuro_undo", "neuro_switch_active_layer"}
+
+    # Nothing changed, nothing is sent
+    calls = len(component.calls)
+    await registrar.update()
+    assert len(component.calls) == calls
+
+
+async def test_updates_are_debounced():
+    canvas = setup_canvas()
+    component = FakeComponent()
+    registrar = ActionRegistrar(
+        component, lambda: [UndoAction()], ActionQueue(), debounce=0.05  # type: ignore[arg-type]
+    )
+
+    async with trio.open_nursery() as nursery:
+        nursery.start_soon(registrar.run)
+        for i in range(5):
+            canvas.draw_line((i, 0), (i, 10))
+            registrar.notify()
+        await trio.sleep(0.2)
+        nursery.cancel_scope.cancel()
+
+    assert component.calls == [("register", ["undo"])]
+
+
+async def test_register_all_after_reconnect():
+    canvas = setup_canvas()
+    component = FakeComponent()
+    registrar = ActionRegistrar(
+        component, lambda: [UndoAction(), GetPixelColorAction()], ActionQueue(), debounce=0.05  # type: ignore[arg-type]
+    )
+    await registrar.update()
+
+    # Changes while disconnected wait for the next connection
+    component.not_connected = True
+    async with trio.open_nursery() as nursery:
+        nursery.start_soon(registrar.run)
+        canvas.draw_line((0, 0), (10, 10))
+        registrar.notify()
+        await trio.sleep(0.2)
+        nursery.cancel_scope.cancel()
+    assert component.calls == [("register", ["get_pixel_color"])]
+
+    # A new connection knows nothing, so everything is registered again
+    component.not_connected = False
+    component.registered.clear()
+    await registrar.register_all()
+    assert component.calls[-1] == ("register", ["undo", "get_pixel_color"])
+    assert set(component.registered) == {"undo", "get_pixel_color"}
+
+
+async def test_update_waits_for_worker():
+    canvas = setup_canvas()
+    component = FakeComponent()
+    registrar = ActionRegistrar(component, lambda: [UndoAction()], ActionQueue())  # type: ignore[arg-type]
+    release = threading.Event()
+
+    def operation() -> None:
+        release.wait()
+        canvas.draw_line((0, 0), (10, 10))
+
+    async with trio.open_nursery() as nursery:
+        nursery.start_soon(run_off_loop, operation)
+        await trio.sleep(0.05)
+        nursery.start_soon(registrar.update)
+        await trio.sleep(0.05)
+        # The update is waiting for the operation rather than reading the canvas while it changes
+        assert component.calls == []
+        release.set()
+
+    assert component.calls == [("register", ["undo"])]
+
+
+async def test_default_config_offers_layer_actions(monkeypatch):
+    setup_canvas()
+    monkeypatch.setattr(load, "_config", load.default_config)
+    component = FakeComponent()
+    registrar = ActionRegistrar(component, load_actions, ActionQueue())  # type: ignore[arg-type]
+
+    await registrar.update()
+    assert {"add_layer", "set_layer_visibility", "set_background_color"} <= set(component.registered)
+
+
+async def call(component: FakeComponent, registrar: ActionRegistrar, name: str, data: dict) -> tuple[bool, str]:
+    result = await component.callbacks[name](NeuroAction("1", name, json.dumps(data)))
+    await registrar.update()
+    return result
+
+
+async def test_shapes_on_a_new_vector_layer_can_be_found(monkeypatch):
+    setup_canvas()
+    monkeypatch.setattr(load, "_config", load.default_config)
+    component = FakeComponent()
+    queue = ActionQueue()
+    registrar = ActionRegistrar(component, load_actions, queue)  # type: ignore[arg-type]
+
+    async with trio.open_nursery() as nursery:
+        nursery.start_soon(queue.run)
+        await registrar.update()
+        assert not {"find_shape", "erase_shape", "recolor_shape"} & set(component.registered)
+
+        result = await call(component, registrar, "add_layer", {"name": "shapes", "vector": True})
+        assert result == (True, "Added vector layer: shapes")
+        await call(component, registrar, "switch_active_layer", {"name": "shapes"})
+        await call(component, registrar, "draw_rectangle",
+                   {"left": 100, "top": 100, "width": 50, "height": 50, "filled": True})
+        assert {"find_shape", "erase_shape", "recolor_shape"} <= set(component.registered)
+
+        success, message = await call(component, registrar, "find_shape", {"x": 120, "y": 120})
+        assert success and message.startswith("Shape 0 on layer 'shapes'")
+
+        nursery.cancel_scope.cancel()
+
+
+async def test_layer_actions_follow_custom_layers(monkeypatch):
+    setup_canvas()
+    monkeypatch.setattr(load, "_config", load.default_config)
+    component = FakeComponent()
+    queue = ActionQueue()
+    registrar = ActionRegistrar(component, load_actions, queue)  # type: ignore[arg-type]
+    gated = {"remove_layer", "switch_active_layer", "move_layer", "reorder_layers"}
+
+    async with trio.open_nursery() as nursery:
+        nursery.start_soon(queue.run)
+        await registrar.update()
+        # With only the background and base layers there is nothing to remove, switch to or rearrange
+        assert not gated & set(component.registered)
+
+        await call(component, registrar, "add_layer", {"name": "sky"})
+        assert gated <= set(component.registered)
+        assert component.registered["remove_layer"]["properties"]["name"]["enum"] == ["sky"]
+
+        result = await call(component, registrar, "remove_layer", {"name": "sky"})
+        assert result == (True, "Removed layer: sky")
+        assert not gated & set(component.registered)
+
+        nursery.cancel_scope.cancel()
@@ -0,0 +1,91 @@
+import importlib
+from functools import cache
+from typing import Final, NamedTuple, Optional
+from collections.abc import Callable
+
+from ._abc import AbstractAction
+from ._availability import (
+    can_undo, has_clipboard, has_custom_layers, has_mergeable_layers, has_selection, has_shapes
+)
+
+
+class ActionEntry(NamedTuple):
+    module: str
+    class_name: str
+    permission: str
+    # For actions that can't always do something, the same check as their available(), so their module isn't
+    # imported before they can be registered
+    available: Optional[Callable[[], bool]] = None
+
+
+# Every action by name, with where it lives and the permission it needs. Knowing this up front means startup can
+# skip scanning the package and only import the modules of actions that can be registered.
+# _registry_test.py checks that it matches the action classes.
+ACTION_REGISTRY: Final[dict[str, ActionEntry]] = {
+    "set_background_color": ActionEntry("background", "SetBackgroundColorAction", "layers.background"),
+    "set_custom_background_color": ActionEntry("background", "SetCustomBackgroundColorAction", "layers.background"),
+    "set_brush_color": ActionEntry("brush", "SetBrushColorAction", "brush"),
+    "set_custom_brush_color": ActionEntry("brush", "SetCustomBrushColorAction", "brush"),
+    "set_brush_width": ActionEntry("brush", "SetBrushWidthAction", "brush"),
+    "set_stroke_style": ActionEntry("brush", "SetStrokeStyleAction", "brush"),
+    "set_brush_tip": ActionEntry("brush", "SetBrushTipAction", "brush"),
+    "draw_line": ActionEntry("draw", "DrawLineAction", "draw.line"),
+    "draw_lines": ActionEntry("draw", "DrawLinesAction", "draw.line_sequence"),
+    "draw_curve": ActionEntry("draw", "DrawCurveAction", "draw.curve"),
+    "draw_circle": ActionEntry("draw", "DrawCircleAction", "draw.circle"),
+    "draw_triangle": ActionEntry("draw", "DrawTriangleAction", "draw.triangle"),
+    "draw_rectangle": ActionEntry("draw", "DrawRectangleAction", "draw.rectangle"),
+    "draw_regular_polygon": ActionEntry("draw", "DrawRegularPolygonAction", "draw.polygon"),
+    "draw_star": ActionEntry("draw", "DrawStarAction", "draw.star"),
+    "add_layer": ActionEntry("layers", "AddLayerAction", "layers.custom"),
+    "remove_layer": ActionEntry("layers", "RemoveLayerAction", "layers.custom", has_custom_layers),
+    "set_layer_visibility": ActionEntry("layers", "SetLayerVisibilityAction", "layers.custom"),
+    "switch_active_layer": ActionEntry("layers", "SwitchActiveLayerAction", "layers.custom", has_custom_layers),
+    "set_layer_blend_mode": ActionEntry("layers", "SetLayerBlendModeAction", "layers.custom"),
+    "move_layer": ActionEntry("layers", "MoveLayerAction", "layers.custom", has_custom_layers),
+    "reorder_layers": ActionEntry("layers", "ReorderLayersAction", "layers.custom", has_custom_layers),
+    "merge_down": ActionEntry("layers", "MergeDownAction", "layers.custom", has_mergeable_layers),
+    "flatten_visible": ActionEntry("layers", "FlattenVisibleAction", "layers.custom"),
+    "duplicate_layer": ActionEntry("layers", "DuplicateLayerAction", "layers.custom"),
+    "translate_layer": ActionEntry("layers", "TranslateLayerAction", "layers.custom"),
+    "scale_layer": ActionEntry("layers", "ScaleLayerAction", "layers.custom"),
+    "rotate_layer": ActionEntry("layers", "RotateLayerAction", "layers.custom"),
+    "flip_layer": ActionEntry("layers", "FlipLayerAction", "layers.custom"),
+    "erase_line": ActionEntry("eraser", "EraseLineAction", "misc.eraser"),
+    "erase_lines": ActionEntry("eraser", "EraseLinesAction", "misc.eraser"),
+    "erase_circle": ActionEntry("eraser", "EraseCircleAction", "misc.eraser"),
+    "erase_rectangle": ActionEntry("eraser", "EraseRectangleAction", "misc.eraser"),
+    "fill_gradient": ActionEntry("fills", "FillGradientAction", "misc.fill"),
+    "fill_pattern": ActionEntry("fills", "FillPatternAction", "misc.fill"),
+    "bucket_fill": ActionEntry("misc", "BucketFillAction", "misc.bucket"),
+    "undo": ActionEntry("misc", "UndoAction", "misc.undo", can_undo),
+    "export": ActionEntry("misc", "ExportAction", "misc.export"),
+    "list_layers": ActionEntry("query", "ListLayersAction", "query"),
+    "get_pixel_color": ActionEntry("query", "GetPixelColorAction", "query"),
+    "describe_region": ActionEntry("query", "DescribeRegionAction", "query"),
+    "find_shape": ActionEntry("query", "FindShapeAction", "query", has_shapes),
+    "erase_shape": ActionEntry("shapes", "EraseShapeAction", "shapes", has_shapes),
+    "recolor_shape": ActionEntry("shapes", "RecolorShapeAction", "shapes", has_shapes),
+    "select_rectangle": ActionEntry("selection", "SelectRectangleAction", "selection"),
+    "select_ellipse": ActionEntry("selection", "SelectEllipseAction", "selection"),
+    "select_magic_wand": ActionEntry("selection", "SelectMagicWandAction", "selection"),
+    "select_none": ActionEntry("selection", "SelectNoneAction", "selection", has_selection),
+    "fill_selection": ActionEntry("selection", "FillSelectionAction", "selection", has_selection),
+    "clear_selection": ActionEntry("selection", "ClearSelectionAction", "selection", has_selection),
+    "copy_selection": ActionEntry("selection", "CopySelectionAction", "selection", has_selection),
+    "paste": ActionEntry("selection", "PasteAction", "selection", has_clipboard),
+    "transform_selection": ActionEntry("selection", "TransformSelectionAction", "selection", has_selection),
+}
+
+
+@cache
+def load_action(name: str) -> AbstractAction:
+    """
+    Imports the module of an action on first use and returns its instance, the same one on every call.
+
+    Raises:
+        KeyError: If there is no action with that name.
+    """
+    entry = ACTION_REGISTRY[name]
+    module = importlib.import_module(f".{entry.module}", package=__package__)
+    return getattr(module, entry.class_name)()
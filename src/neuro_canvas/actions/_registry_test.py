@@ -0,0 +1,51 @@
+import importlib
+import pkgutil
+import subprocess
+import sys
+from pathlib import Path
+
+from ._abc import AbstractAction
+from ._registry import ACTION_REGISTRY, load_action
+
+
+def test_registry_matches_action_classes():
+    for module in pkgutil.iter_modules([Path(__file__).parent]):
+        if not module.name.startswith("_"):
+            importlib.import_module(f".{module.name}", package=__package__)
+
+    found = {}
+    for action_class in AbstractAction.__subclasses__():
+        action = action_class()
+        found[action.name] = (
+            action_class.__module__.rsplit(".", 1)[1], action_class.__name__, action.permission,
+            # Actions that can't always do something need the check in their entry too
+            action_class.available is not AbstractAction.available
+        )
+
+    assert {
+        name: (entry.module, entry.class_name, entry.permission, entry.available is not None)
+        for name, entry in ACTION_REGISTRY.items()
+    } == found
+
+
+def test_load_action_reuses_instance():
+    action = load_action("bucket_fill")
+    assert action.name == "bucket_fill"
+    assert load_action("bucket_fill") is action
+
+
+def test_modules_are_imported_once_an_action_can_be_registered():
+    # A fresh interpreter, so no earlier test has imported the modules already
+    code = """
+import sys
+from neuro_canvas.actions import load_actions
+from neuro_canvas.canvas import Canvas
+canvas = Canvas()
+print(any(action.name == "erase_shape" for action in load_actions()), "neuro_canvas.actions.shapes" in sys.modules)
+canvas.add_layer("shapes", vector=True)
+canvas.switch_active_layer("shapes")
+canvas.draw_line((10, 10), (50, 50))
+print(any(action.name == "erase_shape" for action in load_actions()), "neuro_canvas.actions.shapes" in sys.modules)
+"""
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert result.stdout.splitlines()[-2:] == ["False False", "True True"]
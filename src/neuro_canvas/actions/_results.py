@@ -0,0 +1,63 @@
+from typing import Final, Literal
+from collections.abc import Sequence
+
+from ..config.settings import get_setting
+
+ResultVerbosity = Literal["minimal", "normal", "detailed"]
+RESULT_VERBOSITIES: Final[tuple[ResultVerbosity, ...]] = ("minimal", "normal", "detailed")
+DEFAULT_RESULT_VERBOSITY: Final[ResultVerbosity] = "normal"
+
+# Results are cut to this many bytes, so their size never grows with the size of the action
+DEFAULT_RESULT_MAX_BYTES: Final = 256
+# Queries exist to return information, so they get a larger budget, still bounded by the size of the canvas
+QUERY_RESULT_MAX_BYTES: Final = 4096
+ELLIPSIS: Final = "..."
+
+
+def result_verbosity() -> ResultVerbosity:
+    verbosity = get_setting("result_verbosity")
+    return verbosity if verbosity in RESULT_VERBOSITIES else DEFAULT_RESULT_VERBOSITY
+
+
+def result_max_bytes() -> int:
+    max_bytes = get_setting("result_max_bytes")
+    return max_bytes if isinstance(max_bytes, int) else DEFAULT_RESULT_MAX_BYTES
+
+
+def describe_points(points: Sequence[tuple[int, int]]) -> str:
+    """
+    Describes points by how many there are and, unless the result verbosity is "minimal", the box around them.
+    With "detailed" verbosity the points are listed, as long as that takes up at most half a result.
+    """
+    count = f"{len(points)} point{'' if len(points) == 1 else 's'}"
+    verbosity = result_verbosity()
+    if verbosity == "minimal" or not points:
+        return count
+
+    if verbosity == "detailed":
+        listed = ", ".join(f"({x}, {y})" for x, y in points)
+        if len(listed) <= result_max_bytes() // 2:
+            return listed
+
+    xs = [x for x, _ in points]
+    ys = [y for _, y in points]
+    return f"{count} from ({min(xs)}, {min(ys)}) to ({max(xs)}, {max(ys)})"
+
+
+def cap_result(message: str, max_bytes: int | None = None) -> str:
+    """
+    Cuts a result message down to the byte limit, ending it with an ellipsis if anything was cut.
+
+    Args:
+        message (str): The message.
+        max_bytes (int | None, optional): The limit. Defaults to the "result_max_bytes" setting.
+
+    Returns:
+        str: The message, no longer than the limit once encoded as UTF-8.
+    """
+    max_bytes = result_max_bytes() if max_bytes is None else max_bytes
+    encoded = message.encode()
+    if len(encoded) <= max_bytes:
+        return message
+    # Cutting may split a character in two, so drop whatever is left of it
+    return encoded[:max_bytes - len(ELLIPSIS)].decode(errors="ignore") + ELLIPSIS
@@ -0,0 +1,86 @@
+import json
+from typing import Optional
+
+import trio
+from neuro_api.api import NeuroAction
+
+from ..canvas import Canvas
+from . import _results
+from ._abc import handle_json
+from ._queue import ActionQueue
+from ._results import ELLIPSIS, cap_result, describe_points
+from .query import ListLayersAction
+
+
+def test_cap_result():
+    assert cap_result("short", 10) == "short"
+
+    capped = cap_result("x" * 100, 20)
+    assert len(capped.encode()) == 20 and capped.endswith(ELLIPSIS)
+
+    # A character cut in half is dropped rather than garbled
+    capped = cap_result("é" * 20, 10)
+    assert capped == "é" * 3 + ELLIPSIS
+
+
+def test_describe_points(monkeypatch):
+    points = [(10, 40), (30, 20), (50, 60)]
+    settings = {"result_verbosity": "normal", "result_max_bytes": 256}
+    monkeypatch.setattr(_results, "get_setting", lambda name: settings.get(name, ValueError))
+
+    assert describe_points(points) == "3 points from (10, 20) to (50, 60)"
+
+    settings["result_verbosity"] = "minimal"
+    assert describe_points(points) == "3 points"
+
+    settings["result_verbosity"] = "detailed"
+    assert describe_points(points) == "(10, 40), (30, 20), (50, 60)"
+    # Too many points to list falls back to the summary
+    assert describe_points(points * 20) == "60 points from (10, 20) to (50, 60)"
+
+
+async def test_handler_results_stay_small():
+    async def echo(data: Optional[dict]) -> tuple[bool, Optional[str]]:
+        assert data is not None
+        return True, f"Echoed {data['points']}"
+
+    schema = {"type": "object", "properties": {"points": {"type": "array", "items": {"type": "integer"}}}}
+    queue = ActionQueue()
+    handler = handle_json(echo, schema, queue)
+
+    async with trio.open_nursery() as nursery:
+        nursery.start_soon(queue.run)
+
+        success, message = await handler(NeuroAction("1", "echo", json.dumps({"points": list(range(10_000))})))
+        assert success and message is not None
+        assert len(message.encode()) <= _results.DEFAULT_RESULT_MAX_BYTES
+
+        # Validation errors don't repeat the arguments either
+        success, message = await handler(NeuroAction("2", "echo", json.dumps({"points": ["x"] * 10_000})))
+        assert not success and message is not None
+        assert len(message.encode()) <= _results.DEFAULT_RESULT_MAX_BYTES
+
+        nursery.cancel_scope.cancel()
+
+
+async def test_query_results_are_not_cut_short():
+    if hasattr(Canvas, "instance"):
+        del Canvas.instance
+    canvas = Canvas()
+    names = [f"layer {n}" for n in range(20)]
+    for name in names:
+        canvas.add_layer(name)
+
+    queue = ActionQueue()
+    handler = ListLayersAction().get_handler(queue)
+
+    async with trio.open_nursery() as nursery:
+        nursery.start_soon(queue.run)
+
+        success, message = await handler(NeuroAction("1", "list_layers", None))
+        assert success and message is not None
+        assert len(message.encode()) > _results.DEFAULT_RESULT_MAX_BYTES
+        assert not message.endswith(ELLIPSIS)
+        assert all(f"{name}: " in message for name in names)
+
+        nursery.cancel_scope.cancel()
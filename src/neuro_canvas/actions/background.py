@@ -1,4 +1,5 @@
 from typing import Optional
+from collections.abc import Hashable
 
 from pygame import Color
 
@@ -35,7 +36,11 @@ class SetBackgroundColorAction(AbstractAction):
     @property
     @override
     def permission(self) -> str:
-        return "layers"
+        return "layers.background"
+
+    @override
+    def coalesce_key(self, data: Optional[dict]) -> Optional[Hashable]:
+        return ("background_color",)
 
     @override
     async def perform_action(self, data: Optional[dict]) -> tuple[bool, Optional[str]]:
@@ -94,7 +99,11 @@ class SetCustomBackgroundColorAction(AbstractAction):
     @property
     @override
     def permission(self) -> str:
-        return "layers"
+        return "layers.background"
+
+    @override
+    def coalesce_key(self, data: Optional[dict]) -> Optional[Hashable]:
+        return ("background_color",)
 
     @override
     async def perform_action(self, data: Optional[dict]) -> tuple[bool, Optional[str]]:
@@ -1,9 +1,12 @@
 from typing import Optional
+from collections.abc import Hashable
 
 from pygame import Color
 
+from ..brushes import BRUSH_TIPS, MAX_SCATTER, MAX_SPACING, MIN_SPACING
 from ..canvas import Canvas
-from ..constants import COLORS, COLOR_MAX_VAL
+from ..constants import COLORS, COLOR_MAX_VAL, MAX_BRUSH_WIDTH
+from ..stroke import CAP_STYLES, JOIN_STYLES
 from ._abc import AbstractAction, override
 
 
@@ -37,6 +40,10 @@ class SetBrushColorAction(AbstractAction):
     def permission(self) -> str:
         return "brush"
 
+    @override
+    def coalesce_key(self, data: Optional[dict]) -> Optional[Hashable]:
+        return ("brush_color",)
+
     @override
     async def perform_action(self, data: Optional[dict]) -> tuple[bool, Optional[str]]:
         assert data, "'data' was expected but was set to None"
@@ -101,6 +108,10 @@ class SetCustomBrushColorAction(AbstractAction):
     def permission(self) -> str:
         return "brush"
 
+    @override
+    def coalesce_key(self, data: Optional[dict]) -> Optional[Hashable]:
+        return ("brush_color",)
+
     @override
     async def perform_action(self, data: Optional[dict]) -> tuple[bool, Optional[str]]:
         assert data, "'data' was expected but was set to None"
@@ -114,3 +125,175 @@ class SetCustomBrushColorAction(AbstractAction):
         Canvas().set_brush_color(color)
 
         return True, f"Set brush color to {color}"
+
+
+class SetBrushWidthAction(AbstractAction):
+    @property
+    @override
+    def name(self) -> str:
+        return "set_brush_width"
+
+    @property
+    @override
+    def desc(self) -> str:
+        return "Changes the width, in pixels, of everything drawn from now on."
+
+    @property
+    @override
+    def schema(self) -> dict[str, object]:
+        return {
+            "type": "object",
+            "required": ["width"],
+            "properties": {
+                "width": {
+                    "type": "integer",
+                    "minimum": 1,
+                    "maximum": MAX_BRUSH_WIDTH
+                },
+            }
+        }
+
+    @property
+    @override
+    def permission(self) -> str:
+        return "brush"
+
+    @override
+    def coalesce_key(self, data: Optional[dict]) -> Optional[Hashable]:
+        return ("brush_width",)
+
+    @override
+    async def perform_action(self, data: Optional[dict]) -> tuple[bool, Optional[str]]:
+        assert data, "'data' was expected but was set to None"
+
+        width = data["width"]
+
+        Canvas().set_brush_width(width)
+
+        return True, f"Set brush width to {width}"
+
+
+class SetStrokeStyleAction(AbstractAction):
+    @property
+    @override
+    def name(self) -> str:
+        return "set_stroke_style"
+
+    @property
+    @override
+    def desc(self) -> str:
+        return (
+            "Changes how strokes are drawn. "
+            "\"cap\" sets how the ends of lines and curves look, "
+            "\"join\" sets how corners between segments look, "
+            "and \"antialias\" smooths the edges of everything drawn. "
+            "Omitted fields keep their current value."
+        )
+
+    @property
+    @override
+    def schema(self) -> dict[str, object]:
+        return {
+            "type": "object",
+            "properties": {
+                "cap": {
+                    "type": "string",
+                    "enum": list(CAP_STYLES)
+                },
+                "join": {
+                    "type": "string",
+                    "enum": list(JOIN_STYLES)
+                },
+                "antialias": {"type": "boolean"}
+            }
+        }
+
+    @property
+    @override
+    def permission(self) -> str:
+        return "brush"
+
+    @override
+    def coalesce_key(self, data: Optional[dict]) -> Optional[Hashable]:
+        # Omitted fields keep their value, so only a change of the same fields completely overrides another
+        return ("stroke_style", frozenset(data or ()))
+
+    @override
+    async def perform_action(self, data: Optional[dict]) -> tuple[bool, Optional[str]]:
+        assert data is not None, "'data' was expected but was set to None"
+
+        canvas = Canvas()
+        cap, join, antialias = canvas.get_stroke_style()
+        cap = data.get("cap", cap)
+        join = data.get("join", join)
+        antialias = data.get("antialias", antialias)
+
+        canvas.set_stroke_style(cap, join, antialias)
+
+        return True, f"Set stroke style to {cap} caps, {join} joins{", antialiased" if antialias else ""}"
+
+
+class SetBrushTipAction(AbstractAction):
+    @property
+    @override
+    def name(self) -> str:
+        return "set_brush_tip"
+
+    @property
+    @override
+    def desc(self) -> str:
+        return (
+            "Changes the brush texture used for lines, curves and shape outlines. "
+            "\"solid\" draws smooth continuous strokes; the other tips stamp repeated dabs of that shape along "
+            "the path, each as wide as the brush (\"soft\" dabs fade out towards their edges). "
+            f"\"spacing\" is the gap between dabs as a fraction of the brush width (at least {MIN_SPACING}), "
+            "and \"scatter\" sprays the dabs randomly up to that many brush widths away from the path, like an "
+            "airbrush. Omitted fields keep their current value."
+        )
+
+    @property
+    @override
+    def schema(self) -> dict[str, object]:
+        return {
+            "type": "object",
+            "properties": {
+                "tip": {
+                    "type": "string",
+                    "enum": list(BRUSH_TIPS)
+                },
+                "spacing": {
+                    "type": "number",
+                    "exclusiveMinimum": 0,
+                    "maximum": MAX_SPACING
+                },
+                "scatter": {
+                    "type": "number",
+                    "minimum": 0,
+                    "maximum": MAX_SCATTER
+                }
+            }
+        }
+
+    @property
+    @override
+    def permission(self) -> str:
+        return "brush"
+
+    @override
+    def coalesce_key(self, data: Optional[dict]) -> Optional[Hashable]:
+        # Omitted fields keep their value, so only a change of the same fields completely overrides another
+        return ("brush_tip", frozenset(data or ()))
+
+    @override
+    async def perform_action(self, data: Optional[dict]) -> tuple[bool, Optional[str]]:
+        assert data is not None, "'data' was expected but was set to None"
+
+        canvas = Canvas()
+        tip, spacing, scatter = canvas.get_brush_tip()
+        tip = data.get("tip", tip)
+        spacing = data.get("spacing", spacing)
+        scatter = data.get("scatter", scatter)
+
+        canvas.set_brush_tip(tip, spacing, scatter)
+
+        return True, f"Set brush tip to {tip} with spacing {spacing} and scatter {scatter}"
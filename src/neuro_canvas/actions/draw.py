@@ -1,8 +1,10 @@
 from typing import Optional
 
 from ..canvas import Canvas
-from ..constants import SCREEN_WIDTH, SCREEN_HEIGHT, BEZIER_STEPS
+from ..constants import SCREEN_WIDTH, SCREEN_HEIGHT
+from ..curves import CURVE_MODES
 from ._abc import AbstractAction, override
+from ._results import describe_points
 
 
 class DrawLineAction(AbstractAction):
@@ -86,7 +88,8 @@ class DrawLinesAction(AbstractAction):
     def desc(self) -> str:
         return (
             "Draws a sequence of straight lines through \"points\". "
-            "If \"closed\" is true, draws a final line connecting the first and last lines."
+            "If \"closed\" is true, draws a final line connecting the first and last lines. "
+            "If \"filled\" is true, the shape is always closed and its inside is filled with the brush color."
         )
 
     @property
@@ -116,7 +119,8 @@ class DrawLinesAction(AbstractAction):
                     },
                     "minItems": 3
                 },
-                "closed": {"type": "boolean"}
+                "closed": {"type": "boolean"},
+                "filled": {"type": "boolean"}
             }
         }
 
@@ -131,10 +135,13 @@ class DrawLinesAction(AbstractAction):
 
         points = [(point["x"], point["y"]) for point in data["points"]]
         closed = data["closed"]
+        filled = data.get("filled", False)
 
-        Canvas().draw_lines(points, closed)
+        Canvas().draw_lines(points, closed, filled)
 
-        return True, f"Drew a {"" if closed else "non-"}closed set of lines through {points}"
+        if filled:
+            return True, f"Drew a filled polygon through {describe_points(points)}"
+        return True, f"Drew a {"" if closed else "non-"}closed set of lines through {describe_points(points)}"
 
 
 class DrawCurveAction(AbstractAction):
@@ -146,7 +153,12 @@ class DrawCurveAction(AbstractAction):
     @property
     @override
     def desc(self) -> str:
-        return "Draws a curve through \"points\"."
+        return (
+            "Draws a smooth curve. "
+            "With \"mode\" set to \"spline\" the curve passes through every one of \"points\". "
+            "With \"mode\" set to \"bezier\" (the default) the curve starts at the first point, ends at the last, "
+            "and is pulled towards the points in between."
+        )
 
     @property
     @override
@@ -174,6 +186,10 @@ class DrawCurveAction(AbstractAction):
                         }
                     },
                     "minItems": 3
+                },
+                "mode": {
+                    "type": "string",
+                    "enum": list(CURVE_MODES)
                 }
             }
         }
@@ -188,10 +204,11 @@ class DrawCurveAction(AbstractAction):
         assert data, "'data' was expected but was set to None"
 
         points = [(point["x"], point["y"]) for point in data["points"]]
+        mode = data.get("mode", "bezier")
 
-        Canvas().draw_curve(points, BEZIER_STEPS)
+        Canvas().draw_curve(points, mode)
 
-        return True, f"Drew a curve through {points}"
+        return True, f"Drew a curve through {describe_points(points)}"
 
 
 class DrawCircleAction(AbstractAction):
@@ -203,7 +220,10 @@ class DrawCircleAction(AbstractAction):
     @property
     @override
     def desc(self) -> str:
-        return "Draws a circle at \"center\" with radius \"radius\"."
+        return (
+            "Draws a circle at \"center\" with radius \"radius\". "
+            "If \"filled\" is true, the circle is filled with the brush color."
+        )
 
     @property
     @override
@@ -232,7 +252,8 @@ class DrawCircleAction(AbstractAction):
                     "type": "integer",
                     "exclusiveMinimum": 0,
                     "maximum": max(SCREEN_HEIGHT, SCREEN_WIDTH)
-                }
+                },
+                "filled": {"type": "boolean"}
             }
         }
 
@@ -247,10 +268,11 @@ class DrawCircleAction(AbstractAction):
 
         center = data["center"]["x"], data["center"]["y"]
         radius = data["radius"]
+        filled = data.get("filled", False)
 
-        Canvas().draw_circle(center, radius)
+        Canvas().draw_circle(center, radius, filled)
 
-        return True, f"Drew line at {center} with {radius = }"  # noqa: E202
+        return True, f"Drew {"filled " if filled else ""}circle at {center} with {radius = }"  # noqa: E202
 
 
 class DrawTriangleAction(AbstractAction):
@@ -266,7 +288,8 @@ class DrawTriangleAction(AbstractAction):
             "Draw an equilateral triangle. "
             "Use \"center\" to set the triangle's center. "
             "Use \"side_length\" to set the size of the triangle. "
-            "Use \"rotation\" to rotate the triangle."
+            "Use \"rotation\" to rotate the triangle. "
+            "Set \"filled\" to true to fill the triangle with the brush color."
         )
 
     @property
@@ -301,7 +324,8 @@ class DrawTriangleAction(AbstractAction):
                     "type": "number",
                     "minimum": 0,
                     "exclusiveMaximum": 120
-                }
+                },
+                "filled": {"type": "boolean"}
             }
         }
     
@@ -317,10 +341,12 @@ class DrawTriangleAction(AbstractAction):
         center = (data["center"]["x"], data["center"]["y"])
         side_length = data["side_length"]
         rotation = data["rotation"]
+        filled = data.get("filled", False)
 
-        Canvas().draw_triangle(center, side_length, rotation)
+        Canvas().draw_triangle(center, side_length, rotation, filled)
 
-        return True, (f"Drew triangle with center {center}, with side length {side_length}, "
+        return True, (f"Drew {"filled " if filled else ""}triangle with center {center}, "
+                      f"with side length {side_length}, "
                       f"and rotated {rotation} degrees.")
 
 
@@ -338,7 +364,9 @@ class DrawRectangleAction(AbstractAction):
             "\"left\" refers to the x position of the left side of the rectangle, "
             "\"top\" refers to the y position of the top side of the rectangle, "
             "\"width\" refers to the width of the rectangle, "
-            "and \"height\" refers to the height of the rectangle."
+            "and \"height\" refers to the height of the rectangle. "
+            "If \"filled\" is true, the rectangle is filled with the brush color. "
+            "\"rotation\" rotates the rectangle clockwise by that many degrees around its center."
         )
 
     @property
@@ -368,6 +396,12 @@ class DrawRectangleAction(AbstractAction):
                     "minimum": 0,
                     "maximum": SCREEN_WIDTH
                 },
+                "filled": {"type": "boolean"},
+                "rotation": {
+                    "type": "number",
+                    "minimum": 0,
+                    "exclusiveMaximum": 360
+                }
             }
         }
     
@@ -382,7 +416,179 @@ class DrawRectangleAction(AbstractAction):
 
         left_top = data["left"], data["top"]
         width_height = data["width"], data["height"]
+        filled = data.get("filled", False)
+        rotation = data.get("rotation", 0)
+
+        Canvas().draw_rectangle(left_top, width_height, filled, rotation)
+
+        return True, (f"Drew {"filled " if filled else ""}rectangle at {left_top} with dimensions {width_height}"
+                      f"{f", rotated {rotation} degrees" if rotation else ""}")
+
+
+class DrawRegularPolygonAction(AbstractAction):
+    @property
+    @override
+    def name(self) -> str:
+        return "draw_regular_polygon"
+
+    @property
+    @override
+    def desc(self) -> str:
+        return (
+            "Draws a regular polygon such as a square, pentagon or hexagon. "
+            "\"center\" sets the polygon's center, "
+            "\"radius\" sets the distance from the center to each corner, "
+            "\"sides\" sets the number of sides, "
+            "and \"rotation\" rotates it clockwise in degrees (with no rotation, one corner points straight up). "
+            "If \"filled\" is true, the polygon is filled with the brush color."
+        )
+
+    @property
+    @override
+    def schema(self) -> dict[str, object]:
+        return {
+            "type": "object",
+            "required": ["center", "radius", "sides"],
+            "properties": {
+                "center": {
+                    "type": "object",
+                    "required": ["x", "y"],
+                    "properties": {
+                        "x": {
+                            "type": "integer",
+                            "minimum": 0,
+                            "maximum": SCREEN_WIDTH
+                        },
+                        "y": {
+                            "type": "integer",
+                            "minimum": 0,
+                            "maximum": SCREEN_HEIGHT
+                        }
+                    }
+                },
+                "radius": {
+                    "type": "integer",
+                    "exclusiveMinimum": 0,
+                    "maximum": max(SCREEN_HEIGHT, SCREEN_WIDTH)
+                },
+                "sides": {
+                    "type": "integer",
+                    "minimum": 3,
+                    "maximum": 64
+                },
+                "rotation": {
+                    "type": "number",
+                    "minimum": 0,
+                    "exclusiveMaximum": 360
+                },
+                "filled": {"type": "boolean"}
+            }
+        }
+
+    @property
+    @override
+    def permission(self) -> str:
+        return "draw.polygon"
+
+    @override
+    async def perform_action(self, data: Optional[dict]) -> tuple[bool, Optional[str]]:
+        assert data, "'data' was expected but was set to None"
+
+        center = (data["center"]["x"], data["center"]["y"])
+        radius = data["radius"]
+        sides = data["sides"]
+        rotation = data.get("rotation", 0)
+        filled = data.get("filled", False)
+
+        Canvas().draw_regular_polygon(center, radius, sides, rotation, filled)
+
+        return True, (f"Drew {"filled " if filled else ""}{sides}-sided polygon with center {center}, "
+                      f"radius {radius}, rotated {rotation} degrees.")
+
+
+class DrawStarAction(AbstractAction):
+    @property
+    @override
+    def name(self) -> str:
+        return "draw_star"
+
+    @property
+    @override
+    def desc(self) -> str:
+        return (
+            "Draws a star. "
+            "\"center\" sets the star's center, "
+            "\"outer_radius\" sets the distance from the center to each tip, "
+            "\"inner_radius\" sets the distance from the center to the corners between the tips, "
+            "\"points\" sets the number of tips, "
+            "and \"rotation\" rotates it clockwise in degrees (with no rotation, one tip points straight up). "
+            "If \"filled\" is true, the star is filled with the brush color."
+        )
+
+    @property
+    @override
+    def schema(self) -> dict[str, object]:
+        return {
+            "type": "object",
+            "required": ["center", "outer_radius", "inner_radius", "points"],
+            "properties": {
+                "center": {
+                    "type": "object",
+                    "required": ["x", "y"],
+                    "properties": {
+                        "x": {
+                            "type": "integer",
+                            "minimum": 0,
+                            "maximum": SCREEN_WIDTH
+                        },
+                        "y": {
+                            "type": "integer",
+                            "minimum": 0,
+                            "maximum": SCREEN_HEIGHT
+                        }
+                    }
+                },
+                "outer_radius": {
+                    "type": "integer",
+                    "exclusiveMinimum": 0,
+                    "maximum": max(SCREEN_HEIGHT, SCREEN_WIDTH)
+                },
+                "inner_radius": {
+                    "type": "integer",
+                    "exclusiveMinimum": 0,
+                    "maximum": max(SCREEN_HEIGHT, SCREEN_WIDTH)
+                },
+                "points": {
+                    "type": "integer",
+                    "minimum": 2,
+                    "maximum": 32
+                },
+                "rotation": {
+                    "type": "number",
+                    "minimum": 0,
+                    "exclusiveMaximum": 360
+                },
+                "filled": {"type": "boolean"}
+            }
+        }
+
+    @property
+    @override
+    def permission(self) -> str:
+        return "draw.star"
+
+    @override
+    async def perform_action(self, data: Optional[dict]) -> tuple[bool, Optional[str]]:
+        assert data, "'data' was expected but was set to None"
+
+        center = (data["center"]["x"], data["center"]["y"])
+        outer_radius = data["outer_radius"]
+        inner_radius = data["inner_radius"]
+        points = data["points"]
+        rotation = data.get("rotation", 0)
+        filled = data.get("filled", False)
 
-        Canvas().draw_rectangle(left_top, width_height)
+        Canvas().draw_star(center, outer_radius, inner_radius, points, rotation, filled)
 
-        return True, f"Drew rectangle at {left_top} with dimensions {width_height}"
+        return True, (f"Drew {"filled " if filled else ""}{points}-pointed star with center {center}, "
+                      f"radii {outer_radius} and {inner_radius}, rotated {rotation} degrees.")
@@ -0,0 +1,294 @@
+from typing import Optional
+
+from ..canvas import Canvas
+from ..constants import SCREEN_WIDTH, SCREEN_HEIGHT
+from ._abc import AbstractAction, override
+
+ERASER_NOTE = (
+    "The eraser uses the brush width, stroke style and tip, and leaves the active layer transparent where it goes. "
+    "It doesn't work on vector layers; use erase_shape there."
+)
+
+
+class EraseLineAction(AbstractAction):
+    @property
+    @override
+    def name(self) -> str:
+        return "erase_line"
+
+    @property
+    @override
+    def desc(self) -> str:
+        return f"Erases along a straight line between two points, \"start\" and \"end\". {ERASER_NOTE}"
+
+    @property
+    @override
+    def schema(self) -> dict[str, object]:
+        return {
+            "type": "object",
+            "required": ["start", "end"],
+            "properties": {
+                "start": {
+                    "type": "object",
+                    "required": ["x", "y"],
+                    "properties": {
+                        "x": {
+                            "type": "integer",
+                            "minimum": 0,
+                            "maximum": SCREEN_WIDTH
+                        },
+                        "y": {
+                            "type": "integer",
+                            "minimum": 0,
+                            "maximum": SCREEN_HEIGHT
+                        }
+                    }
+                },
+                "end": {
+                    "type": "object",
+                    "required": ["x", "y"],
+                    "properties": {
+                        "x": {
+                            "type": "integer",
+                            "minimum": 0,
+                            "maximum": SCREEN_WIDTH
+                        },
+                        "y": {
+                            "type": "integer",
+                            "minimum": 0,
+                            "maximum": SCREEN_HEIGHT
+                        }
+                    }
+                }
+            }
+        }
+
+    @property
+    @override
+    def permission(self) -> str:
+        return "misc.eraser"
+
+    @override
+    async def perform_action(self, data: Optional[dict]) -> tuple[bool, Optional[str]]:
+        assert data, "'data' was expected but was set to None"
+
+        start = data["start"]["x"], data["start"]["y"]
+        end = data["end"]["x"], data["end"]["y"]
+
+        try:
+            Canvas().erase_line(start, end)
+        except ValueError as e:
+            return False, str(e)
+
+        return True, f"Erased line from {start} to {end}"
+
+
+class EraseLinesAction(AbstractAction):
+    @property
+    @override
+    def name(self) -> str:
+        return "erase_lines"
+
+    @property
+    @override
+    def desc(self) -> str:
+        return (
+            "Erases along a sequence of straight lines through \"points\". "
+            "If \"closed\" is true, also erases a final line connecting the first and last lines. "
+            f"If \"filled\" is true, the shape is always closed and its inside is erased too. {ERASER_NOTE}"
+        )
+
+    @property
+    @override
+    def schema(self) -> dict[str, object]:
+        return {
+            "type": "object",
+            "required": ["points", "closed"],
+            "properties": {
+                "points": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "required": ["x", "y"],
+                        "properties": {
+                            "x": {
+                                "type": "integer",
+                                "minimum": 0,
+                                "maximum": SCREEN_WIDTH
+                            },
+                            "y": {
+                                "type": "integer",
+                                "minimum": 0,
+                                "maximum": SCREEN_HEIGHT
+                            }
+                        }
+                    },
+                    "minItems": 3
+                },
+                "closed": {"type": "boolean"},
+                "filled": {"type": "boolean"}
+            }
+        }
+
+    @property
+    @override
+    def permission(self) -> str:
+        return "misc.eraser"
+
+    @override
+    async def perform_action(self, data: Optional[dict]) -> tuple[bool, Optional[str]]:
+        assert data, "'data' was expected but was set to None"
+
+        points = [(point["x"], point["y"]) for point in data["points"]]
+        closed = data["closed"]
+        filled = data.get("filled", False)
+
+        try:
+            Canvas().erase_lines(points, closed, filled)
+        except ValueError as e:
+            return False, str(e)
+
+        return True, f"Erased {"filled " if filled else ""}lines through {len(points)} points"  # noqa: E202
+
+
+class EraseCircleAction(AbstractAction):
+    @property
+    @override
+    def name(self) -> str:
+        return "erase_circle"
+
+    @property
+    @override
+    def desc(self) -> str:
+        return (
+            "Erases a circle at \"center\" with radius \"radius\". "
+            f"If \"filled\" is true, its inside is erased too. {ERASER_NOTE}"
+        )
+
+    @property
+    @override
+    def schema(self) -> dict[str, object]:
+        return {
+            "type": "object",
+            "required": ["center", "radius"],
+            "properties": {
+                "center": {
+                    "type": "object",
+                    "required": ["x", "y"],
+                    "properties": {
+                        "x": {
+                            "type": "integer",
+                            "minimum": 0,
+                            "maximum": SCREEN_WIDTH
+                        },
+                        "y": {
+                            "type": "integer",
+                            "minimum": 0,
+                            "maximum": SCREEN_HEIGHT
+                        }
+                    }
+                },
+                "radius": {
+                    "type": "integer",
+                    "exclusiveMinimum": 0,
+                    "maximum": max(SCREEN_HEIGHT, SCREEN_WIDTH)
+                },
+                "filled": {"type": "boolean"}
+            }
+        }
+
+    @property
+    @override
+    def permission(self) -> str:
+        return "misc.eraser"
+
+    @override
+    async def perform_action(self, data: Optional[dict]) -> tuple[bool, Optional[str]]:
+        assert data, "'data' was expected but was set to None"
+
+        center = data["center"]["x"], data["center"]["y"]
+        radius = data["radius"]
+        filled = data.get("filled", False)
+
+        try:
+            Canvas().erase_circle(center, radius, filled)
+        except ValueError as e:
+            return False, str(e)
+
+        return True, f"Erased {"filled " if filled else ""}circle at {center} with {radius = }"  # noqa: E202
+
+
+class EraseRectangleAction(AbstractAction):
+    @property
+    @override
+    def name(self) -> str:
+        return "erase_rectangle"
+
+    @property
+    @override
+    def desc(self) -> str:
+        return (
+            "Erases a rectangle. "
+            "\"left\" and \"top\" are the x position of its left side and the y position of its top side, "
+            "and \"width\" and \"height\" are its size. "
+            "If \"filled\" is true, its inside is erased too. "
+            f"\"rotation\" rotates the rectangle clockwise by that many degrees around its center. {ERASER_NOTE}"
+        )
+
+    @property
+    @override
+    def schema(self) -> dict[str, object]:
+        return {
+            "type": "object",
+            "required": ["left", "top", "width", "height"],
+            "properties": {
+                "left": {
+                    "type": "integer",
+                    "minimum": 0,
+                    "maximum": SCREEN_WIDTH
+                },
+                "top": {
+                    "type": "integer",
+                    "minimum": 0,
+                    "maximum": SCREEN_HEIGHT
+                },
+                "width": {
+                    "type": "integer",
+                    "minimum": 0,
+                    "maximum": SCREEN_WIDTH
+                },
+                "height": {
+                    "type": "integer",
+                    "minimum": 0,
+                    "maximum": SCREEN_WIDTH
+                },
+                "filled": {"type": "boolean"},
+                "rotation": {
+                    "type": "number",
+                    "minimum": 0,
+                    "exclusiveMaximum": 360
+                }
+            }
+        }
+
+    @property
+    @override
+    def permission(self) -> str:
+        return "misc.eraser"
+
+    @override
+    async def perform_action(self, data: Optional[dict]) -> tuple[bool, Optional[str]]:
+        assert data, "'data' was expected but was set to None"
+
+        left_top = data["left"], data["top"]
+        width_height = data["width"], data["height"]
+        filled = data.get("filled", False)
+        rotation = data.get("rotation", 0)
+
+        try:
+            Canvas().erase_rectangle(left_top, width_height, filled, rotation)
+        except ValueError as e:
+            return False, str(e)
+
+        return True, (f"Erased {"filled " if filled else ""}rectangle at {left_top} with dimensions {width_height}"
+                      f"{f", rotated {rotation} degrees" if rotation else ""}")
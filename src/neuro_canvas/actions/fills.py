@@ -0,0 +1,173 @@
+from typing import Optional
+
+from ..canvas import Canvas
+from ..constants import COLORS, SCREEN_WIDTH, SCREEN_HEIGHT
+from ..fills import FILL_TARGETS, GRADIENT_KINDS, PATTERN_KINDS
+from ._abc import AbstractAction, override
+
+# Widest square, stripe or tile a pattern can have
+MAX_PATTERN_SIZE = 200
+
+
+def _point_schema() -> dict[str, object]:
+    return {
+        "type": "object",
+        "required": ["x", "y"],
+        "properties": {
+            "x": {
+                "type": "integer",
+                "minimum": 0,
+                "maximum": SCREEN_WIDTH
+            },
+            "y": {
+                "type": "integer",
+                "minimum": 0,
+                "maximum": SCREEN_HEIGHT
+            }
+        }
+    }
+
+
+def _target_schema() -> dict[str, object]:
+    return {
+        "type": "string",
+        "enum": list(FILL_TARGETS)
+    }
+
+
+class FillGradientAction(AbstractAction):
+    @property
+    @override
+    def name(self) -> str:
+        return "fill_gradient"
+
+    @property
+    @override
+    def desc(self) -> str:
+        return (
+            "Paints a smooth gradient in one go. A \"linear\" gradient changes colour along the line from \"start\" "
+            "to \"end\"; a \"radial\" one is centred on \"start\" and reaches its last colour at \"end\". "
+            "\"stops\" are the colours, each at a \"position\" from 0 (start) to 100 (end). "
+            "\"target\" is the active layer (default), the background, or the selection on the active layer."
+        )
+
+    @property
+    @override
+    def schema(self) -> dict[str, object]:
+        return {
+            "type": "object",
+            "required": ["kind", "start", "end", "stops"],
+            "properties": {
+                "kind": {
+                    "type": "string",
+                    "enum": list(GRADIENT_KINDS)
+                },
+                "start": _point_schema(),
+                "end": _point_schema(),
+                "stops": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "required": ["color", "position"],
+                        "properties": {
+                            "color": {
+                                "type": "string",
+                                "enum": list(COLORS.keys())
+                            },
+                            "position": {
+                                "type": "integer",
+                                "minimum": 0,
+                                "maximum": 100
+                            }
+                        }
+                    },
+                    "minItems": 2
+                },
+                "target": _target_schema()
+            }
+        }
+
+    @property
+    @override
+    def permission(self) -> str:
+        return "misc.fill"
+
+    @override
+    async def perform_action(self, data: Optional[dict]) -> tuple[bool, Optional[str]]:
+        assert data, "'data' was expected but was set to None"
+
+        kind = data["kind"]
+        start = data["start"]["x"], data["start"]["y"]
+        end = data["end"]["x"], data["end"]["y"]
+        stops = [(stop["position"] / 100, COLORS[stop["color"]]) for stop in data["stops"]]
+        target = data.get("target", "layer")
+
+        try:
+            Canvas().fill_gradient(kind, start, end, stops, target)
+        except ValueError as e:
+            return False, str(e)
+
+        colors = ", ".join(stop["color"] for stop in data["stops"])
+        return True, f"Filled the {target} with a {kind} gradient of {colors} from {start} to {end}"
+
+
+class FillPatternAction(AbstractAction):
+    @property
+    @override
+    def name(self) -> str:
+        return "fill_pattern"
+
+    @property
+    @override
+    def desc(self) -> str:
+        return (
+            "Paints a repeating pattern in the brush colour in one go. \"size\" is the width of a square or stripe, "
+            "or the spacing of dots and grid lines. The gaps are painted \"other_color\", or left as they are if it "
+            "isn't given. \"target\" is the active layer (default), the background, or the selection on the active "
+            "layer."
+        )
+
+    @property
+    @override
+    def schema(self) -> dict[str, object]:
+        return {
+            "type": "object",
+            "required": ["pattern"],
+            "properties": {
+                "pattern": {
+                    "type": "string",
+                    "enum": list(PATTERN_KINDS)
+                },
+                "other_color": {
+                    "type": "string",
+                    "enum": list(COLORS.keys())
+                },
+                "size": {
+                    "type": "integer",
+                    "minimum": 2,
+                    "maximum": MAX_PATTERN_SIZE
+                },
+                "target": _target_schema()
+            }
+        }
+
+    @property
+    @override
+    def permission(self) -> str:
+        return "misc.fill"
+
+    @override
+    async def perform_action(self, data: Optional[dict]) -> tuple[bool, Optional[str]]:
+        assert data, "'data' was expected but was set to None"
+
+        kind = data["pattern"]
+        other_color = COLORS[data["other_color"]] if "other_color" in data else None
+        size = data.get("size", 16)
+        target = data.get("target", "layer")
+
+        try:
+            Canvas().fill_pattern(kind, other_color, size, target)
+        except ValueError as e:
+            return False, str(e)
+
+        return True, f"Filled the {target} with a {kind.replace("_", " ")} pattern of size {size}"
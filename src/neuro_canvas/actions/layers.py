@@ -1,6 +1,11 @@
 from typing import Optional
+from collections.abc import Hashable
 from ..canvas import Canvas
-from ._abc import AbstractAction, override
+from ..compositor import BLEND_MODES
+from ..transforms import TRANSFORM_QUALITIES
+from ..workers import run_off_loop
+from ._availability import has_custom_layers, has_mergeable_layers, mergeable_layers
+from ._abc import AbstractAction, layer_name_schema, override
 
 
 class AddLayerAction(AbstractAction):
@@ -12,7 +17,10 @@ class AddLayerAction(AbstractAction):
     @property
     @override
     def desc(self) -> str:
-        return "Adds a new layer with the specified name."
+        return (
+            "Adds a new layer with the specified name. A vector layer keeps the shapes you draw on it, so they stay "
+            "sharp when exported at a larger scale or as SVG, but bucket fills and selections don't work on it."
+        )
 
     @property
     @override
@@ -21,14 +29,15 @@ class AddLayerAction(AbstractAction):
             "type": "object",
             "required": ["name"],
             "properties": {
-                "name": {"type": "string"}
+                "name": {"type": "string"},
+                "vector": {"type": "boolean"}
             }
         }
     
     @property
     @override
     def permission(self) -> str:
-        return 'layers'
+        return 'layers.custom'
 
     @override
     async def perform_action(self, data: Optional[dict]) -> tuple[bool, Optional[str]]:
@@ -37,8 +46,9 @@ class AddLayerAction(AbstractAction):
         canvas = Canvas()
         if canvas.layer_exists(layer_name):
             return False, f"Layer '{layer_name}' already exists."
-        canvas.add_layer(layer_name)
-        return True, f"Added layer: {layer_name}"
+        vector = data.get("vector", False)
+        canvas.add_layer(layer_name, vector)
+        return True, f"Added {'vector ' if vector else ''}layer: {layer_name}"
 
 
 class RemoveLayerAction(AbstractAction):
@@ -59,14 +69,18 @@ class RemoveLayerAction(AbstractAction):
             "type": "object",
             "required": ["name"],
             "properties": {
-                "name": {"type": "string"}
+                "name": layer_name_schema(("base", "background"))
             }
         }
     
     @property
     @override
     def permission(self) -> str:
-        return 'layers'
+        return 'layers.custom'
+
+    @override
+    def available(self) -> bool:
+        return has_custom_layers()
 
     @override
     async def perform_action(self, data: Optional[dict]) -> tuple[bool, Optional[str]]:
@@ -99,7 +113,7 @@ class SetLayerVisibilityAction(AbstractAction):
             "type": "object",
             "required": ["name", "visibility"],
             "properties": {
-                "name": {"type": "string"},
+                "name": layer_name_schema(("background",)),
                 "visibility": {
                     "type": "number",
                     "minimum": 0,
@@ -111,7 +125,12 @@ class SetLayerVisibilityAction(AbstractAction):
     @property
     @override
     def permission(self) -> str:
-        return 'layers'
+        return 'layers.custom'
+
+    @override
+    def coalesce_key(self, data: Optional[dict]) -> Optional[Hashable]:
+        assert data is not None, "'data' was expected but was set to None"
+        return ("layer_visibility", data["name"])
 
     @override
     async def perform_action(self, data: Optional[dict]) -> tuple[bool, Optional[str]]:
@@ -145,14 +164,22 @@ class SwitchActiveLayerAction(AbstractAction):
             "type": "object",
             "required": ["name"],
             "properties": {
-                "name": {"type": "string"}
+                "name": layer_name_schema(("background",))
             }
         }
     
     @property
     @override
     def permission(self) -> str:
-        return 'layers'
+        return 'layers.custom'
+
+    @override
+    def coalesce_key(self, data: Optional[dict]) -> Optional[Hashable]:
+        return ("active_layer",)
+
+    @override
+    def available(self) -> bool:
+        return has_custom_layers()
 
     @override
     async def perform_action(self, data: Optional[dict]) -> tuple[bool, Optional[str]]:
@@ -165,3 +192,461 @@ class SwitchActiveLayerAction(AbstractAction):
             return False, f"Cannot switch to layer '{layer_name}'."
         canvas.switch_active_layer(layer_name)
         return True, f"Switched active layer to: {layer_name}"
+
+
+class SetLayerBlendModeAction(AbstractAction):
+    @property
+    @override
+    def name(self) -> str:
+        return "set_layer_blend_mode"
+
+    @property
+    @override
+    def desc(self) -> str:
+        return (
+            "Sets how the colors of the specified layer combine with the layers below it. "
+            "\"normal\" paints over them, \"multiply\" darkens like layered ink, \"screen\" lightens, "
+            "\"add\" brightens like light, and \"overlay\" boosts contrast."
+        )
+
+    @property
+    @override
+    def schema(self) -> dict[str, object]:
+        return {
+            "type": "object",
+            "required": ["name", "mode"],
+            "properties": {
+                "name": layer_name_schema(("background",)),
+                "mode": {
+                    "type": "string",
+                    "enum": list(BLEND_MODES)
+                }
+            }
+        }
+
+    @property
+    @override
+    def permission(self) -> str:
+        return 'layers.custom'
+
+    @override
+    def coalesce_key(self, data: Optional[dict]) -> Optional[Hashable]:
+        assert data is not None, "'data' was expected but was set to None"
+        return ("layer_blend_mode", data["name"])
+
+    @override
+    async def perform_action(self, data: Optional[dict]) -> tuple[bool, Optional[str]]:
+        assert data is not None, "'data' was expected but was set to None"
+        layer_name = data["name"]
+        if layer_name == "background":
+            return False, "Can't change background layer blend mode"
+        mode = data["mode"]
+        try:
+            Canvas().set_layer_blend_mode(layer_name, mode)
+            return True, f"Set blend mode of layer '{layer_name}' to {mode}"
+        except ValueError as e:
+            return False, str(e)
+
+
+class MoveLayerAction(AbstractAction):
+    @property
+    @override
+    def name(self) -> str:
+        return "move_layer"
+
+    @property
+    @override
+    def desc(self) -> str:
+        return (
+            "Moves the specified layer to a position in the layer stack. "
+            "Position 0 is directly above the background; larger positions are drawn on top."
+        )
+
+    @property
+    @override
+    def schema(self) -> dict[str, object]:
+        return {
+            "type": "object",
+            "required": ["name", "position"],
+            "properties": {
+                "name": layer_name_schema(("background",)),
+                "position": {
+                    "type": "integer",
+                    "minimum": 0
+                }
+            }
+        }
+
+    @property
+    @override
+    def permission(self) -> str:
+        return 'layers.custom'
+
+    @override
+    def available(self) -> bool:
+        return has_custom_layers()
+
+    @override
+    async def perform_action(self, data: Optional[dict]) -> tuple[bool, Optional[str]]:
+        assert data is not None, "'data' was expected but was set to None"
+        layer_name = data["name"]
+        position = data["position"]
+        try:
+            Canvas().move_layer(layer_name, position)
+            return True, f"Moved layer '{layer_name}' to position {position}"
+        except ValueError as e:
+            return False, str(e)
+
+
+class ReorderLayersAction(AbstractAction):
+    @property
+    @override
+    def name(self) -> str:
+        return "reorder_layers"
+
+    @property
+    @override
+    def desc(self) -> str:
+        return (
+            "Rearranges all layers except the background. "
+            "List every layer exactly once, from the bottom to the top."
+        )
+
+    @property
+    @override
+    def schema(self) -> dict[str, object]:
+        return {
+            "type": "object",
+            "required": ["order"],
+            "properties": {
+                "order": {
+                    "type": "array",
+                    "items": layer_name_schema(("background",))
+                }
+            }
+        }
+
+    @property
+    @override
+    def permission(self) -> str:
+        return 'layers.custom'
+
+    @override
+    def available(self) -> bool:
+        return has_custom_layers()
+
+    @override
+    async def perform_action(self, data: Optional[dict]) -> tuple[bool, Optional[str]]:
+        assert data is not None, "'data' was expected but was set to None"
+        order = data["order"]
+        try:
+            Canvas().reorder_layers(order)
+            return True, f"Reordered layers: {', '.join(order)}"
+        except ValueError as e:
+            return False, str(e)
+
+
+class MergeDownAction(AbstractAction):
+    @property
+    @override
+    def name(self) -> str:
+        return "merge_down"
+
+    @property
+    @override
+    def desc(self) -> str:
+        return (
+            "Merges the specified layer into the layer directly below it, keeping how it looks. "
+            "The merged layer is removed afterwards."
+        )
+
+    @property
+    @override
+    def schema(self) -> dict[str, object]:
+        return {
+            "type": "object",
+            "required": ["name"],
+            "properties": {
+                "name": {"type": "string", "enum": mergeable_layers()}
+            }
+        }
+
+    @property
+    @override
+    def permission(self) -> str:
+        return 'layers.custom'
+
+    @override
+    def available(self) -> bool:
+        return has_mergeable_layers()
+
+    @override
+    async def perform_action(self, data: Optional[dict]) -> tuple[bool, Optional[str]]:
+        assert data is not None, "'data' was expected but was set to None"
+        layer_name = data["name"]
+        try:
+            below = await run_off_loop(Canvas().merge_down, layer_name)
+            return True, f"Merged layer '{layer_name}' into '{below}'"
+        except ValueError as e:
+            return False, str(e)
+
+
+class FlattenVisibleAction(AbstractAction):
+    @property
+    @override
+    def name(self) -> str:
+        return "flatten_visible"
+
+    @property
+    @override
+    def desc(self) -> str:
+        return (
+            "Merges all visible layers above the background into a single layer, "
+            "which is 'base' if it is visible. Hidden layers are kept."
+        )
+
+    @property
+    @override
+    def schema(self) -> dict[str, object]:
+        return {}
+
+    @property
+    @override
+    def permission(self) -> str:
+        return 'layers.custom'
+
+    @override
+    async def perform_action(self, data: Optional[dict]) -> tuple[bool, Optional[str]]:
+        try:
+            layer_name = await run_off_loop(Canvas().flatten_visible)
+            return True, f"Flattened visible layers into '{layer_name}'"
+        except ValueError as e:
+            return False, str(e)
+
+
+class DuplicateLayerAction(AbstractAction):
+    @property
+    @override
+    def name(self) -> str:
+        return "duplicate_layer"
+
+    @property
+    @override
+    def desc(self) -> str:
+        return "Copies the specified layer to a new layer with the given name, directly above it."
+
+    @property
+    @override
+    def schema(self) -> dict[str, object]:
+        return {
+            "type": "object",
+            "required": ["name", "new_name"],
+            "properties": {
+                "name": layer_name_schema(),
+                "new_name": {"type": "string"}
+            }
+        }
+
+    @property
+    @override
+    def permission(self) -> str:
+        return 'layers.custom'
+
+    @override
+    async def perform_action(self, data: Optional[dict]) -> tuple[bool, Optional[str]]:
+        assert data is not None, "'data' was expected but was set to None"
+        layer_name = data["name"]
+        new_name = data["new_name"]
+        try:
+            Canvas().duplicate_layer(layer_name, new_name)
+            return True, f"Duplicated layer '{layer_name}' as '{new_name}'"
+        except ValueError as e:
+            return False, str(e)
+
+
+class TranslateLayerAction(AbstractAction):
+    @property
+    @override
+    def name(self) -> str:
+        return "translate_layer"
+
+    @property
+    @override
+    def desc(self) -> str:
+        return "Moves everything drawn on the specified layer by the given number of pixels."
+
+    @property
+    @override
+    def schema(self) -> dict[str, object]:
+        return {
+            "type": "object",
+            "required": ["name", "dx", "dy"],
+            "properties": {
+                "name": layer_name_schema(("background",)),
+                "dx": {"type": "integer"},
+                "dy": {"type": "integer"}
+            }
+        }
+
+    @property
+    @override
+    def permission(self) -> str:
+        return 'layers.custom'
+
+    @override
+    async def perform_action(self, data: Optional[dict]) -> tuple[bool, Optional[str]]:
+        assert data is not None, "'data' was expected but was set to None"
+        layer_name = data["name"]
+        dx, dy = data["dx"], data["dy"]
+        try:
+            await run_off_loop(Canvas().translate_layer, layer_name, dx, dy)
+            return True, f"Moved layer '{layer_name}' by ({dx}, {dy})"
+        except ValueError as e:
+            return False, str(e)
+
+
+class ScaleLayerAction(AbstractAction):
+    @property
+    @override
+    def name(self) -> str:
+        return "scale_layer"
+
+    @property
+    @override
+    def desc(self) -> str:
+        return (
+            "Resizes everything drawn on the specified layer about its center. "
+            "\"nearest\" keeps hard pixel edges, \"smooth\" (the default) blends them."
+        )
+
+    @property
+    @override
+    def schema(self) -> dict[str, object]:
+        return {
+            "type": "object",
+            "required": ["name", "scale_x", "scale_y"],
+            "properties": {
+                "name": layer_name_schema(("background",)),
+                "scale_x": {
+                    "type": "number",
+                    "exclusiveMinimum": 0,
+                    "maximum": 10
+                },
+                "scale_y": {
+                    "type": "number",
+                    "exclusiveMinimum": 0,
+                    "maximum": 10
+                },
+                "quality": {
+                    "type": "string",
+                    "enum": list(TRANSFORM_QUALITIES)
+                }
+            }
+        }
+
+    @property
+    @override
+    def permission(self) -> str:
+        return 'layers.custom'
+
+    @override
+    async def perform_action(self, data: Optional[dict]) -> tuple[bool, Optional[str]]:
+        assert data is not None, "'data' was expected but was set to None"
+        layer_name = data["name"]
+        scale_x, scale_y = data["scale_x"], data["scale_y"]
+        try:
+            await run_off_loop(Canvas().scale_layer, layer_name, scale_x, scale_y, data.get("quality", "smooth"))
+            return True, f"Scaled layer '{layer_name}' by ({scale_x}, {scale_y})"
+        except ValueError as e:
+            return False, str(e)
+
+
+class RotateLayerAction(AbstractAction):
+    @property
+    @override
+    def name(self) -> str:
+        return "rotate_layer"
+
+    @property
+    @override
+    def desc(self) -> str:
+        return (
+            "Rotates everything drawn on the specified layer clockwise about its center. "
+            "\"nearest\" keeps hard pixel edges, \"smooth\" (the default) blends them."
+        )
+
+    @property
+    @override
+    def schema(self) -> dict[str, object]:
+        return {
+            "type": "object",
+            "required": ["name", "angle"],
+            "properties": {
+                "name": layer_name_schema(("background",)),
+                "angle": {
+                    "type": "number",
+                    "minimum": 0,
+                    "exclusiveMaximum": 360
+                },
+                "quality": {
+                    "type": "string",
+                    "enum": list(TRANSFORM_QUALITIES)
+                }
+            }
+        }
+
+    @property
+    @override
+    def permission(self) -> str:
+        return 'layers.custom'
+
+    @override
+    async def perform_action(self, data: Optional[dict]) -> tuple[bool, Optional[str]]:
+        assert data is not None, "'data' was expected but was set to None"
+        layer_name = data["name"]
+        angle = data["angle"]
+        try:
+            await run_off_loop(Canvas().rotate_layer, layer_name, angle, data.get("quality", "smooth"))
+            return True, f"Rotated layer '{layer_name}' by {angle} degrees"
+        except ValueError as e:
+            return False, str(e)
+
+
+class FlipLayerAction(AbstractAction):
+    @property
+    @override
+    def name(self) -> str:
+        return "flip_layer"
+
+    @property
+    @override
+    def desc(self) -> str:
+        return "Mirrors everything drawn on the specified layer horizontally, vertically or both."
+
+    @property
+    @override
+    def schema(self) -> dict[str, object]:
+        return {
+            "type": "object",
+            "required": ["name", "horizontal", "vertical"],
+            "properties": {
+                "name": layer_name_schema(("background",)),
+                "horizontal": {"type": "boolean"},
+                "vertical": {"type": "boolean"}
+            }
+        }
+
+    @property
+    @override
+    def permission(self) -> str:
+        return 'layers.custom'
+
+    @override
+    async def perform_action(self, data: Optional[dict]) -> tuple[bool, Optional[str]]:
+        assert data is not None, "'data' was expected but was set to None"
+        layer_name = data["name"]
+        try:
+            await run_off_loop(Canvas().flip_layer, layer_name, data["horizontal"], data["vertical"])
+            return True, f"Flipped layer '{layer_name}'"
+        except ValueError as e:
+            return False, str(e)
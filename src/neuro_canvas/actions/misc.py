@@ -1,12 +1,17 @@
+from functools import partial
 from typing import Optional
 
 import pygame
 
 from ..canvas import Canvas
 from ..constants import SCREEN_HEIGHT, SCREEN_WIDTH
+from ..workers import run_off_loop
+from ._availability import can_undo
 from ._abc import AbstractAction, override
 
 DEFAULT_FILETYPE: str = "jpg"
+# Exports at a larger scale are rendered from scratch, so memory is only needed while exporting
+MAX_EXPORT_SCALE: int = 8
 
 
 class BucketFillAction(AbstractAction):
@@ -52,8 +57,11 @@ class BucketFillAction(AbstractAction):
         assert data, "'data' was expected but was set to None"
         x = data["x"]
         y = data["y"]
-        Canvas().bucket_fill((x, y))
-        return True, f"Bucket filled at {(x, y)}"
+        try:
+            await run_off_loop(Canvas().bucket_fill, (x, y))
+            return True, f"Bucket filled at {(x, y)}"
+        except ValueError as e:
+            return False, str(e)
 
 
 class UndoAction(AbstractAction):
@@ -77,9 +85,13 @@ class UndoAction(AbstractAction):
     def permission(self) -> str:
         return "misc.undo"
 
+    @override
+    def available(self) -> bool:
+        return can_undo()
+
     @override
     async def perform_action(self, data: Optional[dict]) -> tuple[bool, Optional[str]]:
-        if Canvas().undo():
+        if await run_off_loop(Canvas().undo):
             return True, "Performed undo"
         else:
             return False, "There is nothing to undo"
@@ -96,7 +108,8 @@ class ExportAction(AbstractAction):
     def desc(self) -> str:
         return (
             "Saves your drawing. Do not include the file extension in the filename when using this action. "
-            f"Defaults to {DEFAULT_FILETYPE} when filetype is not provided."
+            f"Defaults to {DEFAULT_FILETYPE} when filetype is not provided. Scale enlarges the image, keeping "
+            "shapes on vector layers sharp; svg keeps them as shapes."
         )
 
     @property
@@ -108,7 +121,12 @@ class ExportAction(AbstractAction):
                 "filename": {"type": "string"},
                 "filetype": {
                     "type": "string",
-                    "enum": ["bmp", "tga", "png", "jpg"]
+                    "enum": ["bmp", "tga", "png", "jpg", "svg"]
+                },
+                "scale": {
+                    "type": "integer",
+                    "minimum": 1,
+                    "maximum": MAX_EXPORT_SCALE
                 }
             },
             "required": ["filename"]
@@ -123,10 +141,11 @@ class ExportAction(AbstractAction):
     async def perform_action(self, data: Optional[dict]) -> tuple[bool, Optional[str]]:
         assert data, "'data' was expected but was set to None"
         filename = data["filename"]
-        filetype = data["filetype"]
+        filetype = data.get("filetype", DEFAULT_FILETYPE)
+        scale = data.get("scale", 1)
 
         try:
-            Canvas().export(filename, filetype)
+            await run_off_loop(partial(Canvas().export, scale=scale), filename, filetype)
             return True, f"Drawing saved as {filename}.{filetype}"
-        except pygame.error as e:
+        except (pygame.error, OSError) as e:
             return False, f"Saving failed. '{filename}' is likely not a valid filename. Error: {str(e)}"
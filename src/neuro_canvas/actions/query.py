@@ -0,0 +1,238 @@
+from typing import Optional
+
+from pygame import Rect
+import pygame
+
+from ..canvas import Canvas
+from ..constants import SCREEN_WIDTH, SCREEN_HEIGHT
+from ._availability import has_shapes
+from ._abc import AbstractAction, layer_name_schema, override
+
+
+def _hex(color: pygame.Color) -> str:
+    return f"#{color.r:02x}{color.g:02x}{color.b:02x}"
+
+
+class ListLayersAction(AbstractAction):
+    @property
+    @override
+    def name(self) -> str:
+        return "list_layers"
+
+    @property
+    @override
+    def desc(self) -> str:
+        return (
+            "Lists all layers from the bottom up, with their visibility, blend mode "
+            "and the area that has been drawn on."
+        )
+
+    @property
+    @override
+    def schema(self) -> dict[str, object]:
+        return {}
+
+    @property
+    @override
+    def permission(self) -> str:
+        return "query"
+
+    @override
+    async def perform_action(self, data: Optional[dict]) -> tuple[bool, Optional[str]]:
+        lines = []
+        for info in Canvas().get_layers_info():
+            bounds = info["bounds"]
+            drawn = "empty" if bounds is None else f"drawn from {bounds.topleft} to {bounds.bottomright}"
+            active = ", active" if info["active"] else ""
+            lines.append(
+                f"{info['position']}. {info['name']}: visibility {info['opacity']:g}, "
+                f"{info['blend_mode']}, {drawn}{active}"
+            )
+        return True, "\n".join(lines)
+
+
+class GetPixelColorAction(AbstractAction):
+    @property
+    @override
+    def name(self) -> str:
+        return "get_pixel_color"
+
+    @property
+    @override
+    def desc(self) -> str:
+        return (
+            "Tells you the colour of a pixel as it appears on the canvas, "
+            "or on a single layer if \"layer\" is given."
+        )
+
+    @property
+    @override
+    def schema(self) -> dict[str, object]:
+        return {
+            "type": "object",
+            "required": ["x", "y"],
+            "properties": {
+                "x": {
+                    "type": "integer",
+                    "minimum": 0,
+                    "exclusiveMaximum": SCREEN_WIDTH
+                },
+                "y": {
+                    "type": "integer",
+                    "minimum": 0,
+                    "exclusiveMaximum": SCREEN_HEIGHT
+                },
+                "layer": layer_name_schema()
+            }
+        }
+
+    @property
+    @override
+    def permission(self) -> str:
+        return "query"
+
+    @override
+    async def perform_action(self, data: Optional[dict]) -> tuple[bool, Optional[str]]:
+        assert data is not None, "'data' was expected but was set to None"
+        point = (data["x"], data["y"])
+        layer_name = data.get("layer")
+        try:
+            color = Canvas().get_pixel_color(point, layer_name)
+        except ValueError as e:
+            return False, str(e)
+        if layer_name is None:
+            return True, f"The pixel at {point} is {_hex(color)}"
+        if color.a == 0:
+            return True, f"The pixel at {point} on layer '{layer_name}' is transparent"
+        return True, f"The pixel at {point} on layer '{layer_name}' is {_hex(color)} with alpha {color.a}"
+
+
+class DescribeRegionAction(AbstractAction):
+    @property
+    @override
+    def name(self) -> str:
+        return "describe_region"
+
+    @property
+    @override
+    def desc(self) -> str:
+        return (
+            "Tells you how much of an area has been drawn on and its most common colours. "
+            "Leave out the area to describe the whole canvas, and give \"layer\" to only look at one layer."
+        )
+
+    @property
+    @override
+    def schema(self) -> dict[str, object]:
+        return {
+            "type": "object",
+            "properties": {
+                "left": {
+                    "type": "integer",
+                    "minimum": 0,
+                    "maximum": SCREEN_WIDTH
+                },
+                "top": {
+                    "type": "integer",
+                    "minimum": 0,
+                    "maximum": SCREEN_HEIGHT
+                },
+                "width": {
+                    "type": "integer",
+                    "minimum": 1,
+                    "maximum": SCREEN_WIDTH
+                },
+                "height": {
+                    "type": "integer",
+                    "minimum": 1,
+                    "maximum": SCREEN_HEIGHT
+                },
+                "layer": layer_name_schema()
+            }
+        }
+
+    @property
+    @override
+    def permission(self) -> str:
+        return "query"
+
+    @override
+    async def perform_action(self, data: Optional[dict]) -> tuple[bool, Optional[str]]:
+        data = data or {}
+        area = None
+        if all(key in data for key in ("left", "top", "width", "height")):
+            area = Rect(data["left"], data["top"], data["width"], data["height"])
+        try:
+            summary = Canvas().describe_region(area, data.get("layer"))
+        except ValueError as e:
+            return False, str(e)
+
+        if not summary.colors:
+            return True, "Nothing has been drawn there"
+        colors = ", ".join(f"{_hex(color)} ({share:.0%})" for color, share in summary.colors)
+        return True, f"{summary.coverage:.0%} drawn on. Most common colours: {colors}"
+
+
+class FindShapeAction(AbstractAction):
+    @property
+    @override
+    def name(self) -> str:
+        return "find_shape"
+
+    @property
+    @override
+    def desc(self) -> str:
+        return (
+            "Tells you which shape on a vector layer is drawn at a point, the topmost visible one unless \"layer\" "
+            "is given. Use its number to erase or recolour just that shape."
+        )
+
+    @property
+    @override
+    def schema(self) -> dict[str, object]:
+        return {
+            "type": "object",
+            "required": ["x", "y"],
+            "properties": {
+                "x": {
+                    "type": "integer",
+                    "minimum": 0,
+                    "exclusiveMaximum": SCREEN_WIDTH
+                },
+                "y": {
+                    "type": "integer",
+                    "minimum": 0,
+                    "exclusiveMaximum": SCREEN_HEIGHT
+                },
+                "layer": layer_name_schema()
+            }
+        }
+
+    @property
+    @override
+    def permission(self) -> str:
+        return "query"
+
+    @override
+    def available(self) -> bool:
+        return has_shapes()
+
+    @override
+    async def perform_action(self, data: Optional[dict]) -> tuple[bool, Optional[str]]:
+        assert data is not None, "'data' was expected but was set to None"
+        point = (data["x"], data["y"])
+        canvas = Canvas()
+        try:
+            found = canvas.find_shape(point, data.get("layer"))
+        except ValueError as e:
+            return False, str(e)
+        if found is None:
+            return True, f"There is no shape at {point}"
+
+        layer_name, shape = found
+        info = canvas.get_shape_info(layer_name, shape)
+        bounds = info["bounds"]
+        return True, (
+            f"Shape {shape} on layer '{layer_name}': {info['kind']} in {_hex(info['color'])}, "
+            f"from {bounds.topleft} to {bounds.bottomright}"
+        )
@@ -0,0 +1,457 @@
+from typing import Optional
+
+from ..canvas import Canvas
+from ..constants import SCREEN_WIDTH, SCREEN_HEIGHT
+from ..selection import SELECTION_MODES
+from ..transforms import TRANSFORM_QUALITIES
+from ..workers import run_off_loop
+from ._availability import has_clipboard, has_selection
+from ._abc import AbstractAction, override
+
+MODE_DESC = (
+    "\"mode\" decides how it combines with the current selection: \"replace\" (the default), \"add\", "
+    "\"subtract\" or \"intersect\"."
+)
+
+
+class SelectRectangleAction(AbstractAction):
+    @property
+    @override
+    def name(self) -> str:
+        return "select_rectangle"
+
+    @property
+    @override
+    def desc(self) -> str:
+        return (
+            "Selects a rectangular area of the canvas. Filling, clearing, copying and transforming only affect "
+            "the selection. " + MODE_DESC
+        )
+
+    @property
+    @override
+    def schema(self) -> dict[str, object]:
+        return {
+            "type": "object",
+            "required": ["left", "top", "width", "height"],
+            "properties": {
+                "left": {
+                    "type": "integer",
+                    "minimum": 0,
+                    "maximum": SCREEN_WIDTH
+                },
+                "top": {
+                    "type": "integer",
+                    "minimum": 0,
+                    "maximum": SCREEN_HEIGHT
+                },
+                "width": {
+                    "type": "integer",
+                    "minimum": 0,
+                    "maximum": SCREEN_WIDTH
+                },
+                "height": {
+                    "type": "integer",
+                    "minimum": 0,
+                    "maximum": SCREEN_HEIGHT
+                },
+                "mode": {
+                    "type": "string",
+                    "enum": list(SELECTION_MODES)
+                }
+            }
+        }
+
+    @property
+    @override
+    def permission(self) -> str:
+        return "selection"
+
+    @override
+    async def perform_action(self, data: Optional[dict]) -> tuple[bool, Optional[str]]:
+        assert data is not None, "'data' was expected but was set to None"
+        left_top = (data["left"], data["top"])
+        width_height = (data["width"], data["height"])
+        Canvas().select_rectangle(left_top, width_height, data.get("mode", "replace"))
+        return True, f"Selected rectangle at {left_top} with size {width_height}"
+
+
+class SelectEllipseAction(AbstractAction):
+    @property
+    @override
+    def name(self) -> str:
+        return "select_ellipse"
+
+    @property
+    @override
+    def desc(self) -> str:
+        return (
+            "Selects the ellipse that fits inside the given rectangle. Filling, clearing, copying and transforming "
+            "only affect the selection. " + MODE_DESC
+        )
+
+    @property
+    @override
+    def schema(self) -> dict[str, object]:
+        return {
+            "type": "object",
+            "required": ["left", "top", "width", "height"],
+            "properties": {
+                "left": {
+                    "type": "integer",
+                    "minimum": 0,
+                    "maximum": SCREEN_WIDTH
+                },
+                "top": {
+                    "type": "integer",
+                    "minimum": 0,
+                    "maximum": SCREEN_HEIGHT
+                },
+                "width": {
+                    "type": "integer",
+                    "minimum": 0,
+                    "maximum": SCREEN_WIDTH
+                },
+                "height": {
+                    "type": "integer",
+                    "minimum": 0,
+                    "maximum": SCREEN_HEIGHT
+                },
+                "mode": {
+                    "type": "string",
+                    "enum": list(SELECTION_MODES)
+                }
+            }
+        }
+
+    @property
+    @override
+    def permission(self) -> str:
+        return "selection"
+
+    @override
+    async def perform_action(self, data: Optional[dict]) -> tuple[bool, Optional[str]]:
+        assert data is not None, "'data' was expected but was set to None"
+        left_top = (data["left"], data["top"])
+        width_height = (data["width"], data["height"])
+        Canvas().select_ellipse(left_top, width_height, data.get("mode", "replace"))
+        return True, f"Selected ellipse at {left_top} with size {width_height}"
+
+
+class SelectMagicWandAction(AbstractAction):
+    @property
+    @override
+    def name(self) -> str:
+        return "select_magic_wand"
+
+    @property
+    @override
+    def desc(self) -> str:
+        return (
+            "Selects the connected area of the active layer around a point that has the same colour, "
+            "or a colour within \"tolerance\" of it on every channel. " + MODE_DESC
+        )
+
+    @property
+    @override
+    def schema(self) -> dict[str, object]:
+        return {
+            "type": "object",
+            "required": ["x", "y"],
+            "properties": {
+                "x": {
+                    "type": "integer",
+                    "minimum": 0,
+                    "exclusiveMaximum": SCREEN_WIDTH
+                },
+                "y": {
+                    "type": "integer",
+                    "minimum": 0,
+                    "exclusiveMaximum": SCREEN_HEIGHT
+                },
+                "tolerance": {
+                    "type": "integer",
+                    "minimum": 0,
+                    "maximum": 255
+                },
+                "mode": {
+                    "type": "string",
+                    "enum": list(SELECTION_MODES)
+                }
+            }
+        }
+
+    @property
+    @override
+    def permission(self) -> str:
+        return "selection"
+
+    @override
+    async def perform_action(self, data: Optional[dict]) -> tuple[bool, Optional[str]]:
+        assert data is not None, "'data' was expected but was set to None"
+        point = (data["x"], data["y"])
+        await run_off_loop(
+            Canvas().select_magic_wand, point, data.get("tolerance", 0), data.get("mode", "replace")
+        )
+        return True, f"Selected the area around {point}"
+
+
+class SelectNoneAction(AbstractAction):
+    @property
+    @override
+    def name(self) -> str:
+        return "select_none"
+
+    @property
+    @override
+    def desc(self) -> str:
+        return "Removes the selection, so actions affect the whole layer again."
+
+    @property
+    @override
+    def schema(self) -> dict[str, object]:
+        return {}
+
+    @property
+    @override
+    def permission(self) -> str:
+        return "selection"
+
+    @override
+    def available(self) -> bool:
+        return has_selection()
+
+    @override
+    async def perform_action(self, data: Optional[dict]) -> tuple[bool, Optional[str]]:
+        Canvas().select_none()
+        return True, "Removed the selection"
+
+
+class FillSelectionAction(AbstractAction):
+    @property
+    @override
+    def name(self) -> str:
+        return "fill_selection"
+
+    @property
+    @override
+    def desc(self) -> str:
+        return "Fills the selected area of the active layer with the brush colour."
+
+    @property
+    @override
+    def schema(self) -> dict[str, object]:
+        return {}
+
+    @property
+    @override
+    def permission(self) -> str:
+        return "selection"
+
+    @override
+    def available(self) -> bool:
+        return has_selection()
+
+    @override
+    async def perform_action(self, data: Optional[dict]) -> tuple[bool, Optional[str]]:
+        try:
+            Canvas().fill_selection()
+            return True, "Filled the selection"
+        except ValueError as e:
+            return False, str(e)
+
+
+class ClearSelectionAction(AbstractAction):
+    @property
+    @override
+    def name(self) -> str:
+        return "clear_selection"
+
+    @property
+    @override
+    def desc(self) -> str:
+        return "Erases the selected area of the active layer, making it transparent."
+
+    @property
+    @override
+    def schema(self) -> dict[str, object]:
+        return {}
+
+    @property
+    @override
+    def permission(self) -> str:
+        return "selection"
+
+    @override
+    def available(self) -> bool:
+        return has_selection()
+
+    @override
+    async def perform_action(self, data: Optional[dict]) -> tuple[bool, Optional[str]]:
+        try:
+            Canvas().clear_selection()
+            return True, "Cleared the selection"
+        except ValueError as e:
+            return False, str(e)
+
+
+class CopySelectionAction(AbstractAction):
+    @property
+    @override
+    def name(self) -> str:
+        return "copy_selection"
+
+    @property
+    @override
+    def desc(self) -> str:
+        return "Copies the selected area of the active layer so it can be pasted."
+
+    @property
+    @override
+    def schema(self) -> dict[str, object]:
+        return {}
+
+    @property
+    @override
+    def permission(self) -> str:
+        return "selection"
+
+    @override
+    def available(self) -> bool:
+        return has_selection()
+
+    @override
+    async def perform_action(self, data: Optional[dict]) -> tuple[bool, Optional[str]]:
+        try:
+            Canvas().copy_selection()
+            return True, "Copied the selection"
+        except ValueError as e:
+            return False, str(e)
+
+
+class PasteAction(AbstractAction):
+    @property
+    @override
+    def name(self) -> str:
+        return "paste"
+
+    @property
+    @override
+    def desc(self) -> str:
+        return (
+            "Pastes the copied area onto the active layer and selects it. "
+            "It goes back where it was copied from unless \"left\" and \"top\" are both given."
+        )
+
+    @property
+    @override
+    def schema(self) -> dict[str, object]:
+        return {
+            "type": "object",
+            "properties": {
+                "left": {
+                    "type": "integer",
+                    "minimum": 0,
+                    "maximum": SCREEN_WIDTH
+                },
+                "top": {
+                    "type": "integer",
+                    "minimum": 0,
+                    "maximum": SCREEN_HEIGHT
+                }
+            }
+        }
+
+    @property
+    @override
+    def permission(self) -> str:
+        return "selection"
+
+    @override
+    def available(self) -> bool:
+        return has_clipboard()
+
+    @override
+    async def perform_action(self, data: Optional[dict]) -> tuple[bool, Optional[str]]:
+        left_top = None
+        if data and "left" in data and "top" in data:
+            left_top = (data["left"], data["top"])
+        try:
+            Canvas().paste(left_top)
+            return True, "Pasted" if left_top is None else f"Pasted at {left_top}"
+        except ValueError as e:
+            return False, str(e)
+
+
+class TransformSelectionAction(AbstractAction):
+    @property
+    @override
+    def name(self) -> str:
+        return "transform_selection"
+
+    @property
+    @override
+    def desc(self) -> str:
+        return (
+            "Moves, resizes, rotates or mirrors the selected part of the active layer about the selection's center, "
+            "and moves the selection with it. \"dx\" and \"dy\" move it by that many pixels, \"scale_x\" and "
+            "\"scale_y\" resize it, \"angle\" rotates it clockwise in degrees, and \"flip_horizontal\" and "
+            "\"flip_vertical\" mirror it. \"quality\" is \"nearest\" for hard pixel edges or \"smooth\" (the default)."
+        )
+
+    @property
+    @override
+    def schema(self) -> dict[str, object]:
+        return {
+            "type": "object",
+            "properties": {
+                "dx": {"type": "integer"},
+                "dy": {"type": "integer"},
+                "scale_x": {
+                    "type": "number",
+                    "exclusiveMinimum": 0,
+                    "maximum": 10
+                },
+                "scale_y": {
+                    "type": "number",
+                    "exclusiveMinimum": 0,
+                    "maximum": 10
+                },
+                "angle": {
+                    "type": "number",
+                    "minimum": 0,
+                    "exclusiveMaximum": 360
+                },
+                "flip_horizontal": {"type": "boolean"},
+                "flip_vertical": {"type": "boolean"},
+                "quality": {
+                    "type": "string",
+                    "enum": list(TRANSFORM_QUALITIES)
+                }
+            }
+        }
+
+    @property
+    @override
+    def permission(self) -> str:
+        return "selection"
+
+    @override
+    def available(self) -> bool:
+        return has_selection()
+
+    @override
+    async def perform_action(self, data: Optional[dict]) -> tuple[bool, Optional[str]]:
+        data = data or {}
+        try:
+            await run_off_loop(
+                Canvas().transform_selection,
+                (data.get("dx", 0), data.get("dy", 0)),
+                (data.get("scale_x", 1), data.get("scale_y", 1)),
+                data.get("angle", 0),
+                (data.get("flip_horizontal", False), data.get("flip_vertical", False)),
+                data.get("quality", "smooth"),
+            )
+            return True, "Transformed the selection"
+        except ValueError as e:
+            return False, str(e)
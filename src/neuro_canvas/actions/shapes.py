@@ -0,0 +1,111 @@
+from typing import Optional
+
+from ..canvas import Canvas
+from ..constants import COLORS
+from ._availability import has_shapes
+from ._abc import AbstractAction, override
+
+
+def _shape_schema() -> dict[str, object]:
+    canvas = Canvas()
+    return {
+        "type": "object",
+        "required": ["layer", "shape"],
+        "properties": {
+            "layer": {
+                "type": "string",
+                "enum": [name for name in canvas.get_layer_order() if canvas.is_vector_layer(name)]
+            },
+            "shape": {
+                "type": "integer",
+                "minimum": 0
+            }
+        }
+    }
+
+
+class EraseShapeAction(AbstractAction):
+    @property
+    @override
+    def name(self) -> str:
+        return "erase_shape"
+
+    @property
+    @override
+    def desc(self) -> str:
+        return (
+            "Erases one shape from a vector layer, without touching anything drawn before or after it. "
+            "Use find_shape to get the number of the shape at a point."
+        )
+
+    @property
+    @override
+    def schema(self) -> dict[str, object]:
+        return _shape_schema()
+
+    @property
+    @override
+    def permission(self) -> str:
+        return "shapes"
+
+    @override
+    def available(self) -> bool:
+        return has_shapes()
+
+    @override
+    async def perform_action(self, data: Optional[dict]) -> tuple[bool, Optional[str]]:
+        assert data is not None, "'data' was expected but was set to None"
+        layer_name = data["layer"]
+        shape = data["shape"]
+        try:
+            Canvas().erase_shape(layer_name, shape)
+            return True, f"Erased shape {shape} from layer '{layer_name}'"
+        except ValueError as e:
+            return False, str(e)
+
+
+class RecolorShapeAction(AbstractAction):
+    @property
+    @override
+    def name(self) -> str:
+        return "recolor_shape"
+
+    @property
+    @override
+    def desc(self) -> str:
+        return (
+            "Changes the colour of one shape on a vector layer, to the given colour or else the brush colour. "
+            "Use find_shape to get the number of the shape at a point."
+        )
+
+    @property
+    @override
+    def schema(self) -> dict[str, object]:
+        schema = _shape_schema()
+        schema["properties"]["color"] = {  # type: ignore[index]
+            "type": "string",
+            "enum": list(COLORS.keys())
+        }
+        return schema
+
+    @property
+    @override
+    def permission(self) -> str:
+        return "shapes"
+
+    @override
+    def available(self) -> bool:
+        return has_shapes()
+
+    @override
+    async def perform_action(self, data: Optional[dict]) -> tuple[bool, Optional[str]]:
+        assert data is not None, "'data' was expected but was set to None"
+        layer_name = data["layer"]
+        shape = data["shape"]
+        canvas = Canvas()
+        color = COLORS[data["color"]] if "color" in data else canvas.get_brush_color()
+        try:
+            canvas.recolor_shape(layer_name, shape, color)
+            return True, f"Recoloured shape {shape} on layer '{layer_name}' to {data.get('color', 'the brush colour')}"
+        except ValueError as e:
+            return False, str(e)
@@ -2,20 +2,25 @@
 
 import pygame
 
+import argparse
 import os
 import sys
 import traceback
 import logging
-from typing import Final
+from pathlib import Path
+from typing import Final, Optional
 
 import trio
-from libcomponent.component import Event, ExternalRaiseManager
+from libcomponent.component import ExternalRaiseManager
 
-from neuro_api.trio_ws import TrioNeuroAPIComponent
-
-from .actions import all_actions
+from .actions import ActionQueue, ActionRegistrar, load_actions
 from .canvas import Canvas
+from .config.watch import watch_config
+from .connection import NeuroConnection
 from .constants import APP_NAME
+from .startup import profile_startup
+from .thumbnail import current_preview, send_thumbnails
+from .trace import TraceWriter
 
 # For compatibility with Python versions below 3.11, use the backported ExceptionGroup
 if sys.version_info < (3, 11):
@@ -23,49 +28,60 @@ if sys.version_info < (3, 11):
 
 WEBSOCKET_ENV_VAR: Final = "NEURO_SDK_WS_URL"
 DEFAULT_WEBSOCKET: Final = "ws://localhost:8000"
-WEBSOCKET_CONNECTION_WAIT_TIME: Final = 0.1
 
 STARTUP_MESSAGE: Final = "This is a painting app, feel free to draw anything you want!"
-CONNECTION_FAILURE_MSG: Final = "Neuro API connection failed"
+RECONNECT_MESSAGE: Final = "The painting app reconnected, and everything drawn so far is still on the canvas."
 SHUTDOWN_MSG: Final = "Shutting down..."
 CLEANUP_MSG: Final = "Cleanup complete"
 
 logger = logging.getLogger(__name__)
 
 
-async def run() -> None:
+async def run(trace_path: Optional[Path] = None) -> None:
     """
     Main asynchronous function to run the app.
+
+    Args:
+        trace_path (Optional[Path], optional): A file to append a record of every action to. Defaults to None.
     """
     websocket_url = os.environ.get(WEBSOCKET_ENV_VAR, DEFAULT_WEBSOCKET)
 
     async with trio.open_nursery(strict_exception_groups=True) as nursery:
         manager = ExternalRaiseManager(APP_NAME, nursery)
-        neuro_component = TrioNeuroAPIComponent("neuro_api", APP_NAME)
+        trace = None if trace_path is None else TraceWriter(trace_path)
 
-        try:
-            manager.add_component(neuro_component)
+        async def on_connect(reconnected: bool) -> None:
+            # Neuro forgets the game and its actions with the connection, so every connection starts over
+            await neuro_component.send_startup_command()
+            await neuro_component.send_context(RECONNECT_MESSAGE if reconnected else STARTUP_MESSAGE)
+            if reconnected:
+                # Previews sent while the connection was down were lost, so catch Neuro up on the canvas
+                await neuro_component.send_context(await current_preview())
+            await registrar.register_all()
 
-            neuro_component.register_handler(
-                "connect",
-                neuro_component.handle_connect,
-            )
+        neuro_component = NeuroConnection("neuro_api", APP_NAME, websocket_url, on_connect)
 
-            await manager.raise_event(Event("connect", websocket_url))
-            await trio.sleep(WEBSOCKET_CONNECTION_WAIT_TIME)
+        try:
+            manager.add_component(neuro_component)
 
-            if neuro_component.not_connected:
-                logger.error(CONNECTION_FAILURE_MSG)
-                raise RuntimeError(CONNECTION_FAILURE_MSG)
+            Canvas()  # Initialize canvas to have it appear on start-up
 
-            await neuro_component.send_startup_command()
+            # Actions run one at a time on their own task, so the websocket reader never waits on drawing.
+            # After each one, the registered actions are brought in line with what the canvas allows.
+            action_queue = ActionQueue(after_action=lambda: registrar.notify())
+            registrar = ActionRegistrar(neuro_component, load_actions, action_queue, trace)
+            nursery.start_soon(action_queue.run)
 
-            await neuro_component.send_context(STARTUP_MESSAGE)
+            if trace is not None:
+                nursery.start_soon(trace.run)
 
-            Canvas()  # Initialize canvas to have it appear on start-up
+            # Connects in the background and keeps reconnecting, so the canvas outlives any network blip
+            nursery.start_soon(neuro_component.run)
+            nursery.start_soon(registrar.run)
+            # Permission changes in config.json register or unregister the affected actions
+            nursery.start_soon(watch_config, registrar.notify)
 
-            await neuro_component.register_neuro_actions([(action.get_action(), action.get_handler())
-                                                          for action in all_actions])
+            nursery.start_soon(send_thumbnails, neuro_component.send_context, neuro_component.wait_ready)
 
             running = True
 
@@ -83,12 +99,27 @@ async def run() -> None:
         finally:
             await neuro_component.stop()
             pygame.quit()
+            if trace is not None:
+                trace.flush()
             logger.info(CLEANUP_MSG)
+            # Stop background tasks such as the canvas previews
+            nursery.cancel_scope.cancel()
 
 
 def start() -> None:
+    parser = argparse.ArgumentParser(prog="neuro-canvas", description=APP_NAME)
+    parser.add_argument(
+        "--profile-startup", action="store_true", help="report how long each module takes to import, then exit"
+    )
+    parser.add_argument("--trace", type=Path, help="append a record of every action to this JSONL file")
+    args = parser.parse_args()
+
+    if args.profile_startup:
+        print(profile_startup())
+        return
+
     try:
-        trio.run(run)
+        trio.run(run, args.trace)
     except ExceptionGroup as exc:
         traceback.print_exception(exc)
 
@@ -0,0 +1,131 @@
+"""Brushes - Stamp and spray brushes built from cached, pre-rendered dabs."""
+
+import zlib
+
+from functools import lru_cache
+from typing import Final, Literal
+from collections.abc import Sequence
+
+from pygame import Rect
+import pygame
+import numpy as np
+
+from .geometry import unit_star
+
+BrushTip = Literal["solid", "round", "soft", "square", "star"]
+
+BRUSH_TIPS: Final[tuple[str, ...]] = ("solid", "round", "soft", "square", "star")
+
+# Spacing and scatter are relative to the brush width so the same settings look alike at any size.
+# The maximums end up in action schemas, which only allow integers.
+DEFAULT_SPACING: Final = 0.25
+MIN_SPACING: Final = 0.05
+MAX_SPACING: Final = 4
+MAX_SCATTER: Final = 10
+
+Point = tuple[float, float]
+
+
+@lru_cache(maxsize=128)
+def render_dab(tip: BrushTip, color: tuple[int, int, int, int], size: int) -> pygame.Surface:
+    """
+    Pre-renders one dab of a brush tip.
+
+    Dabs are cached per (tip, color, size), so a stroke of any length blits the same few surfaces.
+
+    Args:
+        tip (BrushTip): The dab shape; anything except "solid".
+        color (tuple[int, int, int, int]): The RGBA brush color.
+        size (int): The dab's width and height in pixels.
+
+    Returns:
+        pygame.Surface: A size x size surface with per-pixel alpha.
+    """
+    dab = pygame.Surface((size, size), pygame.SRCALPHA)
+    radius = size / 2
+
+    if tip == "square":
+        dab.fill(color)
+    elif tip == "star":
+        vertices = unit_star(5, 0.45) * radius + radius
+        pygame.draw.polygon(dab, color, vertices.tolist())
+    else:
+        # Coverage of each pixel center: a hard disc for "round", a quadratic falloff for "soft".
+        centers = np.arange(size) + 0.5 - radius
+        distance = np.hypot(centers[:, None], centers[None, :]) / radius
+        if tip == "soft":
+            coverage = np.clip(1 - distance, 0, 1) ** 2
+        else:
+            coverage = (distance <= 1).astype(np.float64)
+        dab.fill(color[:3] + (0,))
+        alpha = pygame.surfarray.pixels_alpha(dab)
+        alpha[:] = (coverage * color[3]).astype(np.uint8)
+        del alpha  # Release the surface lock
+
+    return dab
+
+
+def resample_path(points: Sequence[Point] | np.ndarray, spacing: float, closed: bool = False) -> np.ndarray:
+    """
+    Returns points spaced evenly by arc length along a polyline.
+    """
+    pts = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+    if closed and len(pts) > 2:
+        pts = np.concatenate((pts, pts[:1]))
+
+    distances = np.concatenate(([0], np.cumsum(np.hypot(*np.diff(pts, axis=0).T))))
+    if len(pts) < 2 or distances[-1] == 0:
+        return pts[:1]
+
+    samples = np.arange(0, distances[-1] + 1e-9, spacing)
+    return np.stack((np.interp(samples, distances, pts[:, 0]), np.interp(samples, distances, pts[:, 1])), axis=1)
+
+
+def stamp_polyline(
+    surface: pygame.Surface,
+    color: pygame.Color,
+    points: Sequence[Point] | np.ndarray,
+    width: int,
+    tip: BrushTip,
+    spacing: float = DEFAULT_SPACING,
+    scatter: float = 0,
+    closed: bool = False,
+) -> Rect:
+    """
+    Stamps dabs along a polyline in a single batched blit.
+
+    Args:
+        surface (pygame.Surface): The surface to draw on.
+        color (pygame.Color): The brush color.
+        points (Sequence[Point] | np.ndarray): The vertices of the polyline.
+        width (int): The dab size in pixels.
+        tip (BrushTip): The dab shape.
+        spacing (float, optional): The distance between dabs as a fraction of the width, at least MIN_SPACING.
+            Defaults to DEFAULT_SPACING.
+        scatter (float, optional): How far, as a multiple of the width, dabs are randomly sprayed around the path.
+            Defaults to 0.
+        closed (bool, optional): Whether to connect the last point back to the first. Defaults to False.
+
+    Returns:
+        Rect: The area of the surface that was touched.
+    """
+    size = max(int(width), 1)
+    positions = resample_path(points, max(spacing, MIN_SPACING) * size, closed)
+    if len(positions) == 0:
+        return Rect(0, 0, 0, 0)
+
+    if scatter > 0:
+        # Seed from the path so replaying the stroke for undo sprays exactly the same dabs.
+        rng = np.random.default_rng(zlib.crc32(positions.tobytes()))
+        angles = rng.uniform(0, 2 * np.pi, len(positions))
+        # The square root keeps the spray evenly dense across the disc instead of bunching at the path.
+        radii = np.sqrt(rng.uniform(0, 1, len(positions))) * scatter * size
+        positions = positions + np.stack((np.cos(angles), np.sin(angles)), axis=1) * radii[:, None]
+
+    dab = render_dab(tip, tuple(color), size)
+    corners = np.rint(positions - size / 2).astype(int)
+    surface.blits([(dab, corner) for corner in corners.tolist()], doreturn=False)
+
+    left, top = corners.min(axis=0)
+    right, bottom = corners.max(axis=0) + size
+    return Rect(left, top, right - left, bottom - top).clip(surface.get_rect())
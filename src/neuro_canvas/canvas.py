@@ -2,28 +2,39 @@
 
 from pygame import gfxdraw, Rect
 import pygame
+import numpy as np
 
-import math
 import os
+import threading
 
 from pathlib import Path
 from functools import partial, wraps
 from typing import Any
-from collections.abc import Callable
+from collections.abc import Callable, Sequence
 
+from .brushes import DEFAULT_SPACING, BrushTip, stamp_polyline
+from .compositor import BlendMode, blend_layer, merge_layer
 from .constants import SCREEN_HEIGHT, SCREEN_WIDTH, APP_NAME, COLORS
+from .curves import CurveMode, curve_points
+from .fills import FillTarget, GradientKind, PatternKind, Stop, gradient, pattern
+from .geometry import equilateral_triangle, regular_polygon, rotated_rectangle, star
+from .layers import Layer, LayerStack
+from .selection import Selection, SelectionMode, array_bounds, color_matches, flood_mask
+from .stroke import CapStyle, JoinStyle, fill_circle, fill_polygon, stroke_circle, stroke_polyline
+from .summary import RegionSummary, SurfaceSummary
+from .svg import layers_to_svg
+from .transforms import TransformQuality, placement, transformed
+from .vector import PRIMITIVE_KINDS, PrimitiveKind, VectorLayer
 
 Coordinate = tuple[int, int]
 
+# Drawn onto the eraser mask; only its alpha is taken off the layer
+ERASER_COLOR = pygame.Color(0, 0, 0, 255)
 
-# New Layer class
-class Layer:
-    def __init__(self, name: str, width: int, height: int):
-        self.name = name
-        # Create a surface with per-pixel alpha so that layers can be transparent
-        self.surface = pygame.Surface((width, height), pygame.SRCALPHA)
-        # By default, a layer is visible
-        self.visible = True
+
+def _rectangle_edges(rect: Rect) -> list[Coordinate]:
+    # Stroke through the centres of the edge pixels so thick outlines stay centred on the 1px outline.
+    return [rect.topleft, (rect.right - 1, rect.top), (rect.right - 1, rect.bottom - 1), (rect.left, rect.bottom - 1)]
 
 
 class Canvas:
@@ -31,9 +42,16 @@ class Canvas:
         def __init__(self):
             self.brush_color: pygame.Color = COLORS["black"]
             self.brush_width: int = 1
+            self.cap_style: CapStyle = "round"
+            self.join_style: JoinStyle = "round"
+            self.antialias: bool = False
+            self.brush_tip: BrushTip = "solid"
+            self.tip_spacing: float = DEFAULT_SPACING
+            self.tip_scatter: float = 0
             self.active_layer: str = "base"
-            self.layers: dict[str, Layer] = {}
-            self.layers_order: list[str] = []
+            self.layers: LayerStack = LayerStack()
+            self.selection: Selection | None = None
+            self.clipboard: tuple[pygame.Surface, Rect] | None = None
 
     def __new__(cls):
         if not hasattr(cls, 'instance'):
@@ -49,6 +67,28 @@ class Canvas:
         self._actions: list[partial] = []
         self._screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
 
+        # Composite of the layers below the active one, which drawing on the active layer never changes.
+        self._below_active = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+        self._below_active_count = -1
+        # Shapes are erased by drawing them here first; kept transparent between erasures
+        self._eraser_mask = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
+
+        # Steps that put back what region operations overwrote, keyed by the position of the action in the
+        # history, so undoing the latest one restores just that instead of replaying everything.
+        self._snapshots: dict[int, list[Callable[[], None]]] = {}
+        self._pending_snapshot: list[Callable[[], None]] = []
+
+        # Cached statistics for queries, invalidated per changed area
+        self._summaries: dict[str, SurfaceSummary] = {}
+        self._screen_summary = SurfaceSummary()
+        # How much of the canvas has changed since the last thumbnail, counting overlapping changes again
+        self._changed_pixels = 0
+        self._thumbnail: np.ndarray | None = None
+        # Bounding box of everything changed since take_dirty_area was last called, for tracing
+        self._dirty_area: Rect | None = None
+        # Set when an action ran in a worker thread and the display still has to catch up
+        self._display_stale = False
+
         # Create a dedicated "background" layer followed by a "base" layer for drawings.
         self.add_layer("background")
         self.add_layer("base")
@@ -59,6 +99,9 @@ class Canvas:
         marker = partial(lambda: None)
         marker.func.__name__ = "finish_setup"
         self._actions.append(marker)
+        # A blank canvas isn't worth a preview
+        self._changed_pixels = 0
+        self._dirty_area = None
 
         pygame.display.set_caption(APP_NAME)
         self._initialized = True
@@ -66,13 +109,313 @@ class Canvas:
     def _get_active_surface(self) -> pygame.Surface:
         return self._attributes.layers[self._attributes.active_layer].surface
 
+    def _get_active_vector_layer(self) -> VectorLayer | None:
+        layer = self._attributes.layers[self._attributes.active_layer]
+        return layer if isinstance(layer, VectorLayer) else None
+
+    def _require_raster(self, layer_name: str) -> None:
+        if isinstance(self._attributes.layers[layer_name], VectorLayer):
+            raise ValueError(f"Layer '{layer_name}' is a vector layer, which only holds shapes, not pixels.")
+
+    def _add_shape(self, layer: VectorLayer, kind: PrimitiveKind, points: Sequence[Coordinate] | np.ndarray,
+                   **fields: Any) -> None:
+        area = layer.add(kind, points, self._attributes.brush_color, antialias=self._attributes.antialias, **fields)
+        # Undoing the shape only has to drop it from the display list again
+        self._pending_snapshot.append(partial(self._drop_shape, layer.name))
+        self._mark_dirty(layer.name, area)
+
+    def _drop_shape(self, layer_name: str) -> None:
+        layer = self._attributes.layers[layer_name]
+        assert isinstance(layer, VectorLayer)
+        self._mark_dirty(layer_name, layer.pop())
+
+    def _require_shape(self, layer_name: str, shape: int) -> VectorLayer:
+        if not self.layer_exists(layer_name):
+            raise ValueError(f"Layer '{layer_name}' does not exist.")
+        layer = self._attributes.layers[layer_name]
+        if not isinstance(layer, VectorLayer):
+            raise ValueError(f"Layer '{layer_name}' isn't a vector layer, so it doesn't keep its shapes.")
+        if not layer.has_shape(shape):
+            raise ValueError(f"There is no shape {shape} on layer '{layer_name}'.")
+        return layer
+
+    def _set_shape_erased(self, layer_name: str, shape: int, erased: bool) -> None:
+        layer = self._attributes.layers[layer_name]
+        assert isinstance(layer, VectorLayer)
+        self._mark_dirty(layer_name, layer.set_erased(shape, erased))
+
+    def _recolor_shape(self, layer_name: str, shape: int, color: pygame.Color) -> pygame.Color:
+        layer = self._attributes.layers[layer_name]
+        assert isinstance(layer, VectorLayer)
+        old = layer.recolor(shape, color)
+        self._mark_dirty(layer_name, layer.shapes.bounds(shape))
+        return old
+
+    def _stroke(self, points: Sequence[Coordinate] | np.ndarray, closed: bool, filled: bool = False) -> None:
+        vector_layer = self._get_active_vector_layer()
+        if vector_layer is not None:
+            if filled:
+                self._add_shape(vector_layer, "polygon", points)
+            self._add_shape(
+                vector_layer, "polyline", points,
+                width=self._attributes.brush_width,
+                closed=closed or filled,
+                cap=self._attributes.cap_style,
+                join=self._attributes.join_style,
+                tip=self._attributes.brush_tip,
+                spacing=self._attributes.tip_spacing,
+                scatter=self._attributes.tip_scatter,
+            )
+            return
+
+        self._mark_dirty(self._attributes.active_layer, self._rasterize_stroke(
+            self._get_active_surface(), self._attributes.brush_color, points, closed, filled
+        ))
+
+    def _rasterize_stroke(self, surface: pygame.Surface, color: pygame.Color, points: Sequence[Coordinate] | np.ndarray,
+                          closed: bool, filled: bool = False) -> Rect:
+        """
+        Draws a stroke with the brush onto a raster surface.
+
+        Returns:
+            Rect: The area drawn over.
+        """
+        areas = []
+        if filled:
+            areas.append(fill_polygon(surface, color, points, antialias=self._attributes.antialias))
+            # The outline is still stroked so a filled shape covers exactly what its outline would.
+            closed = True
+
+        if self._attributes.brush_tip != "solid":
+            areas.append(stamp_polyline(
+                surface,
+                color,
+                points,
+                self._attributes.brush_width,
+                self._attributes.brush_tip,
+                spacing=self._attributes.tip_spacing,
+                scatter=self._attributes.tip_scatter,
+                closed=closed,
+            ))
+        else:
+            areas.append(stroke_polyline(
+                surface,
+                color,
+                points,
+                self._attributes.brush_width,
+                closed=closed,
+                cap=self._attributes.cap_style,
+                join=self._attributes.join_style,
+                antialias=self._attributes.antialias,
+            ))
+        return areas[0].unionall(areas[1:])
+
+    def _rasterize_circle(self, surface: pygame.Surface, color: pygame.Color, center: Coordinate, radius: int,
+                          filled: bool) -> Rect:
+        """
+        Draws a circle with the brush onto a raster surface.
+
+        Returns:
+            Rect: The area drawn over.
+        """
+        areas = []
+        if filled:
+            areas.append(fill_circle(surface, color, center, radius, antialias=self._attributes.antialias))
+        if self._attributes.brush_tip != "solid":
+            # Stamp along a polygon fine enough that its sides are about 4px long.
+            polygon = regular_polygon(center, radius, max(16, radius * 3 // 2), 0)
+            areas.append(self._rasterize_stroke(surface, color, polygon, True))
+        else:
+            areas.append(stroke_circle(
+                surface, color, center, radius, self._attributes.brush_width, antialias=self._attributes.antialias
+            ))
+        return areas[0].unionall(areas[1:])
+
+    def _rasterize_rectangle(self, surface: pygame.Surface, color: pygame.Color, rect: Rect, filled: bool,
+                             rotation: int | float) -> Rect:
+        """
+        Draws a rectangle with the brush onto a raster surface.
+
+        Returns:
+            Rect: The area drawn over.
+        """
+        if rotation % 360:
+            # Rotate about the rectangle's center; the pixel-grid fast paths below only work axis-aligned.
+            return self._rasterize_stroke(
+                surface, color, rotated_rectangle(rect.center, rect.width, rect.height, rotation), True, filled
+            )
+        areas = [pygame.draw.rect(surface, color, rect)] if filled else []
+        if self._attributes.brush_width > 1 or self._attributes.brush_tip != "solid":
+            areas.append(self._rasterize_stroke(surface, color, _rectangle_edges(rect), True))
+        else:
+            gfxdraw.rectangle(surface, rect, color)
+            areas.append(Rect(rect))
+        return areas[0].unionall(areas[1:])
+
+    def _paint_fill(self, target: FillTarget, render: Callable[[Rect], pygame.Surface]) -> None:
+        """
+        Paints pixels rendered for a whole area at once over the active layer, the background or the selection.
+        """
+        selection = self._require_selection() if target == "selection" else None
+        name = "background" if target == "background" else self._attributes.active_layer
+        self._require_raster(name)
+        area = self._screen.get_rect() if selection is None else selection.rect
+
+        pixels = render(area)
+        if selection is not None:
+            pixels.blit(selection.stencil(), (0, 0), special_flags=pygame.BLEND_RGBA_MULT)
+        self._remember_pixels(name, area)
+        self._attributes.layers[name].surface.blit(pixels, area)
+        self._mark_dirty(name, area)
+
+    def _erase(self, rasterize: Callable[[pygame.Surface, pygame.Color], Rect]) -> None:
+        """
+        Makes the pixels a rasterizer draws over on the active layer transparent, or partly so where it blends them.
+
+        The shape is drawn onto a mask first, so only its bounding box of the layer is remembered for undo and marked
+        as changed.
+        """
+        name = self._attributes.active_layer
+        self._require_raster(name)
+        mask = self._eraser_mask
+        area = rasterize(mask, ERASER_COLOR).clip(mask.get_rect())
+        if area:
+            self._remember_pixels(name, area)
+            # Subtracting the mask only lowers alpha, since the eraser's colour channels are zero
+            self._get_active_surface().blit(mask, area, area, special_flags=pygame.BLEND_RGBA_SUB)
+            mask.fill((0, 0, 0, 0), area)
+            self._mark_dirty(name, area)
+
+    def _remember_pixels(self, layer_name: str, area: Rect) -> None:
+        """
+        Keeps a copy of the pixels an action is about to overwrite, so undoing it only has to put them back.
+        """
+        surface = self._attributes.layers[layer_name].surface
+        area = area.clip(surface.get_rect())
+        self._pending_snapshot.append(partial(self._restore_pixels, layer_name, area, surface.subsurface(area).copy()))
+
+    def _remember_selection(self) -> None:
+        self._pending_snapshot.append(partial(self._restore_selection, self._attributes.selection))
+
+    def _restore_pixels(self, layer_name: str, area: Rect, pixels: pygame.Surface) -> None:
+        surface = self._attributes.layers[layer_name].surface
+        surface.fill((0, 0, 0, 0), area)
+        # Taking the maximum over transparent pixels copies the snapshot exactly instead of alpha blending it
+        surface.blit(pixels, area, special_flags=pygame.BLEND_RGBA_MAX)
+        self._mark_dirty(layer_name, area)
+
+    def _restore_selection(self, selection: Selection | None) -> None:
+        self._attributes.selection = selection
+
+    def _require_selection(self) -> Selection:
+        if self._attributes.selection is None:
+            raise ValueError("Nothing is selected.")
+        return self._attributes.selection
+
+    def _transform_pixels(
+        self,
+        name: str,
+        selection: Selection | None = None,
+        offset: tuple[int, int] = (0, 0),
+        scale: tuple[float, float] = (1, 1),
+        angle: float = 0,
+        flip: tuple[bool, bool] = (False, False),
+        quality: TransformQuality = "smooth",
+    ) -> Selection | None:
+        """
+        Transforms the selected pixels of a layer, or everything drawn on it, about their own center.
+
+        Returns:
+            Selection | None: Where the selection ended up, if one was given.
+        """
+        if not self.layer_exists(name):
+            raise ValueError(f"Layer '{name}' does not exist.")
+        if name == "background":
+            raise ValueError("The background layer can't be transformed.")
+        self._require_raster(name)
+
+        surface = self._attributes.layers[name].surface
+        if selection is None:
+            area = surface.get_bounding_rect()
+            if not area:
+                return None
+            piece = surface.subsurface(area)
+        else:
+            area = selection.rect
+            piece = selection.cut_out(surface)
+
+        pixels = transformed(piece, scale, angle, flip, quality)
+        destination = placement(area, pixels, offset)
+        self._remember_pixels(name, area.union(destination))
+
+        if selection is None:
+            surface.fill((0, 0, 0, 0), area)
+        else:
+            selection.clear(surface)
+        surface.blit(pixels, destination)
+        self._mark_dirty(name, area.union(destination))
+
+        if selection is None:
+            return None
+        # The selection follows its pixels; the stencil is resampled without filtering so it stays a clean mask
+        stencil = transformed(selection.stencil(), scale, angle, flip, "nearest")
+        return Selection.from_stencil(stencil, placement(area, stencil, offset).topleft, surface.get_rect())
+
+    def _invalidate_composite(self, index: int = 0, area: Rect | None = None) -> None:
+        """
+        Marks the layer at the given position, and so every composite that includes it, as changed.
+
+        Args:
+            index (int, optional): The position of the lowest layer that changed. Defaults to 0.
+            area (Rect | None, optional): The part of the canvas that changed. Defaults to all of it.
+        """
+        if index < self._below_active_count:
+            self._below_active_count = -1
+        area = self._screen.get_rect() if area is None else area.clip(self._screen.get_rect())
+        self._screen_summary.invalidate(area)
+        self._changed_pixels += area.width * area.height
+        if area:
+            self._dirty_area = area if self._dirty_area is None else self._dirty_area.union(area)
+
+    def _mark_dirty(self, layer_name: str, area: Rect | None = None) -> None:
+        """
+        Marks an area of a layer's pixels, or all of them, as changed.
+        """
+        if layer_name in self._summaries:
+            self._summaries[layer_name].invalidate(area)
+        self._invalidate_composite(self._attributes.layers.index(layer_name), area)
+
     def _composite_layers(self) -> None:
-        # Clear the main screen to the default background
-        self._screen.fill(COLORS["white"])
-        for layer_name in self._attributes.layers_order:
-            layer = self._attributes.layers[layer_name]
+        layers = list(self._attributes.layers.values())
+        active = self._attributes.layers.index(self._attributes.active_layer)
+
+        if self._below_active_count != active:
+            # Clear to the default background
+            self._below_active.fill(COLORS["white"])
+            for layer in layers[:active]:
+                if layer.visible:
+                    blend_layer(self._below_active, layer.surface, layer.opacity, layer.blend_mode)
+            self._below_active_count = active
+
+        self._screen.blit(self._below_active, (0, 0))
+        for layer in layers[active:]:
             if layer.visible:
-                self._screen.blit(layer.surface, (0, 0))
+                blend_layer(self._screen, layer.surface, layer.opacity, layer.blend_mode)
+
+    def _update_display(self) -> None:
+        # The window belongs to the main thread, so actions run by a worker leave the update to refresh_display
+        if threading.current_thread() is threading.main_thread():
+            pygame.display.update()
+        else:
+            self._display_stale = True
+
+    def refresh_display(self) -> None:
+        """
+        Updates the display if an action that ran in a worker thread changed the canvas.
+        """
+        if self._display_stale:
+            self._display_stale = False
+            pygame.display.update()
 
     @staticmethod
     def action(update_display: bool = True, record: bool = True) -> Callable:
@@ -98,14 +441,18 @@ class Canvas:
 
             @wraps(fn)
             def wrapper(self: 'Canvas', *args, **kwargs) -> Any:
+                # Drop anything remembered by an earlier action that failed part way
+                self._pending_snapshot = []
                 return_val = fn(self, *args, **kwargs)
 
                 if record:
                     self._actions.append(partial(fn, self, *args, **kwargs))
+                    if self._pending_snapshot:
+                        self._snapshots[len(self._actions) - 1] = self._pending_snapshot
 
                 if update_display:
                     self._composite_layers()
-                    pygame.display.update()
+                    self._update_display()
 
                 return return_val
 
@@ -115,16 +462,26 @@ class Canvas:
 
     @action(record=False)
     def undo(self) -> bool:
-        if self._actions[-1].func.__name__ == "finish_setup":
+        if not self.can_undo():
             return False
 
         # Remove last action
         self._actions.pop()
 
+        snapshot = self._snapshots.pop(len(self._actions), None)
+        if snapshot is not None:
+            for restore in reversed(snapshot):
+                restore()
+            return True
+
         # Reset canvas attributes and re-perform actions
         self._attributes = Canvas.Attributes()
+        self._summaries.clear()
+        self._invalidate_composite()
         for action in self._actions:
             action()
+        # Replaying leaves the canvas exactly as it was, so earlier snapshots stay valid
+        self._pending_snapshot = []
 
         return True
 
@@ -135,11 +492,14 @@ class Canvas:
             layer.surface.fill((0, 0, 0, 0))  # Clear to transparent
         # Fill the "background" layer with white by default.
         self._attributes.layers["background"].surface.fill(COLORS["white"])
+        self._summaries.clear()
+        self._invalidate_composite()
 
     @action()
     def set_background(self, color: pygame.Color) -> None:
         # Set background only on the "background" layer.
         self._attributes.layers["background"].surface.fill(color)
+        self._mark_dirty("background")
 
     @action(update_display=False)
     def set_brush_color(self, color: pygame.Color) -> None:
@@ -149,78 +509,414 @@ class Canvas:
     def set_brush_width(self, width: int) -> None:
         self._attributes.brush_width = width
 
+    @action(update_display=False)
+    def set_stroke_style(self, cap: CapStyle, join: JoinStyle, antialias: bool) -> None:
+        self._attributes.cap_style = cap
+        self._attributes.join_style = join
+        self._attributes.antialias = antialias
+
+    @action(update_display=False)
+    def set_brush_tip(self, tip: BrushTip, spacing: float, scatter: float) -> None:
+        self._attributes.brush_tip = tip
+        self._attributes.tip_spacing = spacing
+        self._attributes.tip_scatter = scatter
+
     @action()
     def draw_line(self, start_pos: Coordinate, end_pos: Coordinate) -> None:
-        pygame.draw.line(self._get_active_surface(), self._attributes.brush_color, start_pos, end_pos)
+        self._stroke([start_pos, end_pos], False)
 
     @action()
-    def draw_lines(self, points: list[Coordinate], closed: bool) -> None:
-        pygame.draw.lines(self._get_active_surface(), self._attributes.brush_color, closed, points)
+    def draw_lines(self, points: list[Coordinate], closed: bool, filled: bool = False) -> None:
+        self._stroke(points, closed, filled)
 
     @action()
-    def draw_curve(self, points: list[Coordinate], steps: int) -> None:
-        gfxdraw.bezier(self._get_active_surface(), points, steps, self._attributes.brush_color)
+    def draw_curve(self, points: list[Coordinate], mode: CurveMode = "bezier") -> None:
+        self._stroke(curve_points(points, mode).tolist(), False)
 
     @action()
-    def draw_circle(self, center: Coordinate, radius: int) -> None:
-        gfxdraw.circle(self._get_active_surface(), center[0], center[1], radius, self._attributes.brush_color)
+    def draw_circle(self, center: Coordinate, radius: int, filled: bool = False) -> None:
+        vector_layer = self._get_active_vector_layer()
+        if vector_layer is None:
+            self._mark_dirty(self._attributes.active_layer, self._rasterize_circle(
+                self._get_active_surface(), self._attributes.brush_color, center, radius, filled
+            ))
+            return
+        if filled:
+            self._add_shape(vector_layer, "disc", [center], radius=radius)
+        if self._attributes.brush_tip != "solid":
+            # Stamp along a polygon fine enough that its sides are about 4px long.
+            self._stroke(regular_polygon(center, radius, max(16, radius * 3 // 2), 0), True)
+            return
+        self._add_shape(vector_layer, "circle", [center], radius=radius, width=self._attributes.brush_width)
 
     @action()
-    def draw_rectangle(self, left_top: Coordinate, width_height: Coordinate) -> None:
-        gfxdraw.rectangle(self._get_active_surface(), Rect(left_top, width_height), self._attributes.brush_color)
+    def draw_rectangle(
+        self, left_top: Coordinate, width_height: Coordinate, filled: bool = False, rotation: int | float = 0
+    ) -> None:
+        rect = Rect(left_top, width_height)
+        vector_layer = self._get_active_vector_layer()
+        if vector_layer is None:
+            self._mark_dirty(self._attributes.active_layer, self._rasterize_rectangle(
+                self._get_active_surface(), self._attributes.brush_color, rect, filled, rotation
+            ))
+            return
+        if rotation % 360:
+            self._stroke(rotated_rectangle(rect.center, rect.width, rect.height, rotation), True, filled)
+            return
+        edges = _rectangle_edges(rect)
+        if filled:
+            # Filling through the edge pixels covers the same pixels as filling the rectangle
+            self._add_shape(vector_layer, "polygon", edges)
+        if self._attributes.brush_width > 1 or self._attributes.brush_tip != "solid":
+            self._stroke(edges, True)
+        else:
+            self._add_shape(vector_layer, "rectangle", [rect.topleft, (rect.right - 1, rect.bottom - 1)])
 
     @action()
-    def draw_triangle(self, center: Coordinate, side_length: int, rotation: int | float) -> None:
-        # Calculate circumradius from side length
-        size = side_length / math.sqrt(3)
-        # Calculate the three vertices for an equilateral triangle
-        # using angles -90°, 30°, and 150° so that one vertex is at the top.
-        cx, cy = center
-        # Base angles for an equilateral triangle (in radians)
-        base_angles = [math.radians(-90), math.radians(30), math.radians(150)]
-        rotation_radians = math.radians(rotation)
-        # Add the rotation offset to each base angle
-        rotated_angles = [angle + rotation_radians for angle in base_angles]
-        vertices = [
-            (int(cx + size * math.cos(angle)), int(cy + size * math.sin(angle)))
-            for angle in rotated_angles
-        ]
-        # Draw lines between the vertices to form the triangle.
-        pygame.draw.lines(self._get_active_surface(), self._attributes.brush_color, True, vertices)
+    def draw_triangle(
+        self, center: Coordinate, side_length: int, rotation: int | float, filled: bool = False
+    ) -> None:
+        self._stroke(equilateral_triangle(center, side_length, rotation), True, filled)
+
+    @action()
+    def draw_regular_polygon(
+        self, center: Coordinate, radius: int, sides: int, rotation: int | float, filled: bool = False
+    ) -> None:
+        self._stroke(regular_polygon(center, radius, sides, rotation), True, filled)
+
+    @action()
+    def draw_star(
+        self,
+        center: Coordinate,
+        outer_radius: int,
+        inner_radius: int,
+        points: int,
+        rotation: int | float,
+        filled: bool = False
+    ) -> None:
+        self._stroke(star(center, outer_radius, inner_radius, points, rotation), True, filled)
+
+    @action()
+    def erase_line(self, start_pos: Coordinate, end_pos: Coordinate) -> None:
+        self._erase(partial(self._rasterize_stroke, points=[start_pos, end_pos], closed=False))
+
+    @action()
+    def erase_lines(self, points: list[Coordinate], closed: bool, filled: bool = False) -> None:
+        self._erase(partial(self._rasterize_stroke, points=points, closed=closed, filled=filled))
+
+    @action()
+    def erase_circle(self, center: Coordinate, radius: int, filled: bool = False) -> None:
+        self._erase(partial(self._rasterize_circle, center=center, radius=radius, filled=filled))
+
+    @action()
+    def erase_rectangle(
+        self, left_top: Coordinate, width_height: Coordinate, filled: bool = False, rotation: int | float = 0
+    ) -> None:
+        self._erase(partial(self._rasterize_rectangle, rect=Rect(left_top, width_height), filled=filled,
+                            rotation=rotation))
 
     @action()
     def bucket_fill(self, point: Coordinate) -> None:
-        target_color = self._get_active_surface().get_at(point)
+        self._require_raster(self._attributes.active_layer)
+        surface = self._get_active_surface()
+        target_color = surface.get_at(point)
         fill_color = self._attributes.brush_color
         if target_color == fill_color:
             return
-        stack = [point]
-        width, height = self._get_active_surface().get_size()
-        while stack:
-            x, y = stack.pop()
-            if x < 0 or x >= width or y < 0 or y >= height:
-                continue
-            if self._get_active_surface().get_at((x, y)) == target_color:
-                self._get_active_surface().set_at((x, y), fill_color)
-                stack.extend([(x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)])
+
+        matches = color_matches(surface, target_color)
+        selection = self._attributes.selection
+        if selection is not None:
+            # Only spread inside the selection
+            inside = np.zeros_like(matches)
+            inside[selection.rect.left:selection.rect.right, selection.rect.top:selection.rect.bottom] = \
+                selection.to_array()
+            matches &= inside
+
+        filled = flood_mask(matches, point)
+        pygame.surfarray.pixels3d(surface)[filled] = tuple(fill_color)[:3]
+        pygame.surfarray.pixels_alpha(surface)[filled] = fill_color.a
+        self._mark_dirty(self._attributes.active_layer, array_bounds(filled))
+
+    @action()
+    def fill_gradient(self, kind: GradientKind, start: Coordinate, end: Coordinate, stops: Sequence[Stop],
+                      target: FillTarget = "layer") -> None:
+        """
+        Paints a linear or radial gradient over the active layer, the background or the selection.
+        """
+        self._paint_fill(target, partial(gradient, kind=kind, start=start, end=end, stops=stops))
+
+    @action()
+    def fill_pattern(self, kind: PatternKind, other_color: pygame.Color | None = None, size: int = 16,
+                     target: FillTarget = "layer") -> None:
+        """
+        Paints a repeating pattern in the brush colour over the active layer, the background or the selection.
+        The gaps are left transparent unless another colour is given.
+        """
+        other_color = pygame.Color(0, 0, 0, 0) if other_color is None else other_color
+        self._paint_fill(target, partial(pattern, kind=kind, color=self._attributes.brush_color,
+                                         other_color=other_color, size=size))
+
+    @action()
+    def erase_shape(self, layer_name: str, shape: int) -> None:
+        """
+        Erases one shape from a vector layer, leaving everything drawn before and after it in place.
+        """
+        self._require_shape(layer_name, shape)
+        self._set_shape_erased(layer_name, shape, True)
+        self._pending_snapshot.append(partial(self._set_shape_erased, layer_name, shape, False))
+
+    @action()
+    def recolor_shape(self, layer_name: str, shape: int, color: pygame.Color) -> None:
+        """
+        Changes the color of one shape on a vector layer.
+        """
+        self._require_shape(layer_name, shape)
+        old = self._recolor_shape(layer_name, shape, color)
+        self._pending_snapshot.append(partial(self._recolor_shape, layer_name, shape, old))
+
+    def _select(self, selection: Selection | None, mode: SelectionMode) -> None:
+        if self._attributes.selection is None:
+            self._attributes.selection = selection if mode in ("replace", "add") else None
+        else:
+            self._attributes.selection = self._attributes.selection.combine(selection, mode)
+
+    @action(update_display=False)
+    def select_rectangle(self, left_top: Coordinate, width_height: Coordinate, mode: SelectionMode = "replace") -> None:
+        self._select(Selection.rectangle(Rect(left_top, width_height), self._screen.get_rect()), mode)
+
+    @action(update_display=False)
+    def select_ellipse(self, left_top: Coordinate, width_height: Coordinate, mode: SelectionMode = "replace") -> None:
+        self._select(Selection.ellipse(Rect(left_top, width_height), self._screen.get_rect()), mode)
+
+    @action(update_display=False)
+    def select_magic_wand(self, point: Coordinate, tolerance: int = 0, mode: SelectionMode = "replace") -> None:
+        """
+        Selects the area of similar color around a point on the active layer, the way bucket_fill would fill it.
+        """
+        surface = self._get_active_surface()
+        matches = color_matches(surface, surface.get_at(point), tolerance)
+        self._select(Selection.from_array(flood_mask(matches, point)), mode)
+
+    @action(update_display=False)
+    def select_none(self) -> None:
+        self._attributes.selection = None
+
+    @action()
+    def fill_selection(self) -> None:
+        selection = self._require_selection()
+        self._require_raster(self._attributes.active_layer)
+        self._remember_pixels(self._attributes.active_layer, selection.rect)
+        self._get_active_surface().blit(selection.stencil(tuple(self._attributes.brush_color)), selection.rect)
+        self._mark_dirty(self._attributes.active_layer, selection.rect)
+
+    @action()
+    def clear_selection(self) -> None:
+        selection = self._require_selection()
+        self._require_raster(self._attributes.active_layer)
+        self._remember_pixels(self._attributes.active_layer, selection.rect)
+        selection.clear(self._get_active_surface())
+        self._mark_dirty(self._attributes.active_layer, selection.rect)
+
+    @action(update_display=False)
+    def copy_selection(self) -> None:
+        selection = self._require_selection()
+        self._attributes.clipboard = (selection.cut_out(self._get_active_surface()), selection.rect)
+
+    @action()
+    def paste(self, left_top: Coordinate | None = None) -> None:
+        """
+        Pastes the copied pixels onto the active layer, where they were copied from unless a position is given.
+        The pasted pixels become the selection.
+        """
+        if self._attributes.clipboard is None:
+            raise ValueError("Nothing has been copied.")
+
+        self._require_raster(self._attributes.active_layer)
+        pixels, source = self._attributes.clipboard
+        destination = source if left_top is None else pixels.get_rect(topleft=left_top)
+        self._remember_pixels(self._attributes.active_layer, destination)
+        self._remember_selection()
+
+        self._get_active_surface().blit(pixels, destination)
+        self._mark_dirty(self._attributes.active_layer, destination)
+        self._attributes.selection = Selection.from_stencil(pixels, destination.topleft, self._screen.get_rect())
+
+    @action()
+    def transform_selection(
+        self,
+        offset: Coordinate = (0, 0),
+        scale: tuple[float, float] = (1, 1),
+        angle: int | float = 0,
+        flip: tuple[bool, bool] = (False, False),
+        quality: TransformQuality = "smooth",
+    ) -> None:
+        """
+        Moves, scales, rotates and flips the selected pixels of the active layer about the selection's center.
+        The selection moves along with them.
+        """
+        selection = self._require_selection()
+        self._remember_selection()
+        self._attributes.selection = self._transform_pixels(
+            self._attributes.active_layer, selection, offset, scale, angle, flip, quality
+        )
+
+    def get_selection(self) -> Rect | None:
+        return None if self._attributes.selection is None else Rect(self._attributes.selection.rect)
 
     @action(update_display=False)
-    def add_layer(self, name: str) -> None:
+    def add_layer(self, name: str, vector: bool = False) -> None:
+        """
+        Adds a layer on top of the others. A vector layer keeps the shapes drawn on it rather than their pixels.
+        """
         if name in self._attributes.layers:
             return
-        new_layer = Layer(name, SCREEN_WIDTH, SCREEN_HEIGHT)
-        self._attributes.layers[name] = new_layer
-        self._attributes.layers_order.append(name)
+        layer_type = VectorLayer if vector else Layer
+        self._attributes.layers.append(layer_type(name, SCREEN_WIDTH, SCREEN_HEIGHT))
 
     @action()
     def remove_layer(self, name: str) -> None:
         if name in self._attributes.layers and name != "base":
-            del self._attributes.layers[name]
-            self._attributes.layers_order.remove(name)
+            self._invalidate_composite(self._attributes.layers.remove(name))
+            self._summaries.pop(name, None)
             # Reset active layer if needed.
             if self._attributes.active_layer == name:
                 self._attributes.active_layer = "base"
 
+    @action()
+    def move_layer(self, name: str, position: int) -> None:
+        """
+        Moves a layer to a position in the stack, 0 being directly above the background.
+        """
+        if not self.layer_exists(name):
+            raise ValueError(f"Layer '{name}' does not exist.")
+        if name == "background":
+            raise ValueError("The background layer can't be moved.")
+
+        # The background always stays at the bottom
+        self._invalidate_composite(self._attributes.layers.move(name, position + 1))
+
+    @action()
+    def reorder_layers(self, names: list[str]) -> None:
+        """
+        Rearranges every layer except the background, listed from bottom to top.
+        """
+        self._invalidate_composite(self._attributes.layers.reorder(["background", *names]))
+
+    @action()
+    def merge_down(self, name: str) -> str:
+        """
+        Merges a layer into the one directly below it and frees the merged layer.
+
+        The layer's opacity and blend mode are baked into the lower layer's pixels, and the lower layer keeps its
+        own name, opacity and blend mode. Where the lower layer is transparent, the merged pixels are painted in
+        as they are.
+
+        Returns:
+            str: The name of the layer that was merged into.
+        """
+        layers = self._attributes.layers
+        if not self.layer_exists(name):
+            raise ValueError(f"Layer '{name}' does not exist.")
+        if name in ("background", "base"):
+            raise ValueError(f"The '{name}' layer can't be merged down.")
+
+        index = layers.index(name)
+        below = list(layers)[index - 1]
+        if below == "background":
+            raise ValueError(f"There is no layer below '{name}' to merge into.")
+        self._require_raster(below)
+
+        upper, lower = layers[name], layers[below]
+        area = Rect(0, 0, 0, 0)
+        if upper.visible:
+            area = merge_layer(lower.surface, upper.surface, upper.opacity, upper.blend_mode)
+        layers.remove(name)
+        self._summaries.pop(name, None)
+        if self._attributes.active_layer == name:
+            self._attributes.active_layer = below
+        self._mark_dirty(below, area)
+        return below
+
+    @action()
+    def flatten_visible(self) -> str:
+        """
+        Merges every visible layer above the background into one in a single pass, freeing the others.
+
+        The result goes into "base" if it is visible, otherwise into the lowest visible layer, and takes the
+        lowest merged position. Hidden layers are left untouched.
+
+        Returns:
+            str: The name of the flattened layer.
+        """
+        layers = self._attributes.layers
+        visible = [name for name, layer in layers.items() if layer.visible and name != "background"]
+        if not visible:
+            raise ValueError("There are no visible layers to flatten.")
+
+        target = "base" if "base" in visible else visible[0]
+        self._require_raster(target)
+        lowest = layers.index(visible[0])
+
+        flattened = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
+        for name in visible:
+            layer = layers[name]
+            merge_layer(flattened, layer.surface, layer.opacity, layer.blend_mode)
+
+        for name in visible:
+            self._summaries.pop(name, None)
+            if name != target:
+                layers.remove(name)
+        layer = layers[target]
+        layer.surface = flattened
+        layer.opacity = 1.0
+        layer.blend_mode = "normal"
+        layers.move(target, lowest)
+
+        if self._attributes.active_layer not in layers:
+            self._attributes.active_layer = target
+        self._invalidate_composite(lowest)
+        return target
+
+    @action()
+    def duplicate_layer(self, name: str, new_name: str) -> None:
+        """
+        Copies a layer, with its visibility, opacity and blend mode, to a new layer directly above it.
+        """
+        layers = self._attributes.layers
+        if not self.layer_exists(name):
+            raise ValueError(f"Layer '{name}' does not exist.")
+        if self.layer_exists(new_name):
+            raise ValueError(f"Layer '{new_name}' already exists.")
+
+        layers.append(layers[name].copy(new_name))
+        self._invalidate_composite(layers.move(new_name, layers.index(name) + 1))
+
+    @action()
+    def translate_layer(self, name: str, dx: int, dy: int) -> None:
+        self._transform_pixels(name, offset=(dx, dy))
+
+    @action()
+    def scale_layer(self, name: str, scale_x: float, scale_y: float, quality: TransformQuality = "smooth") -> None:
+        """
+        Scales the drawn part of a layer about its center.
+        """
+        self._transform_pixels(name, scale=(scale_x, scale_y), quality=quality)
+
+    @action()
+    def rotate_layer(self, name: str, angle: int | float, quality: TransformQuality = "smooth") -> None:
+        """
+        Rotates the drawn part of a layer clockwise about its center.
+        """
+        self._transform_pixels(name, angle=angle, quality=quality)
+
+    @action()
+    def flip_layer(self, name: str, horizontal: bool, vertical: bool) -> None:
+        """
+        Mirrors the drawn part of a layer in place.
+        """
+        self._transform_pixels(name, flip=(horizontal, vertical))
+
     @action()
     def set_layer_visibility(self, name: str, visibility: float) -> None:
         """
@@ -231,8 +927,19 @@ class Canvas:
 
         layer = self._attributes.layers[name]
         layer.visible = visibility > 0  # Treat visibility > 0 as "visible"
-        layer.surface.set_alpha(int(visibility * 255))  # Scale visibility to alpha (0-255)
-        self._composite_layers()  # Re-composite layers to reflect the change
+        layer.opacity = visibility
+        self._invalidate_composite(self._attributes.layers.index(name))
+
+    @action()
+    def set_layer_blend_mode(self, name: str, mode: BlendMode) -> None:
+        """
+        Sets how a layer's colors combine with the layers below it.
+        """
+        if not self.layer_exists(name):
+            raise ValueError(f"Layer '{name}' does not exist.")
+
+        self._attributes.layers[name].blend_mode = mode
+        self._invalidate_composite(self._attributes.layers.index(name))
 
     @action(update_display=False)
     def switch_active_layer(self, name: str) -> None:
@@ -242,8 +949,172 @@ class Canvas:
     def get_active_layer(self) -> str:
         return self._attributes.active_layer
 
+    def get_brush_color(self) -> pygame.Color:
+        return pygame.Color(self._attributes.brush_color)
+
+    def get_brush_tip(self) -> tuple[BrushTip, float, float]:
+        return self._attributes.brush_tip, self._attributes.tip_spacing, self._attributes.tip_scatter
+
+    def get_stroke_style(self) -> tuple[CapStyle, JoinStyle, bool]:
+        return self._attributes.cap_style, self._attributes.join_style, self._attributes.antialias
+
+    def get_layer_order(self) -> list[str]:
+        return list(self._attributes.layers)
+
+    def can_undo(self) -> bool:
+        return self._actions[-1].func.__name__ != "finish_setup"
+
+    def has_clipboard(self) -> bool:
+        return self._attributes.clipboard is not None
+
+    def _summary(self, name: str) -> SurfaceSummary:
+        if name not in self._summaries:
+            self._summaries[name] = SurfaceSummary()
+        return self._summaries[name]
+
+    def get_layers_info(self) -> list[dict[str, Any]]:
+        """
+        Describes every layer from the bottom up, including the bounding box of what is drawn on it.
+        """
+        return [
+            {
+                "name": name,
+                "position": position,
+                "visible": layer.visible,
+                "opacity": layer.opacity,
+                "blend_mode": layer.blend_mode,
+                "active": name == self._attributes.active_layer,
+                "bounds": self._summary(name).bounding_rect(layer.surface),
+            }
+            for position, (name, layer) in enumerate(self._attributes.layers.items())
+        ]
+
+    def get_pixel_color(self, point: Coordinate, layer_name: str | None = None) -> pygame.Color:
+        """
+        Returns the color of a pixel as shown on the canvas, or on one layer if a name is given.
+        """
+        if layer_name is None:
+            return self._screen.get_at(point)
+        if not self.layer_exists(layer_name):
+            raise ValueError(f"Layer '{layer_name}' does not exist.")
+        return self._attributes.layers[layer_name].surface.get_at(point)
+
+    def find_shape(self, point: Coordinate, layer_name: str | None = None) -> tuple[str, int] | None:
+        """
+        Finds the topmost shape drawn at a point on the visible vector layers, or on one layer if a name is given.
+
+        Returns:
+            tuple[str, int] | None: The name of the layer and the number of the shape on it, or None if no shape
+                was found.
+        """
+        layers = self._attributes.layers
+        if layer_name is None:
+            names = [name for name in reversed(list(layers)) if layers[name].visible]
+        elif self.layer_exists(layer_name):
+            names = [layer_name]
+        else:
+            raise ValueError(f"Layer '{layer_name}' does not exist.")
+
+        for name in names:
+            layer = layers[name]
+            shape = layer.shape_at(point) if isinstance(layer, VectorLayer) else None
+            if shape is not None:
+                return name, shape
+        return None
+
+    def get_shape_info(self, layer_name: str, shape: int) -> dict[str, Any]:
+        """
+        Describes one shape on a vector layer: its kind, color and bounding box.
+        """
+        layer = self._require_shape(layer_name, shape)
+        record = layer.shapes[shape]
+        return {
+            "kind": PRIMITIVE_KINDS[record["kind"]],
+            "color": pygame.Color(*record["color"].tolist()),
+            "bounds": layer.shapes.bounds(shape).clip(self._screen.get_rect()),
+        }
+
+    def has_shapes(self) -> bool:
+        return any(
+            isinstance(layer, VectorLayer) and layer.shapes.drawn() for layer in self._attributes.layers.values()
+        )
+
+    def describe_region(self, area: Rect | None = None, layer_name: str | None = None, count: int = 3) -> RegionSummary:
+        """
+        Summarizes an area of the canvas, or of one layer if a name is given.
+
+        On the canvas, a pixel is covered when it differs from the background; on a layer, when it isn't
+        transparent.
+        """
+        if layer_name is None:
+            background = self._attributes.layers["background"].surface
+            return self._screen_summary.describe(self._screen, area, count, reference=background)
+        if not self.layer_exists(layer_name):
+            raise ValueError(f"Layer '{layer_name}' does not exist.")
+        return self._summary(layer_name).describe(self._attributes.layers[layer_name].surface, area, count)
+
+    def changed_fraction(self) -> float:
+        """
+        Returns roughly how much of the canvas has changed since the last thumbnail, between 0 and 1.
+        """
+        return min(self._changed_pixels / (SCREEN_WIDTH * SCREEN_HEIGHT), 1.0)
+
+    def take_dirty_area(self) -> Rect | None:
+        """
+        Returns the bounding box of what changed since the last call, or None if nothing did.
+        """
+        area, self._dirty_area = self._dirty_area, None
+        return area
+
+    def take_thumbnail(self, size: tuple[int, int]) -> np.ndarray:
+        """
+        Returns the composite downscaled to the given size as a (width, height, 3) array.
+
+        The thumbnail is only rescaled when the canvas changed since the last one was taken.
+        """
+        if self._thumbnail is None or self._changed_pixels or self._thumbnail.shape[:2] != size:
+            self._thumbnail = pygame.surfarray.array3d(pygame.transform.smoothscale(self._screen, size))
+            self._thumbnail.flags.writeable = False
+            self._changed_pixels = 0
+        return self._thumbnail
+
     def layer_exists(self, layer_name: str) -> bool:
         return layer_name in self._attributes.layers
 
-    def export(self, filename: str, filetype: str, save_dir: Path = Path(os.getcwd())) -> None:
-        pygame.image.save(self._screen, save_dir / f"{filename}.{filetype}")
+    def is_vector_layer(self, layer_name: str) -> bool:
+        return isinstance(self._attributes.layers.get(layer_name), VectorLayer)
+
+    def render(self, scale: int = 1) -> pygame.Surface:
+        """
+        Composites the visible layers at scale times the size of the canvas.
+
+        Vector layers are rasterized again at that size, so their shapes stay sharp; the pixels of other layers
+        are enlarged without smoothing. Nothing is kept once the image is returned.
+        """
+        if scale == 1:
+            return self._screen.copy()
+
+        image = pygame.Surface((SCREEN_WIDTH * scale, SCREEN_HEIGHT * scale))
+        image.fill(COLORS["white"])
+        for layer in self._attributes.layers.values():
+            if not layer.visible:
+                continue
+            if isinstance(layer, VectorLayer):
+                pixels = layer.render(scale)
+            else:
+                pixels = pygame.transform.scale(layer.surface, image.get_size())
+            blend_layer(image, pixels, layer.opacity, layer.blend_mode)
+        return image
+
+    def export(self, filename: str, filetype: str, save_dir: Path = Path(os.getcwd()), scale: int = 1) -> None:
+        """
+        Saves the drawing as an image, scale times the size of the canvas, or as SVG with the shapes of vector
+        layers as SVG elements.
+        """
+        path = save_dir / f"{filename}.{filetype}"
+        if filetype == "svg":
+            path.write_text(layers_to_svg(self._attributes.layers.values(), (SCREEN_WIDTH, SCREEN_HEIGHT)))
+        elif scale == 1:
+            pygame.image.save(self._screen, path)
+        else:
+            pygame.image.save(self.render(scale), path)
@@ -1,11 +1,16 @@
 import random
 import string
 import pytest
+import pygame
 
 from typing import Final
 
 from .canvas import Canvas, Coordinate
-from .constants import SCREEN_WIDTH, SCREEN_HEIGHT, BEZIER_STEPS
+from .brushes import BRUSH_TIPS
+from .constants import SCREEN_WIDTH, SCREEN_HEIGHT, MAX_BRUSH_WIDTH
+from .curves import CURVE_MODES
+from .stroke import CAP_STYLES, JOIN_STYLES
+from .transforms import TRANSFORM_QUALITIES
 
 
 REPEAT_AMOUNT: Final[int] = 1000
@@ -17,6 +22,10 @@ def setup_canvas() -> Canvas:
     return Canvas()
 
 
+def layer_bounds(canvas: Canvas, name: str) -> pygame.Rect | None:
+    return next(info["bounds"] for info in canvas.get_layers_info() if info["name"] == name)
+
+
 def random_coordinate() -> Coordinate:
     return random.randint(0, SCREEN_WIDTH), random.randint(0, SCREEN_HEIGHT)
 
@@ -44,7 +53,7 @@ def test_draw_curve():
     canvas = setup_canvas()
 
     for _ in range(REPEAT_AMOUNT):
-        canvas.draw_curve([random_coordinate() for _ in range(random.randint(3, 10))], BEZIER_STEPS)
+        canvas.draw_curve([random_coordinate() for _ in range(random.randint(3, 10))], random.choice(CURVE_MODES))
 
 
 def test_draw_circle():
@@ -72,6 +81,123 @@ def test_draw_triangle():
         )
 
 
+def test_draw_regular_polygon():
+    canvas = setup_canvas()
+
+    for _ in range(REPEAT_AMOUNT):
+        canvas.draw_regular_polygon(
+            random_coordinate(),
+            random.randint(1, max(SCREEN_HEIGHT, SCREEN_WIDTH)),
+            random.randint(3, 64),
+            random.uniform(0, 360),
+            random.choice((True, False))
+        )
+
+
+def test_draw_star():
+    canvas = setup_canvas()
+
+    for _ in range(REPEAT_AMOUNT):
+        canvas.draw_star(
+            random_coordinate(),
+            random.randint(1, max(SCREEN_HEIGHT, SCREEN_WIDTH)),
+            random.randint(1, max(SCREEN_HEIGHT, SCREEN_WIDTH)),
+            random.randint(2, 32),
+            random.uniform(0, 360),
+            random.choice((True, False))
+        )
+
+
+def test_draw_rotated_rectangle():
+    canvas = setup_canvas()
+
+    for _ in range(REPEAT_AMOUNT):
+        canvas.draw_rectangle(random_coordinate(), random_coordinate(), random.choice((True, False)),
+                              random.uniform(0, 360))
+
+
+def test_thick_strokes():
+    canvas = setup_canvas()
+
+    for _ in range(REPEAT_AMOUNT // 10):
+        canvas.set_brush_width(random.randint(1, MAX_BRUSH_WIDTH))
+        canvas.set_stroke_style(random.choice(CAP_STYLES), random.choice(JOIN_STYLES), random.choice((True, False)))
+
+        canvas.draw_line(random_coordinate(), random_coordinate())
+        canvas.draw_lines([random_coordinate() for _ in range(random.randint(3, 10))], random.choice((True, False)))
+        canvas.draw_curve([random_coordinate() for _ in range(random.randint(3, 10))], random.choice(CURVE_MODES))
+        canvas.draw_circle(random_coordinate(), random.randint(1, max(SCREEN_HEIGHT, SCREEN_WIDTH)))
+        canvas.draw_rectangle(random_coordinate(), random_coordinate())
+        canvas.draw_triangle(random_coordinate(), random.randint(1, max(SCREEN_HEIGHT, SCREEN_WIDTH)),
+                             random.uniform(0, 120))
+
+
+def test_brush_width():
+    canvas = setup_canvas()
+
+    canvas.draw_line((100, 100), (200, 100))
+    assert canvas.get_pixel_color((150, 104), "base").a == 0
+
+    canvas.set_brush_width(10)
+    canvas.draw_line((100, 200), (200, 200))
+    assert canvas.get_pixel_color((150, 204), "base").a != 0
+
+    # Square caps extend past the end point, butt caps stop at it
+    canvas.set_stroke_style("square", "miter", False)
+    canvas.draw_line((100, 300), (200, 300))
+    assert canvas.get_pixel_color((203, 300), "base").a != 0
+
+    canvas.set_stroke_style("butt", "miter", False)
+    canvas.draw_line((100, 400), (200, 400))
+    assert canvas.get_pixel_color((203, 400), "base").a == 0
+
+
+def test_filled_shapes():
+    canvas = setup_canvas()
+
+    canvas.draw_circle((100, 100), 40, filled=True)
+    canvas.draw_rectangle((200, 60), (80, 80), filled=True)
+    canvas.draw_triangle((100, 300), 100, 0, filled=True)
+    canvas.draw_lines([(250, 250), (350, 250), (350, 350), (250, 350)], False, filled=True)
+
+    for point in ((100, 100), (240, 100), (100, 300), (300, 300)):
+        assert canvas.get_pixel_color(point, "base") == canvas.get_brush_color()
+
+    # Unfilled shapes keep their inside empty
+    canvas.draw_circle((400, 100), 40)
+    assert canvas.get_pixel_color((400, 100), "base").a == 0
+
+
+def test_brush_tips():
+    canvas = setup_canvas()
+
+    for _ in range(REPEAT_AMOUNT // 10):
+        canvas.set_brush_width(random.randint(1, MAX_BRUSH_WIDTH))
+        canvas.set_brush_tip(random.choice(BRUSH_TIPS), random.uniform(0.05, 4),
+                             random.choice((0, random.uniform(0, 10))))
+
+        canvas.draw_line(random_coordinate(), random_coordinate())
+        canvas.draw_lines([random_coordinate() for _ in range(random.randint(3, 10))], random.choice((True, False)))
+        canvas.draw_curve([random_coordinate() for _ in range(random.randint(3, 10))], random.choice(CURVE_MODES))
+        canvas.draw_circle(random_coordinate(), random.randint(1, max(SCREEN_HEIGHT, SCREEN_WIDTH)))
+        canvas.draw_rectangle(random_coordinate(), random_coordinate())
+
+
+def test_spray_is_replayed_exactly():
+    canvas = setup_canvas()
+
+    canvas.set_brush_width(6)
+    canvas.set_brush_tip("round", 0.5, 3)
+    canvas.draw_line((50, 250), (450, 250))
+    before = pygame.image.tobytes(canvas.render(), "RGB")
+
+    # Undo replays every action, so the random spray has to land in the same place again
+    canvas.draw_line((0, 0), (10, 10))
+    canvas.undo()
+
+    assert pygame.image.tobytes(canvas.render(), "RGB") == before
+
+
 def test_layers():
     canvas = setup_canvas()
 
@@ -129,6 +255,211 @@ def test_layer_visibility():
             canvas.set_layer_visibility(layer_name, random.random())
 
 
+def test_layer_opacity_keeps_pixels():
+    canvas = setup_canvas()
+    canvas.set_brush_color(pygame.Color(255, 0, 0))
+    canvas.draw_rectangle((100, 100), (50, 50), filled=True)
+
+    canvas.set_layer_visibility("base", 0.5)
+
+    # The layer's own pixels are untouched, only the composite is faded
+    assert canvas.get_pixel_color((120, 120), "base") == pygame.Color(255, 0, 0)
+    assert canvas.get_pixel_color((120, 120)) == pygame.Color(255, 127, 127)
+
+    canvas.set_layer_visibility("base", 1)
+    assert canvas.get_pixel_color((120, 120)) == pygame.Color(255, 0, 0)
+
+
+def test_layer_blend_modes():
+    canvas = setup_canvas()
+    canvas.set_background(pygame.Color(100, 100, 100))
+    canvas.set_brush_color(pygame.Color(200, 50, 0))
+    canvas.draw_rectangle((100, 100), (50, 50), filled=True)
+
+    expected = {
+        "normal": (200, 50, 0),
+        "multiply": (78, 20, 0),
+        "screen": (222, 130, 100),
+        "add": (255, 150, 100),
+        "overlay": (157, 39, 0),
+    }
+
+    for mode, color in expected.items():
+        canvas.set_layer_blend_mode("base", mode)
+        assert tuple(canvas.get_pixel_color((120, 120)))[:3] == pytest.approx(color, abs=1)
+        # Transparent parts of the layer leave the background alone in every mode
+        assert tuple(canvas.get_pixel_color((300, 300)))[:3] == (100, 100, 100)
+
+    with pytest.raises(ValueError):
+        canvas.set_layer_blend_mode(random_string(), "multiply")
+
+
+def test_move_and_reorder_layers():
+    canvas = setup_canvas()
+    for name in ("a", "b", "c"):
+        canvas.add_layer(name)
+    assert canvas.get_layer_order() == ["background", "base", "a", "b", "c"]
+
+    canvas.move_layer("c", 0)
+    assert canvas.get_layer_order() == ["background", "c", "base", "a", "b"]
+    # Positions past the top are clamped
+    canvas.move_layer("base", REPEAT_AMOUNT)
+    assert canvas.get_layer_order() == ["background", "c", "a", "b", "base"]
+
+    canvas.reorder_layers(["base", "a", "b", "c"])
+    assert canvas.get_layer_order() == ["background", "base", "a", "b", "c"]
+
+    with pytest.raises(ValueError):
+        canvas.move_layer("background", 1)
+    with pytest.raises(ValueError):
+        canvas.move_layer(random_string(), 1)
+    with pytest.raises(ValueError):
+        canvas.reorder_layers(["base", "a", "b"])
+    with pytest.raises(ValueError):
+        canvas.reorder_layers(["background", "base", "a", "b", "c"])
+
+
+def test_reordering_updates_composite():
+    canvas = setup_canvas()
+    canvas.set_brush_color(pygame.Color(255, 0, 0))
+    canvas.draw_rectangle((100, 100), (50, 50), filled=True)
+    canvas.add_layer("top")
+    canvas.switch_active_layer("top")
+    canvas.set_brush_color(pygame.Color(0, 0, 255))
+    canvas.draw_rectangle((100, 100), (50, 50), filled=True)
+    assert canvas.get_pixel_color((120, 120)) == pygame.Color(0, 0, 255)
+
+    canvas.move_layer("top", 0)
+    assert canvas.get_pixel_color((120, 120)) == pygame.Color(255, 0, 0)
+
+    # Drawing on a layer above the active one still shows through the cached composite below it
+    canvas.switch_active_layer("top")
+    canvas.draw_rectangle((200, 200), (50, 50), filled=True)
+    assert canvas.get_pixel_color((120, 120)) == pygame.Color(255, 0, 0)
+    assert canvas.get_pixel_color((220, 220)) == pygame.Color(0, 0, 255)
+
+    canvas.undo()
+    assert canvas.get_layer_order() == ["background", "top", "base"]
+    assert canvas.get_pixel_color((220, 220)) == pygame.Color(255, 255, 255)
+
+
+def test_merge_down():
+    canvas = setup_canvas()
+    canvas.set_brush_color(pygame.Color(255, 0, 0))
+    canvas.draw_rectangle((100, 100), (50, 50), filled=True)
+    canvas.add_layer("top")
+    canvas.switch_active_layer("top")
+    canvas.set_brush_color(pygame.Color(0, 0, 255))
+    # Inside the lower layer's pixels, so every blend mode has a backdrop to blend with
+    canvas.draw_rectangle((110, 110), (30, 30), filled=True)
+
+    for mode in ("normal", "multiply", "screen", "overlay"):
+        canvas.set_layer_blend_mode("top", mode)
+        canvas.set_layer_visibility("top", 0.5)
+        before = pygame.surfarray.array3d(canvas.render())
+
+        assert canvas.merge_down("top") == "base"
+        assert canvas.get_layer_order() == ["background", "base"]
+        assert canvas.get_active_layer() == "base"
+        # Merging never changes what the canvas looks like
+        assert abs(pygame.surfarray.array3d(canvas.render()).astype(int) - before).max() <= 2
+
+        canvas.undo()
+        assert canvas.get_layer_order() == ["background", "base", "top"]
+
+    with pytest.raises(ValueError):
+        canvas.merge_down("base")
+    with pytest.raises(ValueError):
+        canvas.merge_down(random_string())
+
+
+def test_flatten_visible():
+    canvas = setup_canvas()
+    canvas.set_brush_color(pygame.Color(255, 0, 0))
+    canvas.draw_rectangle((100, 100), (50, 50), filled=True)
+    for name in ("a", "b", "hidden"):
+        canvas.add_layer(name)
+        canvas.switch_active_layer(name)
+        canvas.draw_circle(random_coordinate(), random.randint(5, 50), filled=True)
+    canvas.set_layer_visibility("hidden", 0)
+    canvas.set_layer_visibility("b", 0.5)
+    before = pygame.surfarray.array3d(canvas.render())
+
+    assert canvas.flatten_visible() == "base"
+    assert canvas.get_layer_order() == ["background", "base", "hidden"]
+    assert canvas.get_active_layer() == "hidden"
+    assert abs(pygame.surfarray.array3d(canvas.render()).astype(int) - before).max() <= 2
+
+
+def test_duplicate_layer():
+    canvas = setup_canvas()
+    canvas.add_layer("top")
+    canvas.set_brush_color(pygame.Color(255, 0, 0))
+    canvas.draw_rectangle((100, 100), (50, 50), filled=True)
+
+    canvas.duplicate_layer("base", "copy")
+    assert canvas.get_layer_order() == ["background", "base", "copy", "top"]
+
+    # The copy has its own pixels
+    canvas.switch_active_layer("copy")
+    canvas.clear_canvas()
+    canvas.switch_active_layer("base")
+    canvas.draw_rectangle((100, 100), (50, 50), filled=True)
+    assert canvas.get_pixel_color((120, 120), "copy").a == 0
+
+    with pytest.raises(ValueError):
+        canvas.duplicate_layer("base", "top")
+    with pytest.raises(ValueError):
+        canvas.duplicate_layer(random_string(), "other")
+
+
+def test_layer_transforms():
+    canvas = setup_canvas()
+    canvas.set_brush_color(pygame.Color(255, 0, 0))
+    canvas.draw_rectangle((100, 100), (40, 20), filled=True)
+
+    canvas.translate_layer("base", 50, -50)
+    assert layer_bounds(canvas, "base") == pygame.Rect(150, 50, 40, 20)
+
+    canvas.flip_layer("base", True, True)
+    assert layer_bounds(canvas, "base") == pygame.Rect(150, 50, 40, 20)
+
+    canvas.rotate_layer("base", 90, "nearest")
+    assert layer_bounds(canvas, "base") == pygame.Rect(160, 40, 20, 40)
+
+    canvas.scale_layer("base", 2, 0.5, random.choice(TRANSFORM_QUALITIES))
+    assert layer_bounds(canvas, "base") == pygame.Rect(150, 50, 40, 20)
+
+    with pytest.raises(ValueError):
+        canvas.rotate_layer("background", 45)
+    with pytest.raises(ValueError):
+        canvas.translate_layer(random_string(), 1, 1)
+
+
+def test_transform_undo_restores_pixels():
+    canvas = setup_canvas()
+    for _ in range(10):
+        canvas.draw_line(random_coordinate(), random_coordinate())
+    before = pygame.image.tobytes(canvas.render(), "RGB")
+
+    canvas.rotate_layer("base", random.randint(1, 359))
+    canvas.scale_layer("base", 1.5, 0.75)
+    canvas.undo()
+    canvas.undo()
+
+    assert pygame.image.tobytes(canvas.render(), "RGB") == before
+    assert canvas.get_layer_order() == ["background", "base"]
+
+    # A replay that runs through a transform reproduces it exactly
+    canvas.translate_layer("base", 10, 10)
+    moved = pygame.image.tobytes(canvas.render(), "RGB")
+    canvas.add_layer("other")
+    canvas.undo()
+    assert pygame.image.tobytes(canvas.render(), "RGB") == moved
+    canvas.undo()
+    assert pygame.image.tobytes(canvas.render(), "RGB") == before
+
+
 def test_bucket_fill():
     canvas = setup_canvas()
 
@@ -141,6 +472,229 @@ def test_bucket_fill():
         canvas.bucket_fill(coords)
 
 
+def test_bucket_fill_matches_neighbours_only():
+    canvas = setup_canvas()
+    canvas.set_brush_width(3)
+    canvas.draw_rectangle((100, 100), (100, 100))
+    canvas.set_brush_color(pygame.Color(0, 255, 0))
+    canvas.bucket_fill((150, 150))
+
+    assert canvas.get_pixel_color((150, 150), "base") == pygame.Color(0, 255, 0)
+    assert canvas.get_pixel_color((105, 105), "base") == pygame.Color(0, 255, 0)
+    # The outline stops the fill
+    assert canvas.get_pixel_color((100, 150), "base") == pygame.Color(0, 0, 0)
+    assert canvas.get_pixel_color((50, 50), "base").a == 0
+
+
+def test_eraser():
+    canvas = setup_canvas()
+    canvas.set_brush_color(pygame.Color(200, 0, 0))
+    canvas.draw_rectangle((100, 100), (200, 200), filled=True)
+    before = pygame.image.tobytes(canvas.render(), "RGB")
+
+    canvas.set_brush_width(10)
+    canvas.take_dirty_area()
+    canvas.erase_line((150, 200), (250, 200))
+    assert canvas.get_pixel_color((200, 200), "base").a == 0
+    assert canvas.get_pixel_color((200, 220), "base") == pygame.Color(200, 0, 0)
+    # Only the stroke's bounding box changed
+    dirty = canvas.take_dirty_area()
+    assert dirty is not None and dirty.width < 120 and dirty.height < 20
+
+    canvas.erase_circle((150, 150), 20, filled=True)
+    canvas.erase_rectangle((240, 240), (40, 40), rotation=45)
+    canvas.erase_lines([(0, 0), (400, 0), (400, 400)], closed=False, filled=True)
+    assert canvas.get_pixel_color((150, 150), "base").a == 0
+    assert canvas.get_pixel_color((290, 110), "base").a == 0
+
+    # Soft brush tips erase partly
+    canvas.set_stroke_style("round", "round", True)
+    canvas.set_brush_tip("soft", 0.25, 0)
+    canvas.erase_line((110, 280), (180, 280))
+    assert any(0 < canvas.get_pixel_color((145, y), "base").a < 255 for y in range(270, 290))
+
+    for _ in range(7):
+        canvas.undo()
+    assert pygame.image.tobytes(canvas.render(), "RGB") == before
+
+    canvas.add_layer("shapes", vector=True)
+    canvas.switch_active_layer("shapes")
+    with pytest.raises(ValueError):
+        canvas.erase_line((0, 0), (10, 10))
+
+
+def test_selections():
+    canvas = setup_canvas()
+    bounds = pygame.Rect(0, 0, SCREEN_WIDTH, SCREEN_HEIGHT)
+
+    canvas.select_rectangle((100, 100), (50, 50))
+    assert canvas.get_selection() == pygame.Rect(100, 100, 50, 50)
+    canvas.select_rectangle((125, 100), (50, 50), "add")
+    assert canvas.get_selection() == pygame.Rect(100, 100, 75, 50)
+    canvas.select_rectangle((100, 100), (50, 50), "subtract")
+    assert canvas.get_selection() == pygame.Rect(150, 100, 25, 50)
+    canvas.select_ellipse((140, 90), (20, 80), "intersect")
+    assert canvas.get_selection() == pygame.Rect(150, 100, 10, 50)
+
+    # Selections never reach past the canvas
+    canvas.select_ellipse((-50, -50), (100, 100))
+    assert canvas.get_selection() == pygame.Rect(0, 0, 50, 50)
+    canvas.select_rectangle(bounds.bottomright, (10, 10))
+    assert canvas.get_selection() is None
+
+    canvas.select_ellipse(random_coordinate(), random_coordinate())
+    canvas.select_none()
+    assert canvas.get_selection() is None
+    with pytest.raises(ValueError):
+        canvas.fill_selection()
+
+
+def test_magic_wand_and_region_operations():
+    canvas = setup_canvas()
+    canvas.set_brush_color(pygame.Color(255, 0, 0))
+    canvas.draw_rectangle((100, 100), (50, 50), filled=True)
+    canvas.draw_rectangle((300, 300), (50, 50), filled=True)
+
+    canvas.select_magic_wand((120, 120))
+    assert canvas.get_selection() == pygame.Rect(100, 100, 50, 50)
+
+    canvas.set_brush_color(pygame.Color(0, 0, 255))
+    canvas.fill_selection()
+    assert canvas.get_pixel_color((120, 120), "base") == pygame.Color(0, 0, 255)
+    assert canvas.get_pixel_color((320, 320), "base") == pygame.Color(255, 0, 0)
+
+    # Bucket fill stays inside the selection
+    canvas.select_rectangle((100, 100), (20, 50))
+    canvas.set_brush_color(pygame.Color(0, 255, 0))
+    canvas.bucket_fill((110, 110))
+    assert canvas.get_pixel_color((110, 110), "base") == pygame.Color(0, 255, 0)
+    assert canvas.get_pixel_color((130, 110), "base") == pygame.Color(0, 0, 255)
+
+    canvas.copy_selection()
+    canvas.clear_selection()
+    assert canvas.get_pixel_color((110, 110), "base").a == 0
+    canvas.paste((200, 200))
+    assert canvas.get_pixel_color((210, 210), "base") == pygame.Color(0, 255, 0)
+    assert canvas.get_selection() == pygame.Rect(200, 200, 20, 50)
+
+    canvas.transform_selection((10, 0), (1, 1), 90, (False, False), "nearest")
+    assert canvas.get_selection() == pygame.Rect(195, 215, 50, 20)
+    assert canvas.get_pixel_color((200, 230), "base") == pygame.Color(0, 255, 0)
+    assert canvas.get_pixel_color((200, 210), "base").a == 0
+
+
+def test_region_undo_restores_pixels_and_selection():
+    canvas = setup_canvas()
+    for _ in range(10):
+        canvas.draw_line(random_coordinate(), random_coordinate())
+    canvas.select_ellipse((100, 100), (200, 150))
+    before = pygame.image.tobytes(canvas.render(), "RGB")
+
+    canvas.transform_selection((random.randint(-50, 50), random.randint(-50, 50)), (1.5, 0.5), 30)
+    canvas.fill_selection()
+    canvas.undo()
+    canvas.undo()
+
+    assert canvas.get_selection() == pygame.Rect(100, 100, 200, 150)
+    assert pygame.image.tobytes(canvas.render(), "RGB") == before
+
+    with pytest.raises(ValueError):
+        canvas.paste()
+
+
+def test_layers_info():
+    canvas = setup_canvas()
+    canvas.add_layer("top")
+    canvas.set_layer_visibility("top", 0.5)
+    canvas.draw_rectangle((100, 100), (50, 50), filled=True)
+
+    info = canvas.get_layers_info()
+    assert [layer["name"] for layer in info] == ["background", "base", "top"]
+    assert info[0]["bounds"] == pygame.Rect(0, 0, SCREEN_WIDTH, SCREEN_HEIGHT)
+    assert info[1]["bounds"] == pygame.Rect(100, 100, 50, 50) and info[1]["active"]
+    assert info[2]["bounds"] is None and info[2]["opacity"] == 0.5
+
+    canvas.draw_line((10, 10), (20, 10))
+    assert canvas.get_layers_info()[1]["bounds"] == pygame.Rect(10, 10, 140, 140)
+    canvas.undo()
+    assert canvas.get_layers_info()[1]["bounds"] == pygame.Rect(100, 100, 50, 50)
+
+
+def test_pixel_color():
+    canvas = setup_canvas()
+    canvas.add_layer("top")
+    canvas.set_brush_color(pygame.Color(255, 0, 0))
+    canvas.draw_rectangle((100, 100), (50, 50), filled=True)
+
+    assert canvas.get_pixel_color((120, 120)) == pygame.Color(255, 0, 0)
+    assert canvas.get_pixel_color((10, 10)) == pygame.Color(255, 255, 255)
+    assert canvas.get_pixel_color((120, 120), "top").a == 0
+
+    with pytest.raises(ValueError):
+        canvas.get_pixel_color((0, 0), random_string())
+
+
+def test_describe_region():
+    canvas = setup_canvas()
+    assert canvas.describe_region().colors == []
+
+    canvas.set_brush_color(pygame.Color(255, 0, 0))
+    canvas.draw_rectangle((0, 0), (100, 100), filled=True)
+    canvas.set_brush_color(pygame.Color(0, 0, 255))
+    canvas.draw_rectangle((100, 0), (100, 50), filled=True)
+
+    summary = canvas.describe_region(pygame.Rect(0, 0, 200, 100))
+    assert summary.coverage == pytest.approx(0.75)
+    assert summary.colors == [(pygame.Color(255, 0, 0), pytest.approx(2 / 3)),
+                              (pygame.Color(0, 0, 255), pytest.approx(1 / 3))]
+    assert canvas.describe_region(pygame.Rect(0, 0, 200, 100), "base").coverage == pytest.approx(0.75)
+
+    # Changing the background only changes what counts as drawn on the canvas
+    canvas.set_background(pygame.Color(255, 0, 0))
+    assert canvas.describe_region(pygame.Rect(0, 0, 200, 100)).coverage == pytest.approx(0.25)
+    assert canvas.describe_region(pygame.Rect(0, 0, 200, 100), "base").coverage == pytest.approx(0.75)
+
+
+def test_cached_summaries_follow_changes():
+    steps = []
+    for _ in range(20):
+        step = random.choice([
+            ("draw_circle", (random_coordinate(), random.randint(1, 50), random.random() < 0.5)),
+            ("draw_line", (random_coordinate(), random_coordinate())),
+            ("bucket_fill", ((random.randrange(SCREEN_WIDTH), random.randrange(SCREEN_HEIGHT)),)),
+            ("translate_layer", ("base", random.randint(-20, 20), random.randint(-20, 20))),
+            ("switch_active_layer", (random.choice(["base", "top"]),)),
+            ("set_brush_color", (pygame.Color(*random.choices(range(256), k=3)),)),
+            ("set_layer_visibility", ("top", random.random())),
+            ("undo", ()),
+        ])
+        areas = {name: pygame.Rect(random_coordinate(), random_coordinate()) for name in ("base", "top", None)}
+        steps.append((step, areas))
+
+    def take(canvas: Canvas, step: tuple[str, tuple]) -> None:
+        name, args = step
+        getattr(canvas, name)(*args)
+        # Undoing as far back as the layer's creation would leave nothing to describe
+        if not canvas.layer_exists("top"):
+            canvas.add_layer("top")
+
+    # Warm the caches after every step
+    canvas = setup_canvas()
+    canvas.add_layer("top")
+    cached = []
+    for step, areas in steps:
+        take(canvas, step)
+        cached.append({name: canvas.describe_region(area, name) for name, area in areas.items()})
+
+    # A new canvas that takes the same steps without describing anything builds its summaries from scratch
+    for count, (_, areas) in enumerate(steps, 1):
+        canvas = setup_canvas()
+        canvas.add_layer("top")
+        for step, _ in steps[:count]:
+            take(canvas, step)
+        assert {name: canvas.describe_region(area, name) for name, area in areas.items()} == cached[count - 1]
+
+
 def test_undo():
     canvas = setup_canvas()
 
@@ -0,0 +1,146 @@
+"""Compositor - Blends layers onto the screen with per-layer opacity and blend modes."""
+
+from typing import Final, Literal
+
+from pygame import Rect
+import pygame
+import numpy as np
+
+BlendMode = Literal["normal", "multiply", "screen", "add", "overlay"]
+
+BLEND_MODES: Final[tuple[str, ...]] = ("normal", "multiply", "screen", "add", "overlay")
+
+# Modes pygame can blend natively once transparent pixels are turned into that mode's neutral color.
+_FLAG_MODES: Final[dict[str, tuple[int, pygame.Color]]] = {
+    "multiply": (pygame.BLEND_RGB_MULT, pygame.Color(255, 255, 255)),
+    "add": (pygame.BLEND_RGB_ADD, pygame.Color(0, 0, 0)),
+}
+
+
+def _with_opacity(surface: pygame.Surface, area: Rect, opacity: float) -> pygame.Surface:
+    # Scale the alpha channel of a copy, so the layer's own pixels are never modified.
+    region = surface.subsurface(area)
+    if opacity >= 1:
+        return region
+    faded = region.copy()
+    faded.fill((255, 255, 255, round(opacity * 255)), special_flags=pygame.BLEND_RGBA_MULT)
+    return faded
+
+
+def _blend_flag(target: pygame.Surface, source: pygame.Surface, area: Rect, flag: int, neutral: pygame.Color) -> None:
+    backdrop = pygame.Surface(area.size)
+    backdrop.fill(neutral)
+    backdrop.blit(source, (0, 0))
+    target.blit(backdrop, area, special_flags=flag)
+
+
+def _blend_colors(d: np.ndarray, s: np.ndarray, mode: BlendMode) -> np.ndarray:
+    # Backdrop and source colors in 0..1, as defined by the W3C compositing spec.
+    if mode == "multiply":
+        return d * s
+    if mode == "screen":
+        return 1 - (1 - d) * (1 - s)
+    if mode == "add":
+        return np.minimum(d + s, 1)
+    if mode == "overlay":
+        return np.where(d <= 0.5, 2 * d * s, 1 - 2 * (1 - d) * (1 - s))
+    return s
+
+
+def _blend_numpy(target: pygame.Surface, source: pygame.Surface, area: Rect, mode: BlendMode) -> None:
+    dst = pygame.surfarray.pixels3d(target)[area.left:area.right, area.top:area.bottom]
+    d = dst / np.float32(255)
+    s = pygame.surfarray.array3d(source) / np.float32(255)
+    a = pygame.surfarray.array_alpha(source)[..., None] / np.float32(255)
+
+    dst[...] = np.rint((d + (_blend_colors(d, s, mode) - d) * a) * 255).astype(np.uint8)
+    del dst  # Release the surface lock
+
+
+def blend_layer(
+    target: pygame.Surface, surface: pygame.Surface, opacity: float = 1, mode: BlendMode = "normal"
+) -> Rect:
+    """
+    Blends one layer onto the target.
+
+    Layers that need more than a plain blit only touch the bounding box of their non-transparent pixels, so
+    mostly empty layers stay cheap whatever their size.
+
+    Args:
+        target (pygame.Surface): The surface to blend onto, usually the screen.
+        surface (pygame.Surface): The layer's pixels, with per-pixel alpha.
+        opacity (float, optional): The layer's opacity between 0 and 1. Defaults to 1.
+        mode (BlendMode, optional): How the layer's colors combine with what is below. Defaults to "normal".
+
+    Returns:
+        Rect: The area of the target that was changed.
+    """
+    if opacity <= 0:
+        return Rect(0, 0, 0, 0)
+    if mode == "normal" and opacity >= 1:
+        # A straight blit is SIMD-accelerated and beats scanning the layer for its bounding box.
+        return target.blit(surface, (0, 0))
+
+    area = surface.get_bounding_rect()
+    if not area:
+        return Rect(0, 0, 0, 0)
+
+    source = _with_opacity(surface, area, opacity)
+
+    if mode == "normal":
+        target.blit(source, area)
+    elif mode in _FLAG_MODES:
+        _blend_flag(target, source, area, *_FLAG_MODES[mode])
+    else:
+        _blend_numpy(target, source, area, mode)
+
+    return area
+
+
+def merge_layer(
+    target: pygame.Surface, surface: pygame.Surface, opacity: float = 1, mode: BlendMode = "normal"
+) -> Rect:
+    """
+    Permanently blends one layer into the pixels of another, transparent one.
+
+    Unlike blend_layer, the target keeps per-pixel alpha: where it is transparent the layer is simply painted
+    in, so the merged pixels look the same as the two layers composited separately.
+
+    Args:
+        target (pygame.Surface): The lower layer's pixels, with per-pixel alpha. Modified in place.
+        surface (pygame.Surface): The upper layer's pixels, with per-pixel alpha.
+        opacity (float, optional): The upper layer's opacity between 0 and 1. Defaults to 1.
+        mode (BlendMode, optional): The upper layer's blend mode. Defaults to "normal".
+
+    Returns:
+        Rect: The area of the target that was changed.
+    """
+    if opacity <= 0:
+        return Rect(0, 0, 0, 0)
+    if mode == "normal" and opacity >= 1:
+        return target.blit(surface, (0, 0))
+
+    area = surface.get_bounding_rect()
+    if not area:
+        return Rect(0, 0, 0, 0)
+
+    region = (slice(area.left, area.right), slice(area.top, area.bottom))
+    dst_rgb = pygame.surfarray.pixels3d(target)[region]
+    dst_alpha = pygame.surfarray.pixels_alpha(target)[region]
+    src = surface.subsurface(area)
+
+    d = dst_rgb / np.float32(255)
+    ad = dst_alpha[..., None] / np.float32(255)
+    s = pygame.surfarray.array3d(src) / np.float32(255)
+    a = pygame.surfarray.array_alpha(src)[..., None] * np.float32(opacity / 255)
+
+    # The blend only applies where there is a backdrop to blend with; elsewhere the layer's own color shows.
+    s = (1 - ad) * s + ad * _blend_colors(d, s, mode)
+    out_alpha = a + ad * (1 - a)
+    out = (a * s + ad * d * (1 - a)) / np.maximum(out_alpha, np.float32(1e-6))
+
+    dst_rgb[...] = np.rint(out * 255).astype(np.uint8)
+    dst_alpha[...] = np.rint(out_alpha[..., 0] * 255).astype(np.uint8)
+    del dst_rgb, dst_alpha  # Release the surface locks
+
+    return area
@@ -18,6 +18,8 @@ default_config: object = {
             'width': 1080, # Allow integer values: 0 -> screen width?
             # Setting a value to 0 will prompt Neuro to input her decision
         },
+        'result_verbosity': 'normal',
+        'result_max_bytes': 256,
     },
     "permissions": {
         "layers": {
@@ -27,6 +29,8 @@ default_config: object = {
         },
         "misc": {
             "bucket": True,
+            "eraser": True,
+            "fill": True,
             "undo": True,
             "export": True
         },
@@ -36,50 +40,86 @@ default_config: object = {
             "curve": True,
             "circle": True,
             "triangle": True,
-            "rectangle": True
+            "rectangle": True,
+            "polygon": True,
+            "star": True
         },
-        "brush": True
+        "brush": True,
+        "selection": True,
+        "query": True,
+        "shapes": True
     }
 }
 
-# Don't initialize config - let it be undefined until explicitly set
-config = None
-
-try:
-    # Load the config file
-    with open(config_path, 'r') as f:
-        loaded_config = json.load(f)
-    
-    # Load the schema file
-    with open(schema_path, 'r') as f:
-        schema = json.load(f)
-    
-    # Validate config against schema
-    validate(loaded_config, schema)
-
-    # Validate config version
-    if loaded_config["configVersion"] not in supported_config_versions:
-        raise KeyError("Config version not supported!")
-    
-    # Only assign if validation passes
-    config = loaded_config
-    
-except FileNotFoundError as e:
-    if "config.json" in str(e):
-        print(f"Config file not found: {config_path}\nProceeding with default configs...")
-        config = default_config
-    else:
-        raise RuntimeError(f"Schema file not found: {schema_path}" + ERROR_SUFFIX)
-        
-except ValidationError as e:
-    raise ValueError(f"Config validation failed! {e.message}\nDouble-check your config file!")
-
-except SchemaError as e:
-    raise RuntimeError(f"Validation schema for config file has an issue! {e.message}" + ERROR_SUFFIX)
-    
-except Exception as e:
-    raise RuntimeError(f"An exception occurred while loading config.json! ({e})")
-
-# Final safety check
-if config is None:
-    raise RuntimeError("CRITICAL: No configuration was loaded. Application cannot start safely.")
+
+# The config in use, read on first use so importing the config package doesn't touch the disk
+_config: dict | None = None
+
+
+def load_config() -> dict:
+    """
+    Returns the config in use, reading and validating config.json the first time.
+    """
+    global _config
+    if _config is None:
+        _config = read_config()
+    return _config
+
+
+def reload_config() -> dict:
+    """
+    Reads config.json again and uses it from now on. If it is invalid, the error is raised and the config in use
+    is kept.
+    """
+    global _config
+    _config = read_config()
+    return _config
+
+
+def read_config() -> dict:
+    """
+    Reads and validates config.json, falling back to the default config if there is none.
+    """
+    # Don't initialize config - let it be undefined until explicitly set
+    config = None
+
+    try:
+        # Load the config file
+        with open(config_path, 'r') as f:
+            loaded_config = json.load(f)
+
+        # Load the schema file
+        with open(schema_path, 'r') as f:
+            schema = json.load(f)
+
+        # Validate config against schema
+        validate(loaded_config, schema)
+
+        # Validate config version
+        if loaded_config["configVersion"] not in supported_config_versions:
+            raise KeyError("Config version not supported!")
+
+        # Only assign if validation passes
+        config = loaded_config
+
+    except FileNotFoundError as e:
+        if "config.json" in str(e):
+            print(f"Config file not found: {config_path}\nProceeding with default configs...")
+            config = default_config
+        else:
+            raise RuntimeError(f"Schema file not found: {schema_path}" + ERROR_SUFFIX)
+
+    except ValidationError as e:
+        raise ValueError(f"Config validation failed! {e.message}\nDouble-check your config file!")
+
+    except SchemaError as e:
+        raise RuntimeError(f"Validation schema for config file has an issue! {e.message}" + ERROR_SUFFIX)
+
+    except Exception as e:
+        raise RuntimeError(f"An exception occurred while loading config.json! ({e})")
+
+    # Final safety check
+    if config is None:
+        raise RuntimeError("CRITICAL: No configuration was loaded. Application cannot start safely.")
+
+    return config
@@ -1,8 +1,12 @@
-from .load import config, default_config
+from .load import load_config, default_config
+
+
+def _permissions() -> dict:
+    permissions = load_config().get("permissions")
+    if permissions is None:
+        permissions = default_config["permissions"]
+    return permissions
 
-permissions = config.get("permissions")
-if permissions is None:
-    permissions = default_config["permissions"]
 
 def check_permission(permission: str) -> bool:
     """
@@ -11,7 +15,7 @@ def check_permission(permission: str) -> bool:
     Returns False in all circumstances except when the permission is explicitly set to True.
     """
     keys = permission.split(".")  # Split the permission string into keys
-    current = permissions
+    current = _permissions()
 
     for key in keys:
         if isinstance(current, dict) and key in current:
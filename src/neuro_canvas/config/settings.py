@@ -1,11 +1,10 @@
-from .load import config, default_config
+from .load import load_config, default_config
 from typing import Any
 
-settings = config.get("settings")
-if settings == None:
-    settings = default_config["settings"]
-
 def get_setting(setting: str) -> (type[ValueError] | Any):
+    settings = load_config().get("settings")
+    if settings == None:
+        settings = default_config["settings"]
     req_set = settings.get(setting)
     if req_set is None:
         return ValueError
@@ -0,0 +1,75 @@
+from typing import Final, NoReturn
+from collections.abc import Callable
+
+import logging
+
+import trio
+
+from . import load
+from .load import default_config, load_config, reload_config
+
+logger = logging.getLogger(__name__)
+
+# Seconds between two checks of config.json
+CONFIG_POLL_INTERVAL: Final = 1.0
+
+
+def _file_signature() -> tuple[int, int] | None:
+    try:
+        stat = load.config_path.stat()
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _permissions(config: dict) -> dict:
+    return config.get("permissions") or default_config["permissions"]
+
+
+def changed_permissions(old: dict, new: dict, prefix: str = "") -> list[str]:
+    """
+    Returns the dot-separated names of every permission that differs between two permission objects.
+    """
+    changed = []
+    for key in sorted(old.keys() | new.keys()):
+        name = f"{prefix}{key}"
+        before, after = old.get(key), new.get(key)
+        if isinstance(before, dict) or isinstance(after, dict):
+            if not (isinstance(before, dict) and isinstance(after, dict)):
+                changed.append(name)
+            changed.extend(changed_permissions(
+                before if isinstance(before, dict) else {}, after if isinstance(after, dict) else {}, f"{name}."
+            ))
+        elif before != after:
+            changed.append(name)
+    return changed
+
+
+async def watch_config(
+    on_permissions_changed: Callable[[], None], interval: float = CONFIG_POLL_INTERVAL
+) -> NoReturn:
+    """
+    Polls config.json and reloads it whenever it changes, forever.
+
+    Settings take effect straight away. When permissions changed, on_permissions_changed is called so the
+    registered actions can follow. A config that fails validation is logged and ignored, keeping the one in use.
+    """
+    signature = await trio.to_thread.run_sync(_file_signature)
+    while True:
+        await trio.sleep(interval)
+        current = await trio.to_thread.run_sync(_file_signature)
+        if current == signature:
+            continue
+        signature = current
+
+        old = _permissions(load_config())
+        try:
+            config = await trio.to_thread.run_sync(reload_config)
+        except (ValueError, RuntimeError) as e:
+            logger.warning(f"Ignoring the changed config file: {str(e)}")
+            continue
+
+        changed = changed_permissions(old, _permissions(config))
+        logger.info(f"Reloaded config file, changed permissions: {', '.join(changed) or 'none'}")
+        if changed:
+            on_permissions_changed()
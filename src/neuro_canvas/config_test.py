@@ -0,0 +1,51 @@
+import json
+
+import trio
+
+from .config import load
+from .config.permissions import check_permission
+from .config.settings import get_setting
+from .config.watch import changed_permissions, watch_config
+
+
+def test_changed_permissions():
+    old = {"layers": {"base": True, "custom": True}, "brush": True, "query": True}
+    new = {"layers": {"base": True, "custom": False}, "brush": {"color": True}, "selection": True}
+    assert changed_permissions(old, new) == ["brush", "brush.color", "layers.custom", "query", "selection"]
+    assert changed_permissions(old, old) == []
+
+
+async def test_watch_config_reloads_changes(tmp_path, monkeypatch):
+    path = tmp_path / "config.json"
+    config = json.loads(json.dumps(load.default_config))
+    path.write_text(json.dumps(config))
+    monkeypatch.setattr(load, "config_path", path)
+    monkeypatch.setattr(load, "_config", None)
+    assert check_permission("misc.undo")
+
+    notified = []
+    async with trio.open_nursery() as nursery:
+        nursery.start_soon(watch_config, lambda: notified.append(True), 0.01)
+        await trio.sleep(0.05)
+
+        # A config that fails validation is ignored
+        path.write_text('{"configVersion": 1, "permissions": {"misc": {"undo": "no"}}}')
+        await trio.sleep(0.1)
+        assert check_permission("misc.undo") and not notified
+
+        config["permissions"]["misc"]["undo"] = False
+        config["settings"]["result_verbosity"] = "minimal"
+        path.write_text(json.dumps(config))
+        await trio.sleep(0.1)
+        assert not check_permission("misc.undo")
+        assert get_setting("result_verbosity") == "minimal"
+        assert notified == [True]
+
+        # Only settings changed, so the actions are left alone
+        config["settings"]["result_verbosity"] = "detailed"
+        path.write_text(json.dumps(config, indent=1))
+        await trio.sleep(0.1)
+        assert get_setting("result_verbosity") == "detailed"
+        assert notified == [True]
+
+        nursery.cancel_scope.cancel()
@@ -0,0 +1,120 @@
+"""Connection - Keeps the websocket connection to Neuro alive across network blips."""
+
+import logging
+
+from typing import Final, NoReturn, Optional
+from collections.abc import Awaitable, Callable
+
+import trio
+import trio_websocket
+from neuro_api.trio_ws import TrioNeuroAPIComponent
+
+# Seconds to wait before the first retry; every failed attempt doubles it, up to the maximum
+INITIAL_BACKOFF: Final = 0.1
+MAX_BACKOFF: Final = 10.0
+# Seconds an attempt may take to open the websocket before it counts as failed
+CONNECT_TIMEOUT: Final = 5.0
+
+# What can go wrong while connecting or talking over a connection that is going away
+CONNECTION_ERRORS: Final = (
+    OSError,
+    trio_websocket.HandshakeError,
+    trio_websocket.ConnectionClosed,
+    trio.BrokenResourceError,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def next_backoff(delay: float, max_backoff: float = MAX_BACKOFF) -> float:
+    """
+    Returns the delay before the next attempt to connect after one that waited the given delay failed.
+    """
+    return min(delay * 2, max_backoff)
+
+
+class NeuroConnection(TrioNeuroAPIComponent):
+    """
+    A Neuro API component that connects by itself and reconnects whenever the connection drops.
+
+    Attempts back off exponentially while Neuro can't be reached. Every time a connection is made, on_connect is
+    awaited before any message is read, which is where the game is announced and its actions registered, since
+    Neuro forgets both when the connection goes away. The canvas and everything else keep running meanwhile.
+    """
+
+    def __init__(
+        self,
+        component_name: str,
+        game_title: str,
+        url: str,
+        on_connect: Callable[[bool], Awaitable[None]],
+        initial_backoff: float = INITIAL_BACKOFF,
+        max_backoff: float = MAX_BACKOFF,
+    ):
+        """
+        Args:
+            component_name (str): The name of the component.
+            game_title (str): The game title sent to Neuro.
+            url (str): The websocket URL of Neuro.
+            on_connect (Callable[[bool], Awaitable[None]]): Awaited after every connection, with whether it is a
+                reconnection.
+            initial_backoff (float, optional): Seconds to wait before the first retry. Defaults to INITIAL_BACKOFF.
+            max_backoff (float, optional): The longest wait between two attempts. Defaults to MAX_BACKOFF.
+        """
+        super().__init__(component_name, game_title)
+        self._url = url
+        self._on_connect = on_connect
+        self._initial_backoff = initial_backoff
+        self._max_backoff = max_backoff
+        self._ready = trio.Event()
+        self.connections = 0
+
+    async def wait_ready(self) -> None:
+        """
+        Waits until connected to Neuro, with the game announced and its actions registered.
+        """
+        while not self._ready.is_set():
+            await self._ready.wait()
+
+    async def send_action_result(self, id_: str, success: bool, message: Optional[str] = None) -> None:
+        # Neuro drops pending actions when the connection goes away, so a result with nowhere to go is dropped too
+        try:
+            await super().send_action_result(id_, success, message)
+        except (RuntimeError, *CONNECTION_ERRORS) as e:
+            logger.warning("Could not send the result of action %s: %s", id_, e)
+
+    async def run(self) -> NoReturn:
+        """
+        Connects to Neuro and reads its messages, reconnecting with backoff whenever that fails, forever.
+        """
+        delay = self._initial_backoff
+        while True:
+            connections = self.connections
+            try:
+                await self._serve_connection()
+                reason = "connection closed"
+            except CONNECTION_ERRORS as e:
+                # Handshake errors have no message of their own, only the error that caused them
+                reason = str(e) or str(e.__cause__ or type(e).__name__)
+            if self.connections > connections:
+                # It was connected, so this is a blip worth retrying quickly
+                delay = self._initial_backoff
+            logger.warning("Neuro API connection failed (%s), retrying in %.1f s", reason, delay)
+            await trio.sleep(delay)
+            delay = next_backoff(delay, self._max_backoff)
+
+    async def _serve_connection(self) -> None:
+        async with trio_websocket.open_websocket_url(self._url, connect_timeout=CONNECT_TIMEOUT) as websocket:
+            self.connect(websocket)
+            try:
+                await self._on_connect(self.connections > 0)
+                self.connections += 1
+                self._ready.set()
+                logger.info("Connected to Neuro at %s", self._url)
+                # read_message disconnects once the connection is closed
+                while not self.not_connected:
+                    await self.read_message()
+            finally:
+                self.connect(None)
+                if self._ready.is_set():
+                    self._ready = trio.Event()
@@ -0,0 +1,74 @@
+import json
+
+import trio
+from trio_websocket import ConnectionClosed, WebSocketRequest, serve_websocket
+
+from .connection import MAX_BACKOFF, NeuroConnection, next_backoff
+
+
+def test_next_backoff():
+    delays = [0.1]
+    for _ in range(10):
+        delays.append(next_backoff(delays[-1]))
+    assert delays[:4] == [0.1, 0.2, 0.4, 0.8]
+    assert delays[-1] == MAX_BACKOFF
+
+
+async def test_reconnects_after_drop():
+    received: list[list[str]] = []
+
+    async def server(request: WebSocketRequest) -> None:
+        websocket = await request.accept()
+        commands: list[str] = []
+        received.append(commands)
+        try:
+            while True:
+                commands.append(json.loads(await websocket.get_message())["command"])
+                # The first connection drops as soon as the game says hello
+                if len(received) == 1 and commands[-1] == "context":
+                    await websocket.aclose()
+                    return
+        except ConnectionClosed:
+            pass
+
+    reconnects: list[bool] = []
+
+    async with trio.open_nursery() as nursery:
+        listener = await nursery.start(serve_websocket, server, "127.0.0.1", 0, None)
+        url = f"ws://127.0.0.1:{listener.port}"
+
+        async def on_connect(reconnected: bool) -> None:
+            reconnects.append(reconnected)
+            await connection.send_startup_command()
+            await connection.send_context("hello")
+
+        connection = NeuroConnection("neuro_api", "Test", url, on_connect, initial_backoff=0.01)
+        nursery.start_soon(connection.run)
+
+        with trio.fail_after(5):
+            while connection.connections < 2:
+                await connection.wait_ready()
+                await trio.sleep(0.01)
+
+        # Results for actions from the dropped connection are dropped instead of crashing the app
+        await connection.stop()
+        await connection.send_action_result("1", True, "done")
+        nursery.cancel_scope.cancel()
+
+    assert reconnects[:2] == [False, True]
+    assert received[:2] == [["startup", "context"], ["startup", "context"]]
+
+
+async def test_backs_off_while_unreachable():
+    async def on_connect(reconnected: bool) -> None:
+        raise AssertionError("Nothing should be listening")
+
+    # Find a port nothing listens on
+    with trio.socket.socket() as sock:
+        await sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+
+    connection = NeuroConnection("neuro_api", "Test", f"ws://127.0.0.1:{port}", on_connect, initial_backoff=0.05)
+    with trio.move_on_after(0.5):
+        await connection.run()
+    assert connection.not_connected and connection.connections == 0
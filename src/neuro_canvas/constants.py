@@ -26,5 +26,7 @@ COLORS: Final[dict[str, Color]] = {
 
 ERROR_SUFFIX: Final = "\nSomeone tell the maintainers at https://github.com/Kaya-Kaya/neuro-canvas that there's an issue with their app!"
 
-BEZIER_STEPS: Final = 4
-  
\ No newline at end of file
+# Maximum distance in pixels between a drawn curve and the true curve.
+CURVE_FLATNESS: Final = 0.25
+
+MAX_BRUSH_WIDTH: Final = 50
@@ -0,0 +1,117 @@
+"""Curves - Adaptive flattening of Bézier and spline curves into polylines."""
+
+from typing import Final, Literal
+from collections.abc import Sequence
+
+import numpy as np
+
+from .constants import CURVE_FLATNESS
+
+CurveMode = Literal["bezier", "spline"]
+
+CURVE_MODES: Final[tuple[str, ...]] = ("bezier", "spline")
+
+# Hard stop for the subdivision so degenerate input can't recurse forever; 2^16 segments is far beyond any canvas.
+MAX_SUBDIVISION_DEPTH: Final = 16
+
+Point = tuple[float, float]
+
+
+def _is_flat(control: np.ndarray, tolerance: float) -> bool:
+    # A Bézier curve stays inside the hull of its control points, so if every inner control point is within
+    # tolerance of the chord segment the whole curve is too. Being near the chord's line isn't enough: a control
+    # point past either end pulls the curve past that end as well.
+    start, end = control[0], control[-1]
+    chord = end - start
+    offsets = control[1:-1] - start
+    chord_len = np.hypot(*chord)
+    if chord_len == 0:
+        return bool(np.all(np.hypot(offsets[:, 0], offsets[:, 1]) <= tolerance))
+
+    distances = np.abs(offsets[:, 0] * chord[1] - offsets[:, 1] * chord[0]) / chord_len
+    along = (offsets[:, 0] * chord[0] + offsets[:, 1] * chord[1]) / chord_len
+    return bool(np.all(distances <= tolerance) and np.all((along >= 0) & (along <= chord_len)))
+
+
+def _split(control: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    # de Casteljau at t = 0.5; the first and last point of every level are the two halves' control points.
+    left = [control[0]]
+    right = [control[-1]]
+    level = control
+    while len(level) > 1:
+        level = (level[:-1] + level[1:]) / 2
+        left.append(level[0])
+        right.append(level[-1])
+    return np.array(left), np.array(right[::-1])
+
+
+def flatten_bezier(control: np.ndarray, tolerance: float = CURVE_FLATNESS) -> np.ndarray:
+    """
+    Flattens a Bézier curve of any degree into a polyline by adaptive subdivision.
+
+    Straight stretches come out as a handful of points and tight bends get more, so the point count follows the
+    curve's shape rather than a fixed step count.
+
+    Args:
+        control (np.ndarray): The (n, 2) control points.
+        tolerance (float, optional): The maximum distance in pixels between the curve and the polyline.
+            Defaults to CURVE_FLATNESS.
+
+    Returns:
+        np.ndarray: The (m, 2) polyline points, starting and ending at the curve's end points.
+    """
+    points = [control[0]]
+    stack = [(control, 0)]
+
+    while stack:
+        segment, depth = stack.pop()
+        if depth >= MAX_SUBDIVISION_DEPTH or _is_flat(segment, tolerance):
+            points.append(segment[-1])
+        else:
+            left, right = _split(segment)
+            # Right goes on the stack first so the left half is emitted first.
+            stack.append((right, depth + 1))
+            stack.append((left, depth + 1))
+
+    return np.array(points)
+
+
+def catmull_rom_to_bezier(points: np.ndarray) -> np.ndarray:
+    """
+    Converts a Catmull-Rom spline through the points into one cubic Bézier segment per span.
+
+    The end points are repeated so the spline starts and ends on the first and last points.
+
+    Returns:
+        np.ndarray: The (n - 1, 4, 2) cubic control points of every span.
+    """
+    padded = np.concatenate((points[:1], points, points[-1:]))
+    p0, p1, p2, p3 = padded[:-3], padded[1:-2], padded[2:-1], padded[3:]
+    return np.stack((p1, p1 + (p2 - p0) / 6, p2 - (p3 - p1) / 6, p2), axis=1)
+
+
+def curve_points(points: Sequence[Point], mode: CurveMode = "bezier", tolerance: float = CURVE_FLATNESS) -> np.ndarray:
+    """
+    Computes the polyline for a curve so it can be drawn in a single call.
+
+    Args:
+        points (Sequence[Point]): The curve's points.
+        mode (CurveMode, optional): "bezier" treats the points as the control points of one Bézier curve that only
+            passes through the first and last point, "spline" draws a smooth Catmull-Rom spline through every point.
+            Defaults to "bezier".
+        tolerance (float, optional): The maximum distance in pixels between the curve and the polyline.
+            Defaults to CURVE_FLATNESS.
+
+    Returns:
+        np.ndarray: The (m, 2) polyline points.
+    """
+    pts = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+    if len(pts) < 3:
+        return pts
+
+    if mode == "bezier":
+        return flatten_bezier(pts, tolerance)
+
+    spans = [flatten_bezier(span, tolerance) for span in catmull_rom_to_bezier(pts)]
+    # Every span starts where the previous one ended, so drop the repeated start points.
+    return np.concatenate([spans[0]] + [span[1:] for span in spans[1:]])
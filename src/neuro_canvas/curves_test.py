@@ -0,0 +1,42 @@
+import numpy as np
+
+from .curves import catmull_rom_to_bezier, curve_points, flatten_bezier
+
+
+def test_flatten_bezier_tolerance():
+    control = np.array([(0, 0), (250, 500), (500, 0)], dtype=np.float64)
+    polyline = flatten_bezier(control, 0.25)
+
+    assert np.array_equal(polyline[0], control[0])
+    assert np.array_equal(polyline[-1], control[-1])
+
+    # For a quadratic, B(t) at t = 0.5 is (P0 + 2 P1 + P2) / 4; the apex must be within tolerance of the polyline.
+    apex = (control[0] + 2 * control[1] + control[2]) / 4
+    assert np.min(np.hypot(*(polyline - apex).T)) <= 1
+
+
+def test_flatten_straight_line():
+    control = np.array([(0, 0), (100, 100), (200, 200), (300, 300)], dtype=np.float64)
+
+    assert len(flatten_bezier(control)) == 2
+
+
+def test_flatten_collinear_overshoot():
+    # Every control point is on one line, but the curve runs back past its start before reaching the end
+    control = np.array([(100, 100), (400, 100), (-200, 100), (200, 100)], dtype=np.float64)
+    polyline = flatten_bezier(control, 0.25)
+
+    assert len(polyline) > 2
+    assert np.isclose(polyline[:, 0].min(), 57.2, atol=1)
+    assert np.isclose(polyline[:, 0].max(), 200, atol=1)
+    assert np.allclose(polyline[:, 1], 100)
+
+
+def test_spline_passes_through_points():
+    points = [(0, 0), (100, 50), (200, 0), (300, 80)]
+    polyline = curve_points(points, "spline")
+
+    for point in points:
+        assert any(np.array_equal(point, vertex) for vertex in polyline)
+
+    assert catmull_rom_to_bezier(np.array(points, dtype=np.float64)).shape == (3, 4, 2)
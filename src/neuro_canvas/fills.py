@@ -0,0 +1,119 @@
+"""Fills - Gradients and tiled patterns computed for a whole area at once with numpy."""
+
+from typing import Final, Literal
+from collections.abc import Sequence
+
+import pygame
+import numpy as np
+
+from pygame import Rect
+
+GradientKind = Literal["linear", "radial"]
+PatternKind = Literal["checker", "horizontal_stripes", "vertical_stripes", "diagonal_stripes", "dots", "grid"]
+FillTarget = Literal["layer", "background", "selection"]
+
+GRADIENT_KINDS: Final[tuple[str, ...]] = ("linear", "radial")
+PATTERN_KINDS: Final[tuple[str, ...]] = (
+    "checker", "horizontal_stripes", "vertical_stripes", "diagonal_stripes", "dots", "grid"
+)
+FILL_TARGETS: Final[tuple[str, ...]] = ("layer", "background", "selection")
+
+# A gradient stop: where it sits between the start (0) and end (1) of the gradient, and its colour
+Stop = tuple[float, pygame.Color]
+Point = tuple[int, int]
+
+
+def _coordinates(area: Rect) -> tuple[np.ndarray, np.ndarray]:
+    # Shaped to broadcast to (width, height), the way surfarray indexes pixels
+    return np.arange(area.left, area.right)[:, None], np.arange(area.top, area.bottom)[None, :]
+
+
+def _to_surface(pixels: np.ndarray) -> pygame.Surface:
+    surface = pygame.Surface(pixels.shape[:2], pygame.SRCALPHA)
+    pygame.surfarray.pixels3d(surface)[...] = pixels[..., :3]
+    pygame.surfarray.pixels_alpha(surface)[...] = pixels[..., 3]
+    return surface
+
+
+def gradient(area: Rect, kind: GradientKind, start: Point, end: Point, stops: Sequence[Stop]) -> pygame.Surface:
+    """
+    Renders a gradient over an area of the canvas.
+
+    A linear gradient runs along the line from start to end and stays constant across it. A radial one is centred
+    on start and reaches its last stop at the distance of end. Past the ends, the first and last stop carry on.
+
+    Args:
+        area (Rect): The part of the canvas to render, in canvas coordinates.
+        kind (GradientKind): "linear" or "radial".
+        start (Point): Where the gradient starts.
+        end (Point): Where the gradient ends.
+        stops (Sequence[Stop]): At least two stops. They are sorted by position, and stops at the same position
+            make a hard edge.
+
+    Raises:
+        ValueError: If there are fewer than two stops, or start and end are the same point.
+
+    Returns:
+        pygame.Surface: The area's pixels.
+    """
+    if len(stops) < 2:
+        raise ValueError("A gradient needs at least two colours.")
+    if start == end:
+        raise ValueError("A gradient's start and end must be different points.")
+
+    x, y = _coordinates(area)
+    dx, dy = end[0] - start[0], end[1] - start[1]
+    if kind == "linear":
+        # How far along the line each pixel projects, from 0 at start to 1 at end
+        along = ((x - start[0]) * dx + (y - start[1]) * dy) / float(dx * dx + dy * dy)
+    else:
+        along = np.hypot(x - start[0], y - start[1]) / np.hypot(dx, dy)
+
+    ordered = sorted(stops, key=lambda stop: stop[0])
+    positions = np.array([position for position, _ in ordered], dtype=np.float64)
+    colors = np.array([tuple(color) for _, color in ordered], dtype=np.float64)
+    pixels = np.empty((*along.shape, 4), dtype=np.uint8)
+    for channel in range(4):
+        # np.interp holds the end values past either end, so no clipping is needed
+        pixels[..., channel] = np.rint(np.interp(along, positions, colors[:, channel]))
+    return _to_surface(pixels)
+
+
+def pattern(area: Rect, kind: PatternKind, color: pygame.Color, other_color: pygame.Color,
+            size: int) -> pygame.Surface:
+    """
+    Renders a repeating pattern over an area of the canvas.
+
+    The pattern is laid out from the canvas's top left corner rather than the area's, so fills of neighbouring
+    areas line up.
+
+    Args:
+        area (Rect): The part of the canvas to render, in canvas coordinates.
+        kind (PatternKind): Which pattern to draw.
+        color (pygame.Color): The colour of the pattern's squares, stripes, dots or lines.
+        other_color (pygame.Color): The colour between them.
+        size (int): The width of a square or stripe, or the spacing of dots and grid lines, in pixels.
+
+    Returns:
+        pygame.Surface: The area's pixels.
+    """
+    x, y = _coordinates(area)
+    if kind == "checker":
+        marked = (x // size + y // size) % 2 == 0
+    elif kind == "horizontal_stripes":
+        marked = np.broadcast_to((y // size) % 2 == 0, (area.width, area.height))
+    elif kind == "vertical_stripes":
+        marked = np.broadcast_to((x // size) % 2 == 0, (area.width, area.height))
+    elif kind == "diagonal_stripes":
+        marked = ((x + y) // size) % 2 == 0
+    elif kind == "dots":
+        # One dot in the middle of every size-by-size tile, half as wide as the tile
+        offset = (size - 1) / 2
+        marked = np.hypot(x % size - offset, y % size - offset) <= size / 4
+    else:
+        thickness = max(1, size // 8)
+        marked = (x % size < thickness) | (y % size < thickness)
+
+    pixels = np.where(marked[..., None], np.array(tuple(color), dtype=np.uint8),
+                      np.array(tuple(other_color), dtype=np.uint8))
+    return _to_surface(pixels)
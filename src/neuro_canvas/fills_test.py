@@ -0,0 +1,75 @@
+import pygame
+import pytest
+from pygame import Rect
+
+from .canvas import Canvas
+from .constants import SCREEN_HEIGHT, SCREEN_WIDTH
+from .fills import PATTERN_KINDS, gradient, pattern
+
+RED = pygame.Color(255, 0, 0)
+GREEN = pygame.Color(0, 255, 0)
+BLUE = pygame.Color(0, 0, 255)
+
+
+def test_linear_gradient_stops():
+    pixels = gradient(Rect(0, 0, 101, 10), "linear", (0, 0), (100, 0), [(1, BLUE), (0, RED), (0.5, GREEN)])
+
+    assert pixels.get_at((0, 5)) == RED
+    assert pixels.get_at((50, 5)) == GREEN
+    assert pixels.get_at((100, 5)) == BLUE
+    assert pixels.get_at((25, 0)) == pixels.get_at((25, 9)) == pygame.Color(128, 128, 0)
+
+    # Stops at the same position make a hard edge
+    edge = gradient(Rect(0, 0, 100, 1), "linear", (0, 0), (100, 0), [(0, RED), (0.5, RED), (0.5, BLUE), (1, BLUE)])
+    assert edge.get_at((49, 0)) == RED and edge.get_at((51, 0)) == BLUE
+
+    with pytest.raises(ValueError):
+        gradient(Rect(0, 0, 10, 10), "linear", (5, 5), (5, 5), [(0, RED), (1, BLUE)])
+
+
+def test_radial_gradient_and_offset_area():
+    pixels = gradient(Rect(50, 50, 100, 100), "radial", (100, 100), (100, 140), [(0, RED), (1, BLUE)])
+
+    # The area's corner is at (50, 50) on the canvas
+    assert pixels.get_at((50, 50)) == RED
+    assert pixels.get_at((50, 70)) == pygame.Color(128, 0, 128)
+    assert pixels.get_at((0, 0)) == BLUE
+
+
+def test_patterns_line_up_with_the_canvas():
+    for kind in PATTERN_KINDS:
+        whole = pattern(Rect(0, 0, 64, 64), kind, RED, BLUE, 8)
+        part = pattern(Rect(13, 21, 30, 30), kind, RED, BLUE, 8)
+        assert pygame.image.tobytes(whole.subsurface(Rect(13, 21, 30, 30)), "RGBA") == \
+            pygame.image.tobytes(part, "RGBA")
+        assert {tuple(whole.get_at((x, y))) for x in range(64) for y in range(64)} == {tuple(RED), tuple(BLUE)}
+
+
+def test_fill_targets():
+    if hasattr(Canvas, "instance"):
+        del Canvas.instance
+    canvas = Canvas()
+
+    canvas.fill_gradient("linear", (0, 0), (SCREEN_WIDTH - 1, SCREEN_HEIGHT - 1), [(0, RED), (1, BLUE)], "background")
+    assert canvas.get_pixel_color((0, 0), "background") == RED
+    assert canvas.get_pixel_color((0, 0), "base").a == 0
+
+    canvas.set_brush_color(GREEN)
+    canvas.select_ellipse((100, 100), (100, 100))
+    canvas.fill_pattern("checker", None, 10, "selection")
+    assert canvas.get_pixel_color((150, 150), "base") == GREEN and canvas.get_pixel_color((150, 160), "base").a == 0
+    # Outside the ellipse is untouched
+    assert canvas.get_pixel_color((101, 101), "base").a == 0
+
+    canvas.select_none()
+    with pytest.raises(ValueError):
+        canvas.fill_pattern("dots", target="selection")
+
+    canvas.fill_pattern("grid", BLUE, 20)
+    assert canvas.get_pixel_color((0, 0), "base") == GREEN and canvas.get_pixel_color((10, 10), "base") == BLUE
+
+    # The fills, the brush colour and both selection changes
+    for _ in range(6):
+        assert canvas.undo()
+    assert canvas.get_pixel_color((150, 150), "base").a == 0
+    assert canvas.get_pixel_color((0, 0), "background") == pygame.Color(255, 255, 255)
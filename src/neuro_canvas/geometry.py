@@ -0,0 +1,85 @@
+"""Geometry - Vertex generation for regular polygons, stars and rotated rectangles."""
+
+import math
+
+from functools import lru_cache
+
+import numpy as np
+
+Point = tuple[float, float]
+
+
+def _frozen(array: np.ndarray) -> np.ndarray:
+    # Cached tables are shared between callers, so make sure nobody can modify them in place.
+    array.flags.writeable = False
+    return array
+
+
+@lru_cache(maxsize=256)
+def unit_polygon(sides: int, rotation: float = 0) -> np.ndarray:
+    """
+    Returns the vertices of a regular polygon with circumradius 1 centred on the origin.
+
+    The first vertex points straight up before rotation, and vertices go clockwise on screen.
+
+    Args:
+        sides (int): The number of sides, at least 3.
+        rotation (float, optional): The clockwise rotation in degrees. Defaults to 0.
+
+    Returns:
+        np.ndarray: A read-only (sides, 2) vertex table.
+    """
+    angles = np.radians(rotation - 90) + np.arange(sides) * (2 * math.pi / sides)
+    return _frozen(np.stack((np.cos(angles), np.sin(angles)), axis=1))
+
+
+@lru_cache(maxsize=256)
+def unit_star(points: int, inner_ratio: float, rotation: float = 0) -> np.ndarray:
+    """
+    Returns the vertices of a star with outer radius 1 centred on the origin.
+
+    Args:
+        points (int): The number of tips, at least 2.
+        inner_ratio (float): The radius of the inner vertices relative to the tips.
+        rotation (float, optional): The clockwise rotation in degrees. Defaults to 0.
+
+    Returns:
+        np.ndarray: A read-only (2 * points, 2) vertex table alternating between tips and inner vertices.
+    """
+    vertices = np.array(unit_polygon(2 * points, rotation))
+    vertices[1::2] *= inner_ratio
+    return _frozen(vertices)
+
+
+def regular_polygon(center: Point, radius: float, sides: int, rotation: float = 0) -> np.ndarray:
+    """
+    Returns the (sides, 2) vertices of a regular polygon with the given circumradius.
+    """
+    return unit_polygon(sides, rotation) * radius + center
+
+
+def star(center: Point, outer_radius: float, inner_radius: float, points: int, rotation: float = 0) -> np.ndarray:
+    """
+    Returns the (2 * points, 2) vertices of a star.
+    """
+    return unit_star(points, inner_radius / outer_radius, rotation) * outer_radius + center
+
+
+def equilateral_triangle(center: Point, side_length: float, rotation: float = 0) -> np.ndarray:
+    """
+    Returns the (3, 2) vertices of an equilateral triangle with one vertex at the top before rotation.
+    """
+    return regular_polygon(center, side_length / math.sqrt(3), 3, rotation)
+
+
+def rotated_rectangle(center: Point, width: float, height: float, rotation: float) -> np.ndarray:
+    """
+    Returns the (4, 2) corners of a rectangle rotated clockwise about its center.
+    """
+    # The corners of a square, starting top left, are a 4-gon turned back by 45 degrees; stretch them to the
+    # rectangle's half extents.
+    corners = unit_polygon(4, -45) * math.sqrt(2)
+    theta = math.radians(rotation)
+    cos, sin = math.cos(theta), math.sin(theta)
+    rotation_matrix = np.array([[cos, sin], [-sin, cos]])
+    return (corners * (width / 2, height / 2)) @ rotation_matrix + center
@@ -0,0 +1,40 @@
+import math
+
+import numpy as np
+import pytest
+
+from .geometry import equilateral_triangle, rotated_rectangle, star, unit_polygon
+
+
+def test_unit_polygon_is_cached():
+    assert unit_polygon(5, 10) is unit_polygon(5, 10)
+
+    with pytest.raises(ValueError):
+        unit_polygon(5, 10)[0, 0] = 1
+
+
+def test_equilateral_triangle():
+    vertices = equilateral_triangle((100, 100), 60)
+
+    # One vertex points straight up
+    assert np.allclose(vertices[0], (100, 100 - 60 / math.sqrt(3)))
+
+    sides = np.hypot(*(vertices - np.roll(vertices, 1, axis=0)).T)
+    assert np.allclose(sides, 60)
+
+
+def test_star_radii():
+    vertices = star((0, 0), 50, 20, 5)
+    radii = np.hypot(*vertices.T)
+
+    assert vertices.shape == (10, 2)
+    assert np.allclose(radii[::2], 50)
+    assert np.allclose(radii[1::2], 20)
+
+
+def test_rotated_rectangle():
+    assert np.allclose(rotated_rectangle((50, 50), 40, 20, 0)[[0, 2]], [(30, 40), (70, 60)])
+
+    # A quarter turn swaps the rectangle's extents
+    corners = rotated_rectangle((50, 50), 40, 20, 90)
+    assert np.allclose(np.ptp(corners, axis=0), (20, 40))
@@ -0,0 +1,112 @@
+"""Layers - Canvas layers and the stack that orders them."""
+
+import copy
+
+from collections.abc import Iterator, Mapping, Sequence
+
+import pygame
+
+from .compositor import BlendMode
+
+
+class Layer:
+    def __init__(self, name: str, width: int, height: int):
+        self.name = name
+        # Create a surface with per-pixel alpha so that layers can be transparent
+        self.surface = pygame.Surface((width, height), pygame.SRCALPHA)
+        # By default, a layer is visible
+        self.visible = True
+        # Opacity and blend mode are applied while compositing, so the layer's pixels keep their own alpha
+        self.opacity: float = 1.0
+        self.blend_mode: BlendMode = "normal"
+
+    def copy(self, name: str) -> 'Layer':
+        """
+        Returns a copy of this layer, pixels and settings included, under a new name.
+        """
+        duplicate = copy.copy(self)
+        duplicate.name = name
+        duplicate.surface = self.surface.copy()
+        return duplicate
+
+
+class LayerStack(Mapping[str, Layer]):
+    """
+    Layers in compositing order, bottom first.
+
+    Lookup, appending and removal by name are O(1) dict operations. Reordering only moves references to the
+    layers around, never their pixels, and positions are recomputed lazily the next time one is asked for.
+    """
+
+    def __init__(self) -> None:
+        self._layers: dict[str, Layer] = {}
+        self._positions: dict[str, int] | None = {}
+
+    def __getitem__(self, name: str) -> Layer:
+        return self._layers[name]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._layers)
+
+    def __len__(self) -> int:
+        return len(self._layers)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._layers
+
+    def index(self, name: str) -> int:
+        """
+        Returns the position of a layer, 0 being the bottom.
+        """
+        if self._positions is None:
+            self._positions = {layer_name: i for i, layer_name in enumerate(self._layers)}
+        return self._positions[name]
+
+    def append(self, layer: Layer) -> None:
+        """
+        Puts a layer on top of the stack.
+        """
+        if self._positions is not None:
+            self._positions[layer.name] = len(self._layers)
+        self._layers[layer.name] = layer
+
+    def remove(self, name: str) -> int:
+        """
+        Removes a layer and returns the position it had.
+        """
+        index = self.index(name)
+        del self._layers[name]
+        if index == len(self._layers):
+            del self._positions[name]
+        else:
+            # Everything above the removed layer shifted down by one
+            self._positions = None
+        return index
+
+    def reorder(self, names: Sequence[str]) -> int:
+        """
+        Rearranges the stack into the given order, which must contain every layer exactly once.
+
+        Returns:
+            int: The lowest position whose layer changed, or the stack's length if nothing moved.
+        """
+        if len(names) != len(self._layers) or set(names) != self._layers.keys():
+            raise ValueError("The new order must list every layer exactly once.")
+
+        lowest = next((i for i, (old, new) in enumerate(zip(self._layers, names)) if old != new), len(names))
+        if lowest < len(names):
+            self._layers = {name: self._layers[name] for name in names}
+            self._positions = None
+        return lowest
+
+    def move(self, name: str, index: int) -> int:
+        """
+        Moves a layer to a new position, clamped to the stack.
+
+        Returns:
+            int: The lowest position whose layer changed.
+        """
+        order = list(self._layers)
+        order.remove(name)
+        order.insert(max(0, min(index, len(order))), name)
+        return self.reorder(order)
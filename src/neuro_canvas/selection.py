@@ -0,0 +1,194 @@
+"""Selection - Rectangle, ellipse and magic-wand selections stored as bitmasks."""
+
+from typing import Final, Literal
+
+from pygame import Rect
+import pygame
+import numpy as np
+
+SelectionMode = Literal["replace", "add", "subtract", "intersect"]
+
+SELECTION_MODES: Final[tuple[str, ...]] = ("replace", "add", "subtract", "intersect")
+
+Point = tuple[int, int]
+
+
+def color_matches(pixels: pygame.Surface, color: pygame.Color, tolerance: int = 0) -> np.ndarray:
+    """
+    Returns a (width, height) array telling which pixels are within the tolerance of a color on every channel.
+    """
+    rgba = np.dstack((pygame.surfarray.pixels3d(pixels), pygame.surfarray.pixels_alpha(pixels)))
+    if tolerance <= 0:
+        return np.all(rgba == tuple(color), axis=2)
+    return np.all(np.abs(rgba.astype(np.int16) - tuple(color)) <= tolerance, axis=2)
+
+
+def flood_mask(matches: np.ndarray, start: Point) -> np.ndarray:
+    """
+    Returns the pixels 4-connected to the start through matching pixels.
+
+    Scans whole horizontal runs at a time, so the Python loop runs once per run instead of once per pixel.
+
+    Args:
+        matches (np.ndarray): A (width, height) boolean array of the pixels the flood may spread to.
+        start (Point): Where the flood starts.
+
+    Returns:
+        np.ndarray: A (width, height) boolean array of the flooded pixels, empty if the start doesn't match.
+    """
+    width, height = matches.shape
+    filled = np.zeros_like(matches)
+    stack = [start]
+
+    while stack:
+        x, y = stack.pop()
+        if filled[x, y] or not matches[x, y]:
+            continue
+
+        # Arrays from surfarray are indexed [x, y], so a row of the image is a column here.
+        row = matches[:, y]
+        gaps = np.flatnonzero(~row[:x])
+        left = gaps[-1] + 1 if len(gaps) else 0
+        gaps = np.flatnonzero(~row[x:])
+        right = x + gaps[0] if len(gaps) else width
+        filled[left:right, y] = True
+
+        for ny in (y - 1, y + 1):
+            if 0 <= ny < height:
+                open_pixels = matches[left:right, ny] & ~filled[left:right, ny]
+                # Seed each run of open pixels once, at its first pixel
+                starts = np.flatnonzero(open_pixels & ~np.concatenate(([False], open_pixels[:-1])))
+                stack.extend((left + int(i), ny) for i in starts)
+
+    return filled
+
+
+def array_bounds(selected: np.ndarray) -> Rect | None:
+    """
+    Returns the smallest rectangle containing every True pixel of a (width, height) array, or None if there are none.
+    """
+    columns = np.flatnonzero(selected.any(axis=1))
+    if not len(columns):
+        return None
+    rows = np.flatnonzero(selected.any(axis=0))
+    left, top, right, bottom = int(columns[0]), int(rows[0]), int(columns[-1]) + 1, int(rows[-1]) + 1
+    return Rect(left, top, right - left, bottom - top)
+
+
+def _mask_from_array(selected: np.ndarray) -> pygame.mask.Mask:
+    surface = pygame.Surface(selected.shape, pygame.SRCALPHA)
+    pygame.surfarray.pixels_alpha(surface)[...] = selected * np.uint8(255)
+    return pygame.mask.from_surface(surface)
+
+
+class Selection:
+    """
+    A set of selected pixels.
+
+    The bitmask only covers the selection's bounding box, which is all any region-scoped operation touches.
+    """
+
+    def __init__(self, rect: Rect, mask: pygame.mask.Mask):
+        self.rect = Rect(rect)
+        self.mask = mask
+
+    @classmethod
+    def _cropped(cls, rect: Rect, mask: pygame.mask.Mask, bounds: Rect) -> 'Selection | None':
+        # Shrink to the selected pixels that lie within the bounds, or None if there are none
+        clipped = rect.clip(bounds)
+        inside = pygame.mask.Mask(clipped.size)
+        inside.draw(mask, (rect.x - clipped.x, rect.y - clipped.y))
+
+        boxes = inside.get_bounding_rects()
+        if not boxes:
+            return None
+        box = boxes[0].unionall(boxes[1:])
+        cropped = pygame.mask.Mask(box.size)
+        cropped.draw(inside, (-box.x, -box.y))
+        return cls(box.move(clipped.topleft), cropped)
+
+    @classmethod
+    def rectangle(cls, rect: Rect, bounds: Rect) -> 'Selection | None':
+        rect = Rect(rect).clip(bounds)
+        if not rect:
+            return None
+        return cls(rect, pygame.mask.Mask(rect.size, fill=True))
+
+    @classmethod
+    def ellipse(cls, rect: Rect, bounds: Rect) -> 'Selection | None':
+        rect = Rect(rect)
+        if rect.width <= 0 or rect.height <= 0:
+            return None
+        shape = pygame.Surface(rect.size, pygame.SRCALPHA)
+        pygame.draw.ellipse(shape, (255, 255, 255), shape.get_rect())
+        return cls._cropped(rect, pygame.mask.from_surface(shape), bounds)
+
+    @classmethod
+    def from_array(cls, selected: np.ndarray) -> 'Selection | None':
+        """
+        Builds a selection from a (width, height) boolean array covering the whole canvas.
+        """
+        rect = array_bounds(selected)
+        if rect is None:
+            return None
+        return cls(rect, _mask_from_array(selected[rect.left:rect.right, rect.top:rect.bottom]))
+
+    @classmethod
+    def from_stencil(cls, stencil: pygame.Surface, topleft: Point, bounds: Rect) -> 'Selection | None':
+        """
+        Builds a selection from the opaque pixels of a surface placed at the given position.
+        """
+        return cls._cropped(stencil.get_rect(topleft=topleft), pygame.mask.from_surface(stencil), bounds)
+
+    def combine(self, other: 'Selection | None', mode: SelectionMode) -> 'Selection | None':
+        """
+        Returns this selection combined with another, which replaces it outright in "replace" mode.
+        """
+        if mode == "replace":
+            return other
+        if other is None:
+            return None if mode == "intersect" else self
+
+        union = self.rect.union(other.rect)
+        if mode == "intersect":
+            combined = self.mask.overlap_mask(other.mask, (other.rect.x - self.rect.x, other.rect.y - self.rect.y))
+            return Selection._cropped(self.rect, combined, union)
+
+        combined = pygame.mask.Mask(union.size)
+        combined.draw(self.mask, (self.rect.x - union.x, self.rect.y - union.y))
+        offset = (other.rect.x - union.x, other.rect.y - union.y)
+        if mode == "add":
+            combined.draw(other.mask, offset)
+        else:
+            combined.erase(other.mask, offset)
+        return Selection._cropped(union, combined, union)
+
+    def to_array(self) -> np.ndarray:
+        """
+        Returns which pixels of the bounding box are selected as a (width, height) boolean array.
+        """
+        return pygame.surfarray.array_alpha(self.stencil()) > 0
+
+    def stencil(
+        self,
+        inside: tuple[int, int, int, int] = (255, 255, 255, 255),
+        outside: tuple[int, int, int, int] = (0, 0, 0, 0),
+    ) -> pygame.Surface:
+        """
+        Returns a bounding-box-sized surface colored by whether each pixel is selected.
+        """
+        return self.mask.to_surface(setcolor=inside, unsetcolor=outside)
+
+    def cut_out(self, pixels: pygame.Surface) -> pygame.Surface:
+        """
+        Returns a copy of the selected pixels of a surface, with everything else in the bounding box transparent.
+        """
+        piece = pixels.subsurface(self.rect).copy()
+        piece.blit(self.stencil(), (0, 0), special_flags=pygame.BLEND_RGBA_MULT)
+        return piece
+
+    def clear(self, pixels: pygame.Surface) -> None:
+        """
+        Makes the selected pixels of a surface fully transparent.
+        """
+        pixels.blit(self.stencil((0, 0, 0, 0), (255, 255, 255, 255)), self.rect, special_flags=pygame.BLEND_RGBA_MULT)
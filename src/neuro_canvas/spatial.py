@@ -0,0 +1,125 @@
+"""Spatial - A grid index over the bounds of shapes, and exact tests for whether a shape covers a point."""
+
+from typing import Final
+from collections.abc import Iterator
+
+from pygame import Rect
+import numpy as np
+
+# Side of a grid cell in pixels; small enough that a cell holds few shapes, big enough that a shape spans few cells
+GRID_CELL_SIZE: Final = 32
+
+Cell = tuple[int, int]
+
+
+class ShapeGrid:
+    """
+    Buckets shapes by the grid cells their bounds overlap, so finding the shapes at a point only looks at one cell
+    however many shapes there are.
+
+    Shapes are known by their position in the display list. New shapes always come last, so every cell lists its
+    shapes in drawing order.
+    """
+
+    def __init__(self, area: Rect, cell_size: int = GRID_CELL_SIZE):
+        """
+        Args:
+            area (Rect): The area shapes are drawn in; bounds reaching past it are cut off.
+            cell_size (int, optional): The side of a cell in pixels. Defaults to GRID_CELL_SIZE.
+        """
+        self._area = Rect(area)
+        self._cell_size = cell_size
+        self._cells: dict[Cell, list[int]] = {}
+
+    def copy(self) -> 'ShapeGrid':
+        duplicate = ShapeGrid(self._area, self._cell_size)
+        duplicate._cells = {cell: list(shapes) for cell, shapes in self._cells.items()}
+        return duplicate
+
+    def _cells_of(self, bounds: Rect) -> Iterator[Cell]:
+        bounds = bounds.clip(self._area)
+        if not bounds:
+            return
+        size = self._cell_size
+        for x in range(bounds.left // size, (bounds.right - 1) // size + 1):
+            for y in range(bounds.top // size, (bounds.bottom - 1) // size + 1):
+                yield x, y
+
+    def insert(self, shape: int, bounds: Rect) -> None:
+        for cell in self._cells_of(bounds):
+            self._cells.setdefault(cell, []).append(shape)
+
+    def remove(self, shape: int, bounds: Rect) -> None:
+        for cell in self._cells_of(bounds):
+            shapes = self._cells[cell]
+            # Shapes are nearly always removed newest first, which is the end of the list
+            if shapes[-1] == shape:
+                shapes.pop()
+            else:
+                shapes.remove(shape)
+            if not shapes:
+                del self._cells[cell]
+
+    def at(self, point: tuple[int, int]) -> list[int]:
+        """
+        Returns the shapes whose cells contain a point, in drawing order. Their bounds may still miss the point.
+        """
+        x, y = point
+        return self._cells.get((x // self._cell_size, y // self._cell_size), [])
+
+
+def _segment_distance(points: np.ndarray, closed: bool, point: np.ndarray) -> float:
+    starts = points
+    ends = np.roll(points, -1, axis=0) if closed and len(points) > 2 else points[1:]
+    starts = starts[:len(ends)]
+    if len(ends) == 0:
+        return float(np.hypot(*(points[0] - point)))
+
+    directions = ends - starts
+    lengths = np.maximum((directions ** 2).sum(axis=1), 1e-12)
+    # Where along each segment the closest point lies, from 0 at its start to 1 at its end
+    along = np.clip(((point - starts) * directions).sum(axis=1) / lengths, 0, 1)
+    closest = starts + directions * along[:, None]
+    return float(np.hypot(*(closest - point).T).min())
+
+
+def _inside_polygon(points: np.ndarray, point: np.ndarray) -> bool:
+    # Even-odd rule: count the edges a ray going right from the point crosses
+    x, y = point
+    x1, y1 = points.T
+    x2, y2 = np.roll(points, -1, axis=0).T
+    straddles = (y1 > y) != (y2 > y)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        crossings = x1 + (y - y1) * (x2 - x1) / (y2 - y1)
+    return bool(np.count_nonzero(straddles & (x < crossings)) % 2)
+
+
+def covers(
+    kind: str, points: np.ndarray, width: float, radius: float, closed: bool, point: tuple[int, int], tolerance: float
+) -> bool:
+    """
+    Tells whether a shape covers a point, or comes within the tolerance of it.
+
+    Args:
+        kind (str): "polyline", "polygon", "circle", "disc" or "rectangle".
+        points (np.ndarray): The shape's points, as stored in the display list.
+        width (float): How wide the shape's stroke is, or how wide its brush dabs spread.
+        radius (float): The radius of a circle or disc.
+        closed (bool): Whether a polyline connects its last point back to the first.
+        point (tuple[int, int]): The point to test.
+        tolerance (float): How many pixels the point may be off the shape.
+    """
+    p = np.asarray(point, dtype=np.float64)
+    reach = max(width, 1) / 2 + tolerance
+
+    if kind == "disc":
+        return bool(np.hypot(*(points[0] - p)) <= radius + tolerance)
+    if kind == "circle":
+        return bool(abs(np.hypot(*(points[0] - p)) - radius) <= reach)
+    if kind == "rectangle":
+        (left, top), (right, bottom) = points.tolist()
+        corners = np.array([(left, top), (right, top), (right, bottom), (left, bottom)], dtype=np.float64)
+        return _segment_distance(corners, True, p) <= reach
+    if kind == "polygon":
+        return (len(points) > 2 and _inside_polygon(points, p)) or _segment_distance(points, True, p) <= tolerance
+    return _segment_distance(points, closed, p) <= reach
@@ -0,0 +1,71 @@
+"""Startup - Reports what the app spends its start-up time on."""
+
+import subprocess
+import sys
+from typing import Final, NamedTuple
+
+# Runs the same imports and loading as start-up, then prints how long loading the config and the actions took
+PROFILED_CODE: Final = """
+import time
+import neuro_canvas.application
+from neuro_canvas.actions import load_actions
+from neuro_canvas.config.load import load_config
+start = time.perf_counter()
+load_config()
+loaded = time.perf_counter()
+load_actions()
+print(loaded - start, time.perf_counter() - loaded)
+"""
+
+
+class ImportTime(NamedTuple):
+    module: str
+    # How deep in the imports of another module this one was imported, 0 for top-level imports
+    depth: int
+    # Microseconds spent in the module itself and including everything it imported
+    self_us: int
+    cumulative_us: int
+
+
+def parse_import_times(output: str) -> list[ImportTime]:
+    """
+    Parses what `python -X importtime` writes to stderr, ignoring any other lines.
+    """
+    times = []
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # The header
+        name = fields[2][1:]  # Nested imports are indented by two spaces per level
+        module = name.lstrip()
+        times.append(ImportTime(module, (len(name) - len(module)) // 2, int(fields[0]), int(fields[1])))
+    return times
+
+
+def profile_startup(count: int = 20) -> str:
+    """
+    Imports the app in a fresh interpreter and reports the slowest imports.
+
+    Args:
+        count (int, optional): How many modules to list. Defaults to 20.
+
+    Returns:
+        str: A report of the total import time, the modules that took the longest to import by themselves, and
+            how long loading the config and the actions took.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", PROFILED_CODE], capture_output=True, text=True, check=True
+    )
+    times = parse_import_times(result.stderr)
+    config_s, actions_s = (float(value) for value in result.stdout.split()[-2:])
+
+    # Every nested import is counted in the cumulative time of a top-level one
+    total_us = sum(t.cumulative_us for t in times if t.depth == 0)
+    lines = [f"Imports: {total_us / 1000:.1f} ms in total, slowest by their own time:"]
+    for t in sorted(times, key=lambda t: t.self_us, reverse=True)[:count]:
+        lines.append(f"{t.self_us / 1000:8.1f} ms {t.cumulative_us / 1000:8.1f} ms cumulative  {t.module}")
+    lines.append(f"Loading the config: {config_s * 1000:.1f} ms")
+    lines.append(f"Loading the actions: {actions_s * 1000:.1f} ms")
+    return "\n".join(lines)
@@ -0,0 +1,24 @@
+from .startup import ImportTime, parse_import_times, profile_startup
+
+OUTPUT = """\
+import time: self [us] | cumulative | imported package
+import time:       120 |        120 |   _io
+import time:        80 |        200 | neuro_canvas
+Proceeding with default configs...
+import time:      1500 |       1500 |     numpy._core
+"""
+
+
+def test_parse_import_times():
+    assert parse_import_times(OUTPUT) == [
+        ImportTime("_io", 1, 120, 120),
+        ImportTime("neuro_canvas", 0, 80, 200),
+        ImportTime("numpy._core", 2, 1500, 1500),
+    ]
+
+
+def test_profile_startup():
+    report = profile_startup(count=5).splitlines()
+    assert report[0].startswith("Imports: ")
+    assert len(report) == 8
+    assert report[-1].startswith("Loading the actions: ")
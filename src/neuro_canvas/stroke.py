@@ -0,0 +1,286 @@
+"""Stroke - Thick, filled and anti-aliased shape rasterization for the canvas."""
+
+from typing import Final, Literal
+from collections.abc import Sequence
+
+from pygame import gfxdraw, Rect
+import pygame
+import numpy as np
+
+CapStyle = Literal["butt", "round", "square"]
+JoinStyle = Literal["round", "bevel", "miter"]
+
+CAP_STYLES: Final[tuple[str, ...]] = ("butt", "round", "square")
+JOIN_STYLES: Final[tuple[str, ...]] = ("round", "bevel", "miter")
+
+# Miters longer than this multiple of the half width fall back to a bevel, like SVG's stroke-miterlimit.
+MITER_LIMIT: Final = 4.0
+
+Point = tuple[float, float]
+
+
+def _as_array(points: Sequence[Point]) -> np.ndarray:
+    return np.asarray(points, dtype=np.float64).reshape(-1, 2)
+
+
+def _drop_repeats(pts: np.ndarray, closed: bool) -> np.ndarray:
+    # Repeated points have no direction to offset along.
+    keep = np.ones(len(pts), dtype=bool)
+    keep[1:] = np.any(pts[1:] != pts[:-1], axis=1)
+    pts = pts[keep]
+    if closed and len(pts) > 2 and np.array_equal(pts[0], pts[-1]):
+        pts = pts[:-1]
+    return pts
+
+
+def _union(rects: list[Rect]) -> Rect:
+    if not rects:
+        return Rect(0, 0, 0, 0)
+    return rects[0].unionall(rects[1:])
+
+
+def _disc_center(center: np.ndarray) -> tuple[int, int]:
+    return int(round(center[0])), int(round(center[1]))
+
+
+def _rasterize(
+    surface: pygame.Surface,
+    color: pygame.Color,
+    polygons: list[np.ndarray],
+    discs: list[np.ndarray],
+    radius: float,
+    antialias: bool,
+) -> Rect:
+    """
+    Fills a stroke's pieces with scanline polygon and circle fills.
+
+    When antialiasing, the smoothed edges of every piece are drawn before any piece is filled, so the solid fills
+    cover the partially transparent edge pixels where pieces overlap and no seams show through.
+    """
+    r = max(int(round(radius)), 0)
+
+    if antialias:
+        for polygon in polygons:
+            gfxdraw.aapolygon(surface, np.rint(polygon).astype(int).tolist(), color)
+        for center in discs:
+            gfxdraw.aacircle(surface, *_disc_center(center), r, color)
+
+    dirty = [pygame.draw.polygon(surface, color, polygon.tolist()) for polygon in polygons]
+    dirty.extend(pygame.draw.circle(surface, color, _disc_center(center), r) for center in discs)
+
+    rect = _union(dirty)
+    return rect.inflate(2, 2) if antialias and rect else rect
+
+
+def _join_polygons(
+    vertices: np.ndarray, normals_in: np.ndarray, normals_out: np.ndarray, join: JoinStyle, half_width: float
+) -> list[np.ndarray]:
+    """
+    Builds the wedge polygons that close the gaps between consecutive segment quads for bevel and miter joins.
+    """
+    polygons = []
+
+    # The outer side of the turn is where the normals diverge; the cross product of the directions tells us which
+    # side that is, so only one wedge per vertex is ever drawn.
+    turn = normals_in[:, 0] * normals_out[:, 1] - normals_in[:, 1] * normals_out[:, 0]
+    side = np.where(turn > 0, -1.0, 1.0)[:, None]
+    outer_in = vertices + normals_in * side
+    outer_out = vertices + normals_out * side
+
+    if join == "miter":
+        # The bisector of the two normals has length 2 * half_width * cos(theta / 2), and the miter tip sits
+        # half_width / cos(theta / 2) away from the vertex along it.
+        bisector = normals_in + normals_out
+        bisector_len = np.hypot(bisector[:, 0], bisector[:, 1])
+        with np.errstate(divide="ignore", invalid="ignore"):
+            miter_len = 2 * half_width * half_width / bisector_len
+            tip = vertices + bisector / bisector_len[:, None] * miter_len[:, None] * side
+        use_miter = np.isfinite(miter_len) & (miter_len <= MITER_LIMIT * half_width)
+    else:
+        tip = vertices
+        use_miter = np.zeros(len(vertices), dtype=bool)
+
+    for i in range(len(vertices)):
+        if use_miter[i]:
+            polygons.append(np.array([vertices[i], outer_in[i], tip[i], outer_out[i]]))
+        else:
+            polygons.append(np.array([vertices[i], outer_in[i], outer_out[i]]))
+
+    return polygons
+
+
+def _joins(
+    pts: np.ndarray, normals: np.ndarray, closed: bool, join: JoinStyle, half_width: float
+) -> tuple[list[np.ndarray], list[np.ndarray]]:
+    # Joins sit on every vertex shared by two segments.
+    if closed:
+        vertices = pts
+        normals_in = np.roll(normals, 1, axis=0)
+        normals_out = normals
+    else:
+        vertices = pts[1:-1]
+        normals_in = normals[:-1]
+        normals_out = normals[1:]
+
+    if join == "round":
+        return [], list(vertices)
+    return _join_polygons(vertices, normals_in, normals_out, join, half_width), []
+
+
+def _stroke_point(
+    surface: pygame.Surface, color: pygame.Color, point: np.ndarray, half_width: float, cap: CapStyle, antialias: bool
+) -> Rect:
+    # A zero-length stroke is just its two caps on top of each other.
+    if cap == "butt":
+        return Rect(0, 0, 0, 0)
+    if cap == "square":
+        x, y = point
+        square = np.array([
+            (x - half_width, y - half_width), (x + half_width, y - half_width),
+            (x + half_width, y + half_width), (x - half_width, y + half_width),
+        ])
+        return _rasterize(surface, color, [square], [], half_width, antialias)
+    return _rasterize(surface, color, [], [point], half_width, antialias)
+
+
+def stroke_polyline(
+    surface: pygame.Surface,
+    color: pygame.Color,
+    points: Sequence[Point],
+    width: int,
+    closed: bool = False,
+    cap: CapStyle = "round",
+    join: JoinStyle = "round",
+    antialias: bool = False,
+) -> Rect:
+    """
+    Strokes a polyline at an arbitrary width.
+
+    Every segment is rasterized as a single quad, and joins and caps are filled as small polygons or discs at the
+    vertices only, so the cost grows with the number of segments rather than the number of pixels along the path.
+
+    Args:
+        surface (pygame.Surface): The surface to draw on.
+        color (pygame.Color): The stroke color.
+        points (Sequence[Point]): The vertices of the polyline.
+        width (int): The stroke width in pixels.
+        closed (bool, optional): Whether to connect the last point back to the first. Defaults to False.
+        cap (CapStyle, optional): How open ends are finished. Defaults to "round".
+        join (JoinStyle, optional): How consecutive segments are connected. Defaults to "round".
+        antialias (bool, optional): Whether to smooth the stroke edges. Defaults to False.
+
+    Returns:
+        Rect: The area of the surface that was touched.
+    """
+    pts = _as_array(points)
+    if len(pts) == 0:
+        return Rect(0, 0, 0, 0)
+
+    if width <= 1:
+        if len(pts) < 2:
+            return Rect(0, 0, 0, 0)
+        if antialias:
+            return pygame.draw.aalines(surface, color, closed, pts.tolist())
+        return pygame.draw.lines(surface, color, closed, pts.tolist())
+
+    half_width = width / 2
+
+    pts = _drop_repeats(pts, closed)
+
+    if len(pts) == 1:
+        return _stroke_point(surface, color, pts[0], half_width, cap, antialias)
+
+    closed = closed and len(pts) > 2
+    starts = pts
+    ends = np.roll(pts, -1, axis=0) if closed else pts[1:]
+    starts = starts[:len(ends)]
+
+    directions = ends - starts
+    lengths = np.hypot(directions[:, 0], directions[:, 1])
+    units = directions / lengths[:, None]
+    normals = np.stack((-units[:, 1], units[:, 0]), axis=1) * half_width
+
+    if not closed and cap == "square":
+        starts = starts.copy()
+        ends = ends.copy()
+        starts[0] -= units[0] * half_width
+        ends[-1] += units[-1] * half_width
+
+    quads = np.stack((starts + normals, ends + normals, ends - normals, starts - normals), axis=1)
+    polygons: list[np.ndarray] = list(quads)
+    discs: list[np.ndarray] = []
+
+    if closed or len(pts) > 2:
+        join_polygons, join_discs = _joins(pts, normals, closed, join, half_width)
+        polygons.extend(join_polygons)
+        discs.extend(join_discs)
+
+    if not closed and cap == "round":
+        discs.extend((pts[0], pts[-1]))
+
+    return _rasterize(surface, color, polygons, discs, half_width, antialias)
+
+
+def stroke_circle(
+    surface: pygame.Surface,
+    color: pygame.Color,
+    center: Point,
+    radius: int,
+    width: int,
+    antialias: bool = False,
+) -> Rect:
+    """
+    Strokes a circle outline of the given width, centred on the radius.
+
+    Args:
+        surface (pygame.Surface): The surface to draw on.
+        color (pygame.Color): The stroke color.
+        center (Point): The circle's center.
+        radius (int): The circle's radius.
+        width (int): The stroke width in pixels.
+        antialias (bool, optional): Whether to smooth the stroke edges. Defaults to False.
+
+    Returns:
+        Rect: The area of the surface that was touched.
+    """
+    x, y = int(round(center[0])), int(round(center[1]))
+
+    if width <= 1:
+        if antialias:
+            gfxdraw.aacircle(surface, x, y, radius, color)
+        else:
+            gfxdraw.circle(surface, x, y, radius, color)
+        return Rect(x - radius - 1, y - radius - 1, 2 * radius + 3, 2 * radius + 3)
+
+    outer = radius + width // 2
+    inner = outer - width
+    dirty = pygame.draw.circle(surface, color, (x, y), outer, width)
+
+    if antialias:
+        gfxdraw.aacircle(surface, x, y, outer, color)
+        if inner > 0:
+            gfxdraw.aacircle(surface, x, y, inner, color)
+        dirty = Rect(x - outer - 1, y - outer - 1, 2 * outer + 3, 2 * outer + 3)
+
+    return dirty
+
+
+def fill_polygon(
+    surface: pygame.Surface, color: pygame.Color, points: Sequence[Point], antialias: bool = False
+) -> Rect:
+    """
+    Fills the interior of a polygon in a single scanline pass.
+    """
+    pts = _as_array(points)
+    if len(pts) < 3:
+        return Rect(0, 0, 0, 0)
+    return _rasterize(surface, color, [pts], [], 0, antialias)
+
+
+def fill_circle(
+    surface: pygame.Surface, color: pygame.Color, center: Point, radius: int, antialias: bool = False
+) -> Rect:
+    """
+    Fills a disc in a single scanline pass.
+    """
+    return _rasterize(surface, color, [], [_as_array([center])[0]], radius, antialias)
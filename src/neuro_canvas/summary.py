@@ -0,0 +1,148 @@
+"""Summary - Cached per-tile statistics that answer questions about what is on a surface."""
+
+from typing import Final, NamedTuple
+
+from pygame import Rect
+import pygame
+import numpy as np
+
+from .selection import array_bounds
+
+TILE_SIZE: Final = 64
+
+# Colors are grouped by their top 4 bits per channel before counting, so near-identical shades add up.
+QUANTIZE_SHIFT: Final = 4
+
+
+class TileStats(NamedTuple):
+    covered: int
+    bins: np.ndarray
+    counts: np.ndarray
+    sums: np.ndarray
+    bounds: Rect | None
+
+
+class RegionSummary(NamedTuple):
+    coverage: float
+    colors: list[tuple[pygame.Color, float]]
+
+
+def _stats(surface: pygame.Surface, area: Rect, reference: pygame.Surface | None) -> TileStats:
+    rgb = pygame.surfarray.array3d(surface.subsurface(area))
+    if reference is None:
+        covered = pygame.surfarray.array_alpha(surface.subsurface(area)) > 0
+    else:
+        covered = np.any(rgb != pygame.surfarray.array3d(reference.subsurface(area)), axis=2)
+
+    colors = rgb[covered].astype(np.int64)
+    if not len(colors):
+        return TileStats(0, np.empty(0, np.int64), np.empty(0, np.int64), np.empty((0, 3)), None)
+
+    quantized = colors >> QUANTIZE_SHIFT
+    keys = (quantized[:, 0] << 16) | (quantized[:, 1] << 8) | quantized[:, 2]
+    bins, inverse, counts = np.unique(keys, return_inverse=True, return_counts=True)
+    sums = np.stack([np.bincount(inverse, weights=colors[:, c], minlength=len(bins)) for c in range(3)], axis=1)
+
+    return TileStats(len(colors), bins, counts, sums, array_bounds(covered).move(area.topleft))
+
+
+class SurfaceSummary:
+    """
+    Statistics about one surface, cached per tile.
+
+    Changing a part of the surface only invalidates the tiles that overlap it, so queries after a small stroke
+    recompute a few tiles instead of scanning the whole surface.
+
+    A pixel counts as covered when it isn't transparent, or, given a reference surface, when its color differs
+    from the reference's. The same reference must be used for every query of one summary.
+    """
+
+    def __init__(self, tile_size: int = TILE_SIZE):
+        self._tile_size = tile_size
+        self._tiles: dict[tuple[int, int], TileStats] = {}
+
+    def invalidate(self, area: Rect | None = None) -> None:
+        """
+        Forgets the statistics of every tile overlapping the area, or of every tile if no area is given.
+        """
+        if area is None:
+            self._tiles.clear()
+            return
+        if not area:
+            return
+        size = self._tile_size
+        for tx in range(area.left // size, (area.right - 1) // size + 1):
+            for ty in range(area.top // size, (area.bottom - 1) // size + 1):
+                self._tiles.pop((tx, ty), None)
+
+    def _tile(self, surface: pygame.Surface, tx: int, ty: int, reference: pygame.Surface | None) -> TileStats:
+        stats = self._tiles.get((tx, ty))
+        if stats is None:
+            size = self._tile_size
+            area = Rect(tx * size, ty * size, size, size).clip(surface.get_rect())
+            stats = self._tiles[tx, ty] = _stats(surface, area, reference)
+        return stats
+
+    def _region_stats(
+        self, surface: pygame.Surface, area: Rect, reference: pygame.Surface | None
+    ) -> list[TileStats]:
+        size = self._tile_size
+        bounds = surface.get_rect()
+        stats = []
+        for tx in range(area.left // size, (area.right - 1) // size + 1):
+            for ty in range(area.top // size, (area.bottom - 1) // size + 1):
+                tile = Rect(tx * size, ty * size, size, size).clip(bounds)
+                if area.contains(tile):
+                    stats.append(self._tile(surface, tx, ty, reference))
+                else:
+                    # Edge tiles that are only partly inside are computed on the spot rather than cached
+                    stats.append(_stats(surface, tile.clip(area), reference))
+        return stats
+
+    def bounding_rect(self, surface: pygame.Surface, reference: pygame.Surface | None = None) -> Rect | None:
+        """
+        Returns the smallest rectangle containing every covered pixel, or None if nothing is covered.
+        """
+        boxes = [stats.bounds for stats in self._region_stats(surface, surface.get_rect(), reference) if stats.bounds]
+        return boxes[0].unionall(boxes[1:]) if boxes else None
+
+    def describe(
+        self,
+        surface: pygame.Surface,
+        area: Rect | None = None,
+        count: int = 3,
+        reference: pygame.Surface | None = None,
+    ) -> RegionSummary:
+        """
+        Summarizes the covered pixels of an area of the surface.
+
+        Args:
+            surface (pygame.Surface): The surface this summary belongs to.
+            area (Rect | None, optional): The area to summarize. Defaults to the whole surface.
+            count (int, optional): How many dominant colors to return. Defaults to 3.
+            reference (pygame.Surface | None, optional): The surface to compare against. Defaults to None.
+
+        Returns:
+            RegionSummary: The share of the area that is covered, and the most common colors of the covered pixels
+                with their share of them.
+        """
+        area = surface.get_rect() if area is None else Rect(area).clip(surface.get_rect())
+        if not area:
+            return RegionSummary(0.0, [])
+
+        stats = [s for s in self._region_stats(surface, area, reference) if s.covered]
+        covered = sum(s.covered for s in stats)
+        if not covered:
+            return RegionSummary(0.0, [])
+
+        bins, inverse = np.unique(np.concatenate([s.bins for s in stats]), return_inverse=True)
+        counts = np.bincount(inverse, weights=np.concatenate([s.counts for s in stats]), minlength=len(bins))
+        sums = np.stack([np.bincount(inverse, weights=np.concatenate([s.sums[:, c] for s in stats]),
+                                     minlength=len(bins)) for c in range(3)], axis=1)
+
+        colors = []
+        for i in np.argsort(counts)[::-1][:count]:
+            # Report the average of the shades in a group rather than the group's corner
+            mean = np.rint(sums[i] / counts[i]).astype(int)
+            colors.append((pygame.Color(*mean.tolist()), float(counts[i] / covered)))
+        return RegionSummary(covered / area.width / area.height, colors)
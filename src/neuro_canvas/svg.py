@@ -0,0 +1,124 @@
+"""SVG - Writes the layers of the canvas out as an SVG document."""
+
+import base64
+import io
+
+from typing import Final
+from collections.abc import Iterable
+from xml.sax.saxutils import quoteattr
+
+import pygame
+import numpy as np
+
+from .brushes import BRUSH_TIPS
+from .compositor import BlendMode
+from .layers import Layer
+from .stroke import CAP_STYLES, JOIN_STYLES, MITER_LIMIT
+from .vector import PRIMITIVE_KINDS, DisplayList, VectorLayer
+
+# CSS names of the blend modes; "add" is what CSS calls plus-lighter
+SVG_BLEND_MODES: Final[dict[BlendMode, str]] = {
+    "normal": "normal",
+    "multiply": "multiply",
+    "screen": "screen",
+    "add": "plus-lighter",
+    "overlay": "overlay",
+}
+
+
+def _number(value: float) -> str:
+    return f"{value:.2f}".rstrip("0").rstrip(".")
+
+
+def _points(points: np.ndarray) -> str:
+    # A pixel's center is half a pixel into it in SVG coordinates
+    return " ".join(f"{_number(x + 0.5)},{_number(y + 0.5)}" for x, y in points.tolist())
+
+
+def _paint(attribute: str, color: np.ndarray) -> str:
+    r, g, b, a = color.tolist()
+    opacity = "" if a == 255 else f' {attribute}-opacity="{_number(a / 255)}"'
+    return f'{attribute}="rgb({r},{g},{b})"{opacity}'
+
+
+def shape_to_svg(shapes: DisplayList, record: np.void) -> str:
+    """
+    Returns the SVG element for one primitive of a display list.
+
+    Brush tips other than "solid" are written as plain strokes of the same width.
+    """
+    kind = PRIMITIVE_KINDS[record["kind"]]
+    fill, stroke = _paint("fill", record["color"]), _paint("stroke", record["color"])
+    rendering = "" if record["antialias"] else ' shape-rendering="crispEdges"'
+    points = shapes.points(record)
+
+    if kind in ("circle", "disc"):
+        (x, y), = points.tolist()
+        geometry = f'<circle cx="{_number(x + 0.5)}" cy="{_number(y + 0.5)}" r="{int(record["radius"])}"'
+        if kind == "disc":
+            return f'{geometry} {fill} stroke="none"{rendering}/>'
+        stroke_width = max(int(record["width"]), 1)
+        return f'{geometry} fill="none" {stroke} stroke-width="{stroke_width}"{rendering}/>'
+
+    if kind == "polygon":
+        return f'<polygon points="{_points(points)}" {fill} stroke="none"{rendering}/>'
+    if kind == "rectangle":
+        (left, top), (right, bottom) = points.tolist()
+        return (
+            f'<rect x="{_number(left + 0.5)}" y="{_number(top + 0.5)}" width="{_number(right - left)}" '
+            f'height="{_number(bottom - top)}" fill="none" {stroke} stroke-width="1"{rendering}/>'
+        )
+
+    element = "polygon" if record["closed"] else "polyline"
+    tip = BRUSH_TIPS[record["tip"]]
+    cap = CAP_STYLES[record["cap"]] if tip == "solid" else ("square" if tip == "square" else "round")
+    join = JOIN_STYLES[record["join"]] if tip == "solid" else "round"
+    return (
+        f'<{element} points="{_points(points)}" fill="none" {stroke} '
+        f'stroke-width="{max(int(record["width"]), 1)}" stroke-linecap="{cap}" stroke-linejoin="{join}" '
+        f'stroke-miterlimit="{_number(MITER_LIMIT)}"{rendering}/>'
+    )
+
+
+def _embedded_png(surface: pygame.Surface) -> str:
+    buffer = io.BytesIO()
+    pygame.image.save(surface, buffer, "layer.png")
+    return "data:image/png;base64," + base64.b64encode(buffer.getvalue()).decode("ascii")
+
+
+def layers_to_svg(layers: Iterable[Layer], size: tuple[int, int]) -> str:
+    """
+    Describes layers, bottom first, as an SVG document.
+
+    The shapes of vector layers become SVG elements that scale to any size. Other layers are embedded as PNG
+    images, skipping the ones with nothing drawn on them. Hidden layers are left out.
+
+    Args:
+        layers (Iterable[Layer]): The layers in compositing order.
+        size (tuple[int, int]): The width and height of the canvas.
+
+    Returns:
+        str: The SVG document.
+    """
+    width, height = size
+    lines = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" viewBox="0 0 {width} {height}">',
+        # The composite starts out white, like the canvas does
+        f'<rect width="{width}" height="{height}" fill="white"/>',
+    ]
+    for layer in layers:
+        if not layer.visible:
+            continue
+        style = "" if layer.blend_mode == "normal" else f' style="mix-blend-mode:{SVG_BLEND_MODES[layer.blend_mode]}"'
+        opacity = "" if layer.opacity >= 1 else f' opacity="{_number(layer.opacity)}"'
+        lines.append(f"<g id={quoteattr(layer.name)}{opacity}{style}>")
+        if isinstance(layer, VectorLayer):
+            lines.extend(shape_to_svg(layer.shapes, record) for record in layer.shapes)
+        elif layer.surface.get_bounding_rect():
+            lines.append(
+                f'<image width="{width}" height="{height}" href="{_embedded_png(layer.surface)}" '
+                'style="image-rendering:pixelated"/>'
+            )
+        lines.append("</g>")
+    lines.append("</svg>")
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,104 @@
+"""Thumbnail - A low-resolution text preview of the canvas, sent to Neuro as context."""
+
+import logging
+
+from typing import Final, NoReturn, Optional
+from collections.abc import Awaitable, Callable
+
+import numpy as np
+import trio
+
+from .canvas import Canvas
+from .constants import COLORS, SCREEN_HEIGHT, SCREEN_WIDTH
+from .workers import canvas_lock
+
+THUMBNAIL_SIZE: Final = 32
+# Seconds between two previews at the least
+THUMBNAIL_INTERVAL: Final = 5
+# Share of the canvas that must have changed since the last preview before another one is sent
+THUMBNAIL_THRESHOLD: Final = 0.02
+
+# One letter per named color, so the preview only uses colors Neuro already knows by name
+SYMBOLS: Final[dict[str, str]] = {
+    "black": "k",
+    "white": "w",
+    "red": "r",
+    "green": "g",
+    "blue": "b",
+    "pink": "p",
+    "cyan": "c",
+    "yellow": "y",
+    "purple": "u",
+    "brown": "n",
+    "orange": "o",
+}
+
+logger = logging.getLogger(__name__)
+
+
+def render_thumbnail(pixels: np.ndarray) -> str:
+    """
+    Describes a downscaled image as a grid of letters, each the named color closest to that cell.
+
+    Args:
+        pixels (np.ndarray): The (width, height, 3) downscaled image.
+
+    Returns:
+        str: A header, a legend of the letters used and one line of letters per row of the image.
+    """
+    names = list(SYMBOLS)
+    palette = np.array([tuple(COLORS[name])[:3] for name in names], dtype=np.int32)
+    distances = ((pixels[..., None, :].astype(np.int32) - palette) ** 2).sum(axis=-1)
+    nearest = distances.argmin(axis=-1).T  # Rows first, for printing
+
+    letters = np.array([SYMBOLS[name] for name in names])
+    width, height = pixels.shape[:2]
+    legend = ", ".join(f"{letters[i]}={names[i]}" for i in np.unique(nearest))
+    rows = "\n".join("".join(row) for row in letters[nearest])
+    return (
+        f"Current canvas preview, {width}x{height} cells of about "
+        f"{SCREEN_WIDTH // width}x{SCREEN_HEIGHT // height} pixels each ({legend}):\n{rows}"
+    )
+
+
+async def current_preview() -> str:
+    """
+    Returns a preview of the canvas as it is now, and counts it as seen.
+
+    Only the downscaling touches the canvas on the event loop; turning the pixels into text runs in a worker
+    thread so it never holds up drawing.
+    """
+    async with canvas_lock:
+        pixels = Canvas().take_thumbnail((THUMBNAIL_SIZE, THUMBNAIL_SIZE))
+    return await trio.to_thread.run_sync(render_thumbnail, pixels)
+
+
+async def send_thumbnails(
+    send_context: Callable[[str], Awaitable[None]],
+    wait_ready: Optional[Callable[[], Awaitable[None]]] = None,
+    interval: float = THUMBNAIL_INTERVAL,
+    threshold: float = THUMBNAIL_THRESHOLD,
+) -> NoReturn:
+    """
+    Sends a preview of the canvas whenever enough of it has changed, at most once per interval.
+
+    Args:
+        send_context (Callable[[str], Awaitable[None]]): Sends a preview to Neuro.
+        wait_ready (Optional[Callable[[], Awaitable[None]]], optional): Waits until a preview can be sent. While it
+            can't, changes keep adding up instead of being taken for a preview nobody receives. Defaults to None.
+        interval (float, optional): Seconds between two previews at the least. Defaults to THUMBNAIL_INTERVAL.
+        threshold (float, optional): Share of the canvas that must have changed. Defaults to THUMBNAIL_THRESHOLD.
+    """
+    canvas = Canvas()
+    while True:
+        await trio.sleep(interval)
+        if canvas.changed_fraction() < threshold:
+            continue
+
+        if wait_ready is not None:
+            await wait_ready()
+        preview = await current_preview()
+        try:
+            await send_context(preview)
+        except Exception as e:
+            logger.warning(f"Could not send canvas preview: {str(e)}")
@@ -0,0 +1,82 @@
+import numpy as np
+import pygame
+import trio
+
+from .canvas import Canvas
+from .constants import COLORS
+from .thumbnail import THUMBNAIL_SIZE, render_thumbnail, send_thumbnails
+
+
+def setup_canvas() -> Canvas:
+    if hasattr(Canvas, "instance"):
+        del Canvas.instance
+    return Canvas()
+
+
+def test_render_thumbnail():
+    pixels = np.zeros((4, 2, 3), dtype=np.uint8)
+    pixels[:] = tuple(COLORS["white"])[:3]
+    pixels[0, 0] = (250, 10, 10)
+    pixels[3, 1] = (0, 0, 200)
+
+    lines = render_thumbnail(pixels).splitlines()
+    assert "w=white, r=red, b=blue" in lines[0]
+    assert lines[1:] == ["rwww", "wwwb"]
+
+
+async def test_send_thumbnails_only_when_changed():
+    canvas = setup_canvas()
+    sent = []
+    received = trio.Event()
+
+    async def send_context(message: str) -> None:
+        sent.append(message)
+        received.set()
+
+    async with trio.open_nursery() as nursery:
+        nursery.start_soon(send_thumbnails, send_context, None, 0.05, 0.01)
+
+        await trio.sleep(0.2)
+        assert sent == []
+
+        canvas.set_brush_color(pygame.Color(255, 0, 0))
+        canvas.draw_rectangle((0, 0), (250, 250), filled=True)
+        with trio.fail_after(5):
+            await received.wait()
+        assert len(sent[0].splitlines()) == THUMBNAIL_SIZE + 1
+        assert "r=red" in sent[0]
+
+        # Changes too small to pass the threshold don't send another preview
+        canvas.draw_line((300, 300), (301, 300))
+        await trio.sleep(0.2)
+        assert len(sent) == 1
+
+        nursery.cancel_scope.cancel()
+
+
+async def test_send_thumbnails_waits_while_disconnected():
+    canvas = setup_canvas()
+    sent = []
+    ready = trio.Event()
+
+    async def send_context(message: str) -> None:
+        sent.append(message)
+
+    async def wait_ready() -> None:
+        await ready.wait()
+
+    async with trio.open_nursery() as nursery:
+        nursery.start_soon(send_thumbnails, send_context, wait_ready, 0.05, 0.01)
+
+        canvas.draw_rectangle((0, 0), (250, 250), filled=True)
+        await trio.sleep(0.2)
+        # The change is kept for when a preview can be sent rather than taken for one that would be lost
+        assert sent == [] and canvas.changed_fraction() > 0.01
+
+        ready.set()
+        with trio.fail_after(5):
+            while not sent:
+                await trio.sleep(0.01)
+        assert "k=black" in sent[0]
+
+        nursery.cancel_scope.cancel()
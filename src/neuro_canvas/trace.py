@@ -0,0 +1,252 @@
+"""Trace - A compact record of every action, written in the background, and a tool to analyze it."""
+
+import argparse
+import json
+import logging
+import statistics
+import time
+from collections import defaultdict, deque
+from pathlib import Path
+from typing import Any, Final, NoReturn, Optional
+from collections.abc import Callable, Coroutine, Sequence
+
+import trio
+
+from .canvas import Canvas
+
+ActionFunction = Callable[[Optional[dict]], Coroutine[Any, Any, tuple[bool, Optional[str]]]]
+
+# Seconds between two writes of the buffered records
+TRACE_FLUSH_INTERVAL: Final = 1.0
+# Records kept while the file falls behind; beyond this the oldest are dropped instead of slowing actions down
+TRACE_BUFFER_SIZE: Final = 10_000
+
+# How many undos in a row count as an undo storm
+UNDO_STORM: Final = 3
+FILL_ACTIONS: Final = ("bucket_fill", "fill_selection")
+
+logger = logging.getLogger(__name__)
+
+
+class TraceWriter:
+    """
+    Appends one JSON line per action to a file.
+
+    Recording only adds to an in-memory buffer, and the buffer is written from a worker thread, so tracing
+    never blocks the event loop on the disk.
+    """
+
+    def __init__(
+        self, path: Path, flush_interval: float = TRACE_FLUSH_INTERVAL, buffer_size: int = TRACE_BUFFER_SIZE
+    ):
+        self._path = path
+        self._flush_interval = flush_interval
+        self._records: deque[dict[str, Any]] = deque(maxlen=buffer_size)
+        # Records dropped since the last flush
+        self.dropped = 0
+
+    def record(
+        self,
+        name: str,
+        raw_size: int,
+        data: Optional[dict],
+        wait: float,
+        duration: float,
+        success: bool,
+        dirty: Optional[tuple[int, int, int, int]],
+    ) -> None:
+        """
+        Buffers the record of one action.
+
+        Args:
+            name (str): The action's name.
+            raw_size (int): The length of the action's JSON arguments.
+            data (Optional[dict]): The parsed arguments. Only the lengths of lists are kept.
+            wait (float): Seconds the action waited in the queue.
+            duration (float): Seconds the action took to run.
+            success (bool): Whether the action succeeded.
+            dirty (Optional[tuple[int, int, int, int]]): The bounding box of what the action changed, if anything.
+        """
+        if len(self._records) == self._records.maxlen:
+            self.dropped += 1
+        record: dict[str, Any] = {
+            "t": round(time.time(), 3),
+            "name": name,
+            "bytes": raw_size,
+            "wait_ms": round(wait * 1000, 3),
+            "run_ms": round(duration * 1000, 3),
+            "ok": success,
+            "dirty": dirty,
+        }
+        # List arguments such as points are what make an action expensive, so keep their lengths
+        sizes = {key: len(value) for key, value in (data or {}).items() if isinstance(value, list)}
+        if sizes:
+            record["sizes"] = sizes
+        self._records.append(record)
+
+    def flush(self) -> None:
+        """
+        Writes every buffered record to the file, and warns about any records dropped since the last flush.
+        """
+        lines = []
+        while self._records:
+            lines.append(json.dumps(self._records.popleft(), separators=(",", ":")) + "\n")
+        if lines:
+            with open(self._path, "a") as f:
+                f.writelines(lines)
+        if self.dropped:
+            logger.warning("Dropped %d trace records because writing the trace fell behind", self.dropped)
+            self.dropped = 0
+
+    async def run(self) -> NoReturn:
+        """
+        Writes the buffered records periodically, forever.
+        """
+        while True:
+            await trio.sleep(self._flush_interval)
+            if self._records or self.dropped:
+                await trio.to_thread.run_sync(self.flush)
+
+    def traced(self, name: str, raw_size: int, function: ActionFunction) -> ActionFunction:
+        """
+        Wraps an action so running it records it, including the time it waited since this was called.
+        """
+        submitted = time.perf_counter()
+
+        async def run(data: Optional[dict]) -> tuple[bool, Optional[str]]:
+            canvas = Canvas()
+            canvas.take_dirty_area()  # Whatever changed before belongs to another action
+            started = time.perf_counter()
+            success = False
+            try:
+                result = await function(data)
+                success = result[0]
+                return result
+            finally:
+                dirty = canvas.take_dirty_area()
+                self.record(
+                    name, raw_size, data, started - submitted, time.perf_counter() - started, success,
+                    None if dirty is None else tuple(dirty),
+                )
+
+        return run
+
+
+def load_trace(path: Path) -> list[dict[str, Any]]:
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def _percentiles(values: Sequence[float]) -> str:
+    ordered = sorted(values)
+    if len(ordered) > 1:
+        p50, p90, p99 = (statistics.quantiles(ordered, n=100, method="inclusive")[i] for i in (49, 89, 98))
+    else:
+        p50 = p90 = p99 = ordered[0]
+    return f"p50 {p50:.1f}, p90 {p90:.1f}, p99 {p99:.1f}, max {ordered[-1]:.1f} ms"
+
+
+def _wasted_work(records: list[dict[str, Any]]) -> list[str]:
+    lines = []
+
+    # Undo storms: several undos in a row, usually a sign of a drawing being thrown away piece by piece
+    storms, storm_undos, storm_ms = 0, 0, 0.0
+    run_length, run_ms = 0, 0.0
+    # Time spent drawing what was later undone, popping the drawing actions in the order undo does
+    drawn: list[dict[str, Any]] = []
+    undone, undone_ms = 0, 0.0
+    # Fills of exactly the same area with nothing drawn in between, where all but the last were pointless
+    refills, refill_ms = 0, 0.0
+    last_fill: Optional[dict[str, Any]] = None
+
+    for record in records + [{"name": None, "ok": False, "dirty": None, "run_ms": 0}]:
+        if record["name"] == "undo" and record["ok"]:
+            run_length += 1
+            run_ms += record["run_ms"]
+            if drawn:
+                popped = drawn.pop()
+                undone += 1
+                undone_ms += popped["run_ms"]
+            last_fill = None
+            continue
+
+        if run_length >= UNDO_STORM:
+            storms += 1
+            storm_undos += run_length
+            storm_ms += run_ms
+        run_length, run_ms = 0, 0.0
+
+        if record["ok"] and record["dirty"] is not None:
+            drawn.append(record)
+            if record["name"] in FILL_ACTIONS:
+                if last_fill is not None and last_fill["dirty"] == record["dirty"]:
+                    refills += 1
+                    refill_ms += last_fill["run_ms"]
+                last_fill = record
+            else:
+                last_fill = None
+
+    lines.append(
+        f"Undo storms ({UNDO_STORM}+ undos in a row): {storms}, with {storm_undos} undos taking {storm_ms:.1f} ms"
+    )
+    lines.append(f"Drawing actions undone: {undone}, which took {undone_ms:.1f} ms to draw")
+    lines.append(f"Repeated fills of the same area: {refills}, wasting {refill_ms:.1f} ms")
+    return lines
+
+
+def analyze(records: list[dict[str, Any]], top: int = 10) -> str:
+    """
+    Summarizes a trace: where the time went per action, the slowest actions and work that was wasted.
+
+    Args:
+        records (list[dict[str, Any]]): The trace's records, in order.
+        top (int, optional): How many of the slowest actions to list. Defaults to 10.
+
+    Returns:
+        str: The report.
+    """
+    if not records:
+        return "The trace is empty"
+
+    by_name: defaultdict[str, list[dict[str, Any]]] = defaultdict(list)
+    for record in records:
+        by_name[record["name"]].append(record)
+    total_run = sum(record["run_ms"] for record in records)
+    span = records[-1]["t"] - records[0]["t"]
+
+    lines = [f"{len(records)} actions over {span:.1f} s, {total_run:.1f} ms spent running them", ""]
+
+    lines.append("Per action, by time spent (latency is queue wait plus run time):")
+    for name, group in sorted(by_name.items(), key=lambda item: -sum(r["run_ms"] for r in item[1])):
+        run = sum(r["run_ms"] for r in group)
+        failed = sum(not r["ok"] for r in group)
+        latencies = [r["wait_ms"] + r["run_ms"] for r in group]
+        lines.append(
+            f"  {name}: {len(group)} runs, {failed} failed, {run:.1f} ms ({run / (total_run or 1):.0%}), "
+            f"latency {_percentiles(latencies)}"
+        )
+    lines.append("")
+
+    lines.append(f"Slowest {top} actions:")
+    for record in sorted(records, key=lambda r: -r["run_ms"])[:top]:
+        sizes = ", ".join(f"{key} {size}" for key, size in record.get("sizes", {}).items())
+        lines.append(
+            f"  {record['name']} at {time.strftime('%H:%M:%S', time.localtime(record['t']))}: "
+            f"{record['run_ms']:.1f} ms, {record['bytes']} bytes of arguments" + (f" ({sizes})" if sizes else "")
+        )
+    lines.append("")
+
+    lines.extend(_wasted_work(records))
+    return "\n".join(lines)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m neuro_canvas.trace", description="Analyze an action trace.")
+    parser.add_argument("trace", type=Path, help="the JSONL file written with --trace")
+    parser.add_argument("--top", type=int, default=10, help="how many of the slowest actions to list")
+    args = parser.parse_args(argv)
+    print(analyze(load_trace(args.trace), args.top))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+from typing import Optional
+
+from .canvas import Canvas
+from .trace import TraceWriter, analyze, load_trace
+
+
+def setup_canvas() -> Canvas:
+    if hasattr(Canvas, "instance"):
+        del Canvas.instance
+    return Canvas()
+
+
+async def test_traced_actions_are_written(tmp_path):
+    canvas = setup_canvas()
+    path = tmp_path / "trace.jsonl"
+    trace = TraceWriter(path)
+
+    async def draw(data: Optional[dict]) -> tuple[bool, Optional[str]]:
+        assert data is not None
+        canvas.draw_lines(data["points"], False, False)
+        return True, "Drew"
+
+    async def fail(data: Optional[dict]) -> tuple[bool, Optional[str]]:
+        return False, "Nope"
+
+    data = {"points": [(10, 10), (20, 30), (40, 10)]}
+    assert await trace.traced("draw_lines", 42, draw)(data) == (True, "Drew")
+    await trace.traced("undo", 0, fail)(None)
+    trace.flush()
+
+    records = load_trace(path)
+    assert [r["name"] for r in records] == ["draw_lines", "undo"]
+    assert records[0]["ok"] and not records[1]["ok"]
+    assert records[0]["bytes"] == 42
+    assert records[0]["sizes"] == {"points": 3}
+    left, top, width, height = records[0]["dirty"]
+    assert left <= 10 and top <= 10 and left + width >= 40 and top + height >= 30
+    assert records[1]["dirty"] is None and "sizes" not in records[1]
+
+
+def test_dropped_records_are_reported(tmp_path, caplog):
+    path = tmp_path / "trace.jsonl"
+    trace = TraceWriter(path, buffer_size=2)
+    for _ in range(5):
+        trace.record("draw_line", 0, None, 0, 0, True, None)
+
+    trace.flush()
+    assert len(load_trace(path)) == 2
+    assert "Dropped 3 trace records" in caplog.text
+
+    # Only drops since the last flush are reported
+    caplog.clear()
+    trace.record("draw_line", 0, None, 0, 0, True, None)
+    trace.flush()
+    assert "Dropped" not in caplog.text
+
+
+def test_analyze_finds_wasted_work():
+    def record(name: str, run_ms: float, dirty: Optional[list] = None, ok: bool = True) -> dict:
+        return {"t": 0.0, "name": name, "bytes": 0, "wait_ms": 1.0, "run_ms": run_ms, "ok": ok, "dirty": dirty}
+
+    records = [
+        record("bucket_fill", 50, [0, 0, 10, 10]),
+        record("set_brush_color", 1),
+        record("bucket_fill", 40, [0, 0, 10, 10]),
+        record("draw_line", 5, [0, 0, 5, 5]),
+        record("draw_line", 6, [0, 0, 5, 5]),
+        record("undo", 20),
+        record("undo", 20),
+        record("undo", 20),
+        record("undo", 1, ok=False),
+    ]
+    report = analyze(records, top=2)
+
+    assert "bucket_fill: 2 runs, 0 failed, 90.0 ms" in report
+    assert "undo: 4 runs, 1 failed" in report
+    assert "Undo storms (3+ undos in a row): 1, with 3 undos taking 60.0 ms" in report
+    assert "Drawing actions undone: 3, which took 51.0 ms to draw" in report
+    assert "Repeated fills of the same area: 1, wasting 50.0 ms" in report
@@ -0,0 +1,55 @@
+"""Transforms - Moving, scaling, rotating and flipping blocks of pixels."""
+
+from typing import Final, Literal
+
+from pygame import Rect
+import pygame
+
+TransformQuality = Literal["nearest", "smooth"]
+
+TRANSFORM_QUALITIES: Final[tuple[str, ...]] = ("nearest", "smooth")
+
+
+def transformed(
+    pixels: pygame.Surface,
+    scale: tuple[float, float] = (1, 1),
+    angle: float = 0,
+    flip: tuple[bool, bool] = (False, False),
+    quality: TransformQuality = "smooth",
+) -> pygame.Surface:
+    """
+    Returns a flipped, scaled and rotated copy of a block of pixels.
+
+    Args:
+        pixels (pygame.Surface): The pixels to transform, with per-pixel alpha.
+        scale (tuple[float, float], optional): The horizontal and vertical scale factors. Defaults to (1, 1).
+        angle (float, optional): The clockwise rotation in degrees. Defaults to 0.
+        flip (tuple[bool, bool], optional): Whether to mirror horizontally and vertically. Defaults to no flip.
+        quality (TransformQuality, optional): "nearest" keeps hard pixel edges, "smooth" filters them.
+            Defaults to "smooth".
+
+    Returns:
+        pygame.Surface: The transformed pixels, sized to fit them. Never the same surface as pixels.
+    """
+    result = pygame.transform.flip(pixels, *flip)
+
+    if scale != (1, 1):
+        size = (max(round(result.get_width() * scale[0]), 1), max(round(result.get_height() * scale[1]), 1))
+        resize = pygame.transform.smoothscale if quality == "smooth" else pygame.transform.scale
+        result = resize(result, size)
+
+    if angle % 360:
+        # pygame rotates counterclockwise
+        if quality == "smooth":
+            result = pygame.transform.rotozoom(result, -angle, 1)
+        else:
+            result = pygame.transform.rotate(result, -angle)
+
+    return result
+
+
+def placement(area: Rect, pixels: pygame.Surface, offset: tuple[int, int] = (0, 0)) -> Rect:
+    """
+    Returns where transformed pixels go: centred on the area they came from, then moved by the offset.
+    """
+    return pixels.get_rect(center=area.center).move(offset)
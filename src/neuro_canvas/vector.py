@@ -0,0 +1,389 @@
+"""Vector - Layers that keep the shapes drawn on them and rasterize them on demand."""
+
+from typing import Final, Literal
+from collections.abc import Iterator, Sequence
+
+from pygame import gfxdraw, Rect
+import pygame
+import numpy as np
+
+from .brushes import BRUSH_TIPS, BrushTip, stamp_polyline
+from .layers import Layer
+from .spatial import ShapeGrid, covers
+from .stroke import (
+    CAP_STYLES, JOIN_STYLES, MITER_LIMIT, CapStyle, JoinStyle, fill_circle, fill_polygon, stroke_circle, stroke_polyline
+)
+
+PrimitiveKind = Literal["polyline", "polygon", "circle", "disc", "rectangle"]
+
+PRIMITIVE_KINDS: Final[tuple[str, ...]] = ("polyline", "polygon", "circle", "disc", "rectangle")
+
+# One fixed-size record per primitive; the points of every primitive share one array, referenced by start and count.
+# A circle or disc stores its center as its only point, and a rectangle its top left and bottom right pixels.
+PRIMITIVE: Final = np.dtype([
+    ("kind", np.uint8),
+    ("closed", np.bool_),
+    ("antialias", np.bool_),
+    ("cap", np.uint8),
+    ("join", np.uint8),
+    ("tip", np.uint8),
+    ("color", np.uint8, 4),
+    ("width", np.uint16),
+    ("radius", np.uint16),
+    ("spacing", np.float64),
+    ("scatter", np.float64),
+    ("start", np.uint32),
+    ("count", np.uint32),
+    # Left, top, right and bottom of everything the primitive can touch, in canvas pixels
+    ("bounds", np.int32, 4),
+    # Erased primitives keep their place, so positions stay valid and erasing can be undone
+    ("erased", np.bool_),
+])
+
+_INITIAL_CAPACITY: Final = 16
+# How many pixels a point may be off a shape and still hit it
+HIT_TOLERANCE: Final = 2
+
+Point = tuple[float, float]
+
+
+def _grow(array: np.ndarray, needed: int) -> np.ndarray:
+    if needed <= len(array):
+        return array
+    grown = np.zeros((max(needed, 2 * len(array)), *array.shape[1:]), dtype=array.dtype)
+    grown[:len(array)] = array
+    return grown
+
+
+class DisplayList:
+    """
+    The shapes drawn on a vector layer, in drawing order, stored in a few growable numpy arrays.
+    """
+
+    def __init__(self) -> None:
+        self._records = np.zeros(_INITIAL_CAPACITY, dtype=PRIMITIVE)
+        self._points = np.zeros((_INITIAL_CAPACITY, 2), dtype=np.float64)
+        self._length = 0
+        self._point_count = 0
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __iter__(self) -> Iterator[np.void]:
+        """
+        Iterates over the primitives that haven't been erased, in drawing order.
+        """
+        records = self._records[:self._length]
+        return iter(records[~records["erased"]])
+
+    def drawn(self) -> int:
+        """
+        Returns how many primitives haven't been erased.
+        """
+        return int(np.count_nonzero(~self._records["erased"][:self._length]))
+
+    def copy(self) -> 'DisplayList':
+        duplicate = DisplayList()
+        duplicate._records = self._records[:max(self._length, 1)].copy()
+        duplicate._points = self._points[:max(self._point_count, 1)].copy()
+        duplicate._length = self._length
+        duplicate._point_count = self._point_count
+        return duplicate
+
+    def append(self, points: np.ndarray, **fields) -> Rect:
+        """
+        Adds a primitive on top of the others.
+
+        Returns:
+            Rect: The bounds stored with it.
+        """
+        self._records = _grow(self._records, self._length + 1)
+        self._points = _grow(self._points, self._point_count + len(points))
+
+        record = self._records[self._length]
+        for name, value in fields.items():
+            record[name] = value
+        record["start"] = self._point_count
+        record["count"] = len(points)
+
+        self._points[self._point_count:self._point_count + len(points)] = points
+        self._point_count += len(points)
+        self._length += 1
+        return self.bounds(self._length - 1)
+
+    def pop(self) -> Rect:
+        """
+        Removes the topmost primitive.
+
+        Returns:
+            Rect: The bounds it had.
+        """
+        if not self._length:
+            raise IndexError("The display list is empty.")
+        self._length -= 1
+        self._point_count = int(self._records[self._length]["start"])
+        return self.bounds(self._length)
+
+    def bounds(self, index: int) -> Rect:
+        left, top, right, bottom = self._records[index]["bounds"].tolist()
+        return Rect(left, top, right - left, bottom - top)
+
+    def points(self, record: np.void) -> np.ndarray:
+        start = int(record["start"])
+        return self._points[start:start + int(record["count"])]
+
+    def intersecting(self, area: Rect) -> np.ndarray:
+        """
+        Returns the positions of the primitives whose bounds overlap an area, in drawing order.
+        """
+        bounds = self._records["bounds"][:self._length]
+        return np.flatnonzero(
+            (bounds[:, 0] < area.right) & (bounds[:, 2] > area.left)
+            & (bounds[:, 1] < area.bottom) & (bounds[:, 3] > area.top)
+            & ~self._records["erased"][:self._length]
+        )
+
+    def __getitem__(self, index: int) -> np.void:
+        return self._records[:self._length][index]
+
+
+def _bounds(points: np.ndarray, reach: float) -> np.ndarray:
+    # Rounding and antialiasing may spill a couple of pixels past the exact outline, and hit tests may be off by
+    # as much as the tolerance
+    margin = int(np.ceil(reach)) + HIT_TOLERANCE
+    low = np.floor(points.min(axis=0)).astype(int) - margin
+    high = np.ceil(points.max(axis=0)).astype(int) + margin + 1
+    return np.array([low[0], low[1], high[0], high[1]])
+
+
+class VectorLayer(Layer):
+    """
+    A layer that keeps the primitives drawn on it instead of their pixels.
+
+    The pixels are rasterized lazily the first time they are needed after a change, and only where something
+    changed, so a hidden vector layer is never rasterized at all. The primitives can be rasterized again at any
+    scale and written out as SVG, and undoing a shape only has to drop it from the display list.
+
+    A grid index over the bounds of the primitives finds the one drawn at a point, which can then be erased or
+    recolored on its own, redrawing only the area it covers.
+    """
+
+    def __init__(self, name: str, width: int, height: int):
+        super().__init__(name, width, height)
+        self.shapes = DisplayList()
+        self._grid = ShapeGrid(self._surface.get_rect())
+        # Primitives up to this position are on the surface already
+        self._rasterized = 0
+        # Area whose pixels have to be redrawn from scratch, after a primitive was dropped
+        self._stale: Rect | None = None
+
+    @property
+    def surface(self) -> pygame.Surface:
+        if self._stale is not None or self._rasterized < len(self.shapes):
+            self._rasterize()
+        return self._surface
+
+    @surface.setter
+    def surface(self, surface: pygame.Surface) -> None:
+        self._surface = surface
+
+    def copy(self, name: str) -> 'VectorLayer':
+        duplicate = super().copy(name)
+        assert isinstance(duplicate, VectorLayer)
+        duplicate.shapes = self.shapes.copy()
+        duplicate._grid = self._grid.copy()
+        return duplicate
+
+    def add(
+        self,
+        kind: PrimitiveKind,
+        points: Sequence[Point] | np.ndarray,
+        color: pygame.Color,
+        width: int = 1,
+        radius: int = 0,
+        closed: bool = False,
+        antialias: bool = False,
+        cap: CapStyle = "round",
+        join: JoinStyle = "round",
+        tip: BrushTip = "solid",
+        spacing: float = 0,
+        scatter: float = 0,
+    ) -> Rect:
+        """
+        Adds a primitive on top of the layer without rasterizing it yet.
+
+        Returns:
+            Rect: The area of the layer it can touch.
+        """
+        pts = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        if len(pts) == 0:
+            return Rect(0, 0, 0, 0)
+
+        if kind in ("circle", "disc"):
+            reach = radius + width / 2
+        elif tip != "solid":
+            reach = width / 2 + scatter * width
+        else:
+            # Miter joins reach furthest from the path, square caps reach out diagonally
+            reach = width / 2 * (MITER_LIMIT if join == "miter" else np.sqrt(2))
+        area = self.shapes.append(
+            pts,
+            kind=PRIMITIVE_KINDS.index(kind),
+            closed=closed,
+            antialias=antialias,
+            cap=CAP_STYLES.index(cap),
+            join=JOIN_STYLES.index(join),
+            tip=BRUSH_TIPS.index(tip),
+            color=tuple(color),
+            width=width,
+            radius=radius,
+            spacing=spacing,
+            scatter=scatter,
+            bounds=_bounds(pts, reach),
+        )
+        self._grid.insert(len(self.shapes) - 1, area)
+        return area
+
+    def pop(self) -> Rect:
+        """
+        Drops the topmost primitive.
+
+        Returns:
+            Rect: The area of the layer it could touch.
+        """
+        area = self.shapes.pop()
+        self._grid.remove(len(self.shapes), area)
+        self._rasterized = min(self._rasterized, len(self.shapes))
+        self._invalidate(area)
+        return area
+
+    def _invalidate(self, area: Rect) -> None:
+        self._stale = area if self._stale is None else self._stale.union(area)
+
+    def has_shape(self, shape: int) -> bool:
+        return 0 <= shape < len(self.shapes) and not self.shapes[shape]["erased"]
+
+    def set_erased(self, shape: int, erased: bool) -> Rect:
+        """
+        Erases a primitive, or brings an erased one back, in its original place.
+
+        Returns:
+            Rect: The area of the layer it could touch.
+        """
+        self.shapes[shape]["erased"] = erased
+        area = self.shapes.bounds(shape)
+        self._invalidate(area)
+        return area
+
+    def recolor(self, shape: int, color: pygame.Color) -> pygame.Color:
+        """
+        Changes the color of a primitive.
+
+        Returns:
+            pygame.Color: The color it had.
+        """
+        record = self.shapes[shape]
+        old = pygame.Color(*record["color"].tolist())
+        record["color"] = tuple(color)
+        self._invalidate(self.shapes.bounds(shape))
+        return old
+
+    def shape_at(self, point: tuple[int, int]) -> int | None:
+        """
+        Returns the position of the topmost primitive drawn at a point, or at most HIT_TOLERANCE pixels from it, or
+        None if there is none.
+        """
+        x, y = point
+        for shape in reversed(self._grid.at(point)):
+            record = self.shapes[shape]
+            left, top, right, bottom = record["bounds"].tolist()
+            if record["erased"] or not (left <= x < right and top <= y < bottom):
+                continue
+            width = float(record["width"])
+            if BRUSH_TIPS[record["tip"]] != "solid":
+                # Scattered dabs land up to the scatter times the width away from the path
+                width *= 1 + 2 * float(record["scatter"])
+            kind = PRIMITIVE_KINDS[record["kind"]]
+            if covers(kind, self.shapes.points(record), width, float(record["radius"]), bool(record["closed"]), point,
+                      HIT_TOLERANCE):
+                return shape
+        return None
+
+    def _rasterize(self) -> None:
+        if self._stale is None:
+            # Only new primitives, which are drawn on top of what is there
+            for index in range(self._rasterized, len(self.shapes)):
+                if not self.shapes[index]["erased"]:
+                    draw_primitive(self._surface, self.shapes, self.shapes[index])
+        else:
+            area = self._stale.clip(self._surface.get_rect())
+            for index in range(self._rasterized, len(self.shapes)):
+                area.union_ip(self.shapes.bounds(index))
+            self._stale = None
+            self._redraw(area)
+        self._rasterized = len(self.shapes)
+
+    def _redraw(self, area: Rect) -> None:
+        # Clipping changes how antialiased edges come out, so everything overlapping the area is drawn again in
+        # order on a scratch surface, and only the area is copied back
+        scratch = pygame.Surface(self._surface.get_size(), pygame.SRCALPHA)
+        for index in self.shapes.intersecting(area):
+            draw_primitive(scratch, self.shapes, self.shapes[int(index)])
+        self._surface.fill((0, 0, 0, 0), area)
+        # Taking the maximum over transparent pixels copies them exactly instead of alpha blending them
+        self._surface.blit(scratch, area, area, special_flags=pygame.BLEND_RGBA_MAX)
+
+    def render(self, scale: int = 1) -> pygame.Surface:
+        """
+        Rasterizes every primitive onto a new transparent surface, scale times the size of the layer.
+        """
+        width, height = self._surface.get_size()
+        surface = pygame.Surface((width * scale, height * scale), pygame.SRCALPHA)
+        for record in self.shapes:
+            draw_primitive(surface, self.shapes, record, scale)
+        return surface
+
+
+def draw_primitive(surface: pygame.Surface, shapes: DisplayList, record: np.void, scale: int = 1) -> Rect:
+    """
+    Rasterizes one primitive of a display list, with its coordinates and widths multiplied by scale.
+
+    Returns:
+        Rect: The area of the surface that was touched.
+    """
+    kind = PRIMITIVE_KINDS[record["kind"]]
+    color = pygame.Color(*record["color"].tolist())
+    antialias = bool(record["antialias"])
+    width = int(record["width"]) * scale
+    points = shapes.points(record)
+    if scale != 1:
+        # Shift to pixel centers before scaling, so each canvas pixel becomes a scale x scale block
+        points = (points + 0.5) * scale - 0.5
+
+    if kind == "disc":
+        return fill_circle(surface, color, points[0], int(record["radius"]) * scale, antialias=antialias)
+    if kind == "circle":
+        return stroke_circle(surface, color, points[0], int(record["radius"]) * scale, width, antialias=antialias)
+    if kind == "polygon":
+        return fill_polygon(surface, color, points, antialias=antialias)
+    if kind == "rectangle" and scale == 1:
+        # A 1px outline, blended like the canvas draws it on other layers
+        (left, top), (right, bottom) = points.astype(int).tolist()
+        rect = Rect(left, top, right - left + 1, bottom - top + 1)
+        gfxdraw.rectangle(surface, rect, color)
+        return rect
+    if kind == "rectangle":
+        (left, top), (right, bottom) = points.tolist()
+        return stroke_polyline(surface, color, [(left, top), (right, top), (right, bottom), (left, bottom)], scale,
+                               closed=True)
+
+    tip = BRUSH_TIPS[record["tip"]]
+    if tip != "solid":
+        return stamp_polyline(
+            surface, color, points, width, tip, spacing=float(record["spacing"]), scatter=float(record["scatter"]),
+            closed=bool(record["closed"]),
+        )
+    return stroke_polyline(
+        surface, color, points, width, closed=bool(record["closed"]), cap=CAP_STYLES[record["cap"]],
+        join=JOIN_STYLES[record["join"]], antialias=antialias,
+    )
@@ -0,0 +1,242 @@
+import random
+import xml.etree.ElementTree as ElementTree
+
+import pygame
+import pytest
+from pygame import Rect
+
+from . import vector
+from .canvas import Canvas
+from .constants import SCREEN_HEIGHT, SCREEN_WIDTH
+from .spatial import ShapeGrid
+from .vector import VectorLayer
+
+SVG: str = "{http://www.w3.org/2000/svg}"
+
+
+def setup_canvas() -> Canvas:
+    if hasattr(Canvas, "instance"):
+        del Canvas.instance
+    canvas = Canvas()
+    canvas.add_layer("shapes", vector=True)
+    return canvas
+
+
+Step = tuple[str, tuple]
+
+
+def random_steps(rng: random.Random, count: int, undo: bool = False) -> list[Step]:
+    """
+    Makes random drawing steps, and with undo, undos of earlier steps among them.
+    """
+    def point() -> tuple[int, int]:
+        return rng.randrange(SCREEN_WIDTH), rng.randrange(SCREEN_HEIGHT)
+
+    makers = [
+        lambda: ("draw_line", (point(), point())),
+        lambda: ("draw_lines", ([point() for _ in range(4)], rng.random() < 0.5, rng.random() < 0.5)),
+        lambda: ("draw_curve", ([point() for _ in range(4)], rng.choice(["bezier", "spline"]))),
+        lambda: ("draw_circle", (point(), rng.randint(1, 60), rng.random() < 0.5)),
+        lambda: ("draw_rectangle", (point(), (rng.randint(1, 90), rng.randint(1, 90)), rng.random() < 0.5,
+                                    rng.choice([0, 30]))),
+        lambda: ("set_brush_width", (rng.randint(1, 25),)),
+        lambda: ("set_brush_color", (pygame.Color(*(rng.randrange(256) for _ in range(3)), rng.choice([128, 255])),)),
+        lambda: ("set_stroke_style", (
+            rng.choice(["butt", "round", "square"]), rng.choice(["round", "bevel", "miter"]), rng.random() < 0.5
+        )),
+        lambda: ("set_brush_tip", (rng.choice(["solid", "solid", "round", "star"]), 0.3, rng.choice([0, 1]))),
+    ]
+    steps: list[Step] = []
+    for _ in range(count):
+        if undo and kept(steps) and rng.random() < 1 / (len(makers) + 1):
+            steps.append(("undo", ()))
+        else:
+            steps.append(rng.choice(makers)())
+    return steps
+
+
+def kept(steps: list[Step]) -> list[Step]:
+    """
+    Returns the steps that are left once the undos among them are applied.
+    """
+    left: list[Step] = []
+    for step in steps:
+        if step[0] == "undo":
+            left.pop()
+        else:
+            left.append(step)
+    return left
+
+
+def take(canvas: Canvas, steps: list[Step]) -> None:
+    for name, args in steps:
+        getattr(canvas, name)(*args)
+
+
+def pixels(surface: pygame.Surface) -> bytes:
+    return pygame.image.tobytes(surface, "RGB")
+
+
+def test_vector_layer_matches_raster_layer():
+    canvas = setup_canvas()
+    steps = random_steps(random.Random(1), 100)
+    for layer in ("base", "shapes"):
+        canvas.switch_active_layer(layer)
+        canvas.set_brush_width(1)
+        canvas.set_brush_color(pygame.Color(0, 0, 0))
+        canvas.set_stroke_style("round", "round", False)
+        canvas.set_brush_tip("solid", 0.25, 0)
+        take(canvas, steps)
+
+    # Each layer on its own over the background
+    canvas.set_layer_visibility("shapes", 0)
+    raster = pixels(canvas.render())
+    canvas.set_layer_visibility("shapes", 1)
+    canvas.set_layer_visibility("base", 0)
+    assert pixels(canvas.render()) == raster
+
+
+def test_undo_drops_shapes():
+    canvas = setup_canvas()
+    canvas.switch_active_layer("shapes")
+    canvas.draw_circle((100, 100), 30, filled=True)
+    assert canvas.find_shape((100, 100)) == ("shapes", 0)
+    assert canvas.undo() and not canvas.has_shapes()
+    assert canvas.get_layers_info()[-1]["bounds"] is None
+
+    # Redrawing only where shapes were dropped gives what drawing everything again would
+    rng = random.Random(2)
+    steps: list[Step] = []
+    for _ in range(10):
+        new_steps = random_steps(rng, 15, undo=True)
+        take(canvas, new_steps)
+        steps += new_steps
+        drawn = pixels(canvas.render())
+
+        # The display belongs to one canvas at a time, so the rest of the steps go on the new one
+        canvas = setup_canvas()
+        canvas.switch_active_layer("shapes")
+        take(canvas, kept(steps))
+        assert pixels(canvas.render()) == drawn
+
+
+def test_hidden_vector_layer_is_not_rasterized(monkeypatch):
+    drawn = []
+    draw_primitive = vector.draw_primitive
+
+    def counting(*args):
+        drawn.append(args)
+        return draw_primitive(*args)
+
+    monkeypatch.setattr(vector, "draw_primitive", counting)
+
+    canvas = setup_canvas()
+    canvas.set_layer_visibility("shapes", 0)
+    canvas.switch_active_layer("shapes")
+    canvas.draw_line((0, 0), (100, 100))
+    assert not drawn
+
+    canvas.set_layer_visibility("shapes", 1)
+    assert drawn
+
+
+def test_pixel_operations_need_a_raster_layer():
+    canvas = setup_canvas()
+    canvas.switch_active_layer("shapes")
+    canvas.select_rectangle((10, 10), (50, 50))
+    for operation in (
+        lambda: canvas.bucket_fill((5, 5)),
+        canvas.fill_selection,
+        canvas.clear_selection,
+        lambda: canvas.translate_layer("shapes", 10, 10),
+    ):
+        with pytest.raises(ValueError):
+            operation()
+
+
+def test_export_scaled_and_svg(tmp_path):
+    canvas = setup_canvas()
+    canvas.switch_active_layer("shapes")
+    canvas.set_brush_width(4)
+    canvas.draw_rectangle((10, 10), (30, 20), filled=True)
+    canvas.draw_circle((200, 200), 50)
+    canvas.switch_active_layer("base")
+    canvas.draw_line((0, 0), (50, 50))
+
+    canvas.export("drawing", "png", tmp_path, scale=3)
+    image = pygame.image.load(tmp_path / "drawing.png")
+    assert image.get_size() == (SCREEN_WIDTH * 3, SCREEN_HEIGHT * 3)
+    # The shapes are drawn again at three times the size
+    assert image.get_at((15 * 3, 15 * 3)) == pygame.Color(0, 0, 0)
+
+    canvas.export("drawing", "svg", tmp_path)
+    root = ElementTree.parse(tmp_path / "drawing.svg").getroot()
+    groups = {group.get("id"): group for group in root.iter(f"{SVG}g")}
+    assert list(groups) == ["background", "base", "shapes"]
+    assert [element.tag for element in groups["base"]] == [f"{SVG}image"]
+    assert [element.tag for element in groups["shapes"]] == [f"{SVG}polygon", f"{SVG}polygon", f"{SVG}circle"]
+    assert groups["shapes"][2].get("stroke-width") == "4"
+
+
+def test_find_erase_and_recolor_shape():
+    canvas = setup_canvas()
+    canvas.switch_active_layer("shapes")
+    canvas.set_brush_width(5)
+    canvas.draw_line((10, 50), (200, 50))
+    canvas.draw_circle((100, 100), 20, filled=True)
+    canvas.draw_rectangle((300, 300), (40, 40))
+
+    assert canvas.find_shape((100, 51)) == ("shapes", 0)
+    assert canvas.find_shape((100, 100)) == ("shapes", 1)
+    # A filled circle is a disc and its outline
+    assert canvas.find_shape((100, 120)) == ("shapes", 2)
+    assert canvas.find_shape((300, 320)) == ("shapes", 3)
+    # Inside an outline is not on it
+    assert canvas.find_shape((320, 320)) is None
+    assert canvas.find_shape((100, 51), "base") is None
+
+    before = pixels(canvas.render())
+    canvas.erase_shape("shapes", 1)
+    assert canvas.find_shape((100, 100)) is None
+    assert canvas.get_pixel_color((100, 100), "shapes").a == 0
+    assert canvas.get_pixel_color((100, 50), "shapes").a == 255
+    with pytest.raises(ValueError):
+        canvas.recolor_shape("shapes", 1, pygame.Color(255, 0, 0))
+
+    canvas.recolor_shape("shapes", 0, pygame.Color(255, 0, 0))
+    assert canvas.get_pixel_color((100, 50), "shapes") == pygame.Color(255, 0, 0)
+    assert canvas.get_shape_info("shapes", 0)["color"] == pygame.Color(255, 0, 0)
+    erased = pixels(canvas.render())
+
+    assert canvas.undo() and canvas.undo()
+    assert canvas.find_shape((100, 100)) == ("shapes", 1)
+    assert pixels(canvas.render()) == before
+
+    # Redrawing only around the erased disc gives what drawing the other shapes again would
+    canvas = setup_canvas()
+    canvas.switch_active_layer("shapes")
+    canvas.set_brush_width(5)
+    canvas.set_brush_color(pygame.Color(255, 0, 0))
+    canvas.draw_line((10, 50), (200, 50))
+    canvas.set_brush_color(pygame.Color(0, 0, 0))
+    canvas.draw_circle((100, 100), 20)
+    canvas.draw_rectangle((300, 300), (40, 40))
+    assert pixels(canvas.render()) == erased
+
+
+def test_hit_testing_many_shapes():
+    layer = VectorLayer("shapes", SCREEN_WIDTH, SCREEN_HEIGHT)
+    rng = random.Random(3)
+    for _ in range(20000):
+        x, y = rng.randrange(SCREEN_WIDTH), rng.randrange(SCREEN_HEIGHT)
+        layer.add("polyline", [(x, y), (x + rng.randint(-40, 40), y + rng.randint(-40, 40))], pygame.Color(0, 0, 0))
+
+    layer.add("disc", [(400, 300)], pygame.Color(0, 0, 0), radius=5)
+    assert layer.shape_at((400, 300)) == 20000
+
+    # A hit test only looks at the shapes in the grid cell of the point, a small share of them all
+    grid = ShapeGrid(Rect(0, 0, SCREEN_WIDTH, SCREEN_HEIGHT))
+    for shape in range(len(layer.shapes)):
+        grid.insert(shape, layer.shapes.bounds(shape))
+    for _ in range(100):
+        assert len(grid.at((rng.randrange(SCREEN_WIDTH), rng.randrange(SCREEN_HEIGHT)))) < len(layer.shapes) // 50
@@ -0,0 +1,43 @@
+"""Workers - Runs heavy canvas operations in a worker thread so the event loop stays responsive."""
+
+from functools import partial
+from typing import Any, TypeVar
+from collections.abc import Callable
+
+import trio
+
+from .canvas import Canvas
+
+T = TypeVar("T")
+
+# Held while an operation runs in the worker. Tasks other than the action queue that read the canvas take it too,
+# so they never see a half-drawn layer.
+canvas_lock = trio.Lock()
+
+
+async def run_off_loop(function: Callable[..., T], *args: Any) -> T:
+    """
+    Runs a canvas operation in a worker thread and waits for it to finish.
+
+    NumPy and pygame release the GIL for most of their pixel work, so websocket messages and window events keep
+    being handled meanwhile. Only one operation runs at a time, and the action queue waits for it before running
+    the next action, so actions still touch each layer in the order they arrived.
+
+    The operation can't be cancelled part way, which would leave the canvas half changed.
+
+    Args:
+        function (Callable[..., T]): The canvas method to run.
+        *args: The arguments to pass to it.
+
+    Returns:
+        T: What the operation returned.
+
+    Raises:
+        Exception: Whatever the operation raised.
+    """
+    async with canvas_lock:
+        try:
+            return await trio.to_thread.run_sync(partial(function, *args))
+        finally:
+            # The worker can't touch the window, so show its result from here
+            Canvas().refresh_display()
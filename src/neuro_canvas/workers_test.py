@@ -0,0 +1,66 @@
+import threading
+
+import pygame
+import pytest
+import trio
+
+from .canvas import Canvas
+from .constants import COLORS
+from .workers import canvas_lock, run_off_loop
+
+
+def setup_canvas() -> Canvas:
+    if hasattr(Canvas, "instance"):
+        del Canvas.instance
+    return Canvas()
+
+
+async def test_run_off_loop_uses_worker_and_refreshes_display(monkeypatch):
+    canvas = setup_canvas()
+    updates = []
+    monkeypatch.setattr(pygame.display, "update", lambda: updates.append(threading.current_thread()))
+
+    canvas.set_brush_color(COLORS["red"])
+    updates.clear()
+    await run_off_loop(canvas.bucket_fill, (10, 10))
+
+    assert canvas.get_pixel_color((10, 10)) == COLORS["red"]
+    # The worker left the display alone and it was updated back on the event loop
+    assert updates == [threading.main_thread()]
+    # Only once
+    canvas.refresh_display()
+    assert updates == [threading.main_thread()]
+
+    assert await run_off_loop(canvas.undo)
+    assert canvas.get_pixel_color((10, 10)) != COLORS["red"]
+
+
+async def test_run_off_loop_holds_lock_and_raises():
+    canvas = setup_canvas()
+    seen = []
+
+    def operation() -> str:
+        seen.append(canvas_lock.locked())
+        return threading.current_thread().name
+
+    assert await run_off_loop(operation) != threading.main_thread().name
+    assert seen == [True]
+    assert not canvas_lock.locked()
+
+    with pytest.raises(ValueError):
+        await run_off_loop(canvas.merge_down, "missing")
+
+    # Other tasks keep running while the worker is busy
+    ticks = 0
+
+    async def tick() -> None:
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await trio.sleep(0)
+
+    async with trio.open_nursery() as nursery:
+        nursery.start_soon(tick)
+        await run_off_loop(threading.Event().wait, 0.05)
+        nursery.cancel_scope.cancel()
+    assert ticks > 1